@@ -3,7 +3,7 @@
 """defines the function api_status"""
 
 from os import getenv
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from models import storage
 from api.v1.views import app_views
@@ -11,7 +11,17 @@ from api.v1.views import app_views
 app = Flask(__name__)
 app.url_map.strict_slashes = False
 app.register_blueprint(app_views, url_prefix="/api/v1")
-CORS(app, resources={r"/*": {"origins": "0.0.0.0"}})
+CORS(app, resources={r"/*": {"origins": "0.0.0.0"}},
+     expose_headers=["X-Next-Cursor"])
+
+
+@app.after_request
+def sync_storage(response):
+    """writes pending changes to disk before answering when the client
+    sends 'X-HBNB-Sync: 1', for storages that defer their saves"""
+    if request.headers.get("X-HBNB-Sync") == "1":
+        storage.sync()
+    return response
 
 
 @app.teardown_appcontext
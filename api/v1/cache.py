@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+"""
+Server-side cache of the responses of the hot GET views
+
+A cached response remembers the generation of every class it was built
+from. The storage calls invalidate(<class name>, <key>) on each change,
+which bumps the generation of the class, so the responses built before the
+change are never served again.
+
+Set HBNB_API_CACHE_SIZE to the number of responses to keep (0, the
+default, disables the cache) and HBNB_API_CACHE_TTL to a number of
+seconds after which they expire anyway. HBNB_API_CACHE_BACKEND names a
+"<module>:<class>" backend to share the responses and generations between
+API workers; the default LocalBackend keeps them in this process.
+"""
+from collections import OrderedDict
+from flask import make_response, request
+from functools import wraps
+import importlib
+from models import storage
+from os import getenv
+import threading
+import time
+
+
+class LocalBackend:
+    """in-process, thread-safe LRU store with per-entry expiry
+
+    It stands in for a shared store (memcached, redis...): any backend with
+    the same get, set and incr methods can replace it."""
+
+    def __init__(self, size=1024):
+        """Instantiate a store of at most size entries"""
+        self.size = size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """returns the value stored under key, None if absent or expired"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.monotonic() >= expires:
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """stores value under key for ttl seconds (forever if None),
+        evicting the least recently used entries past size"""
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self.__lock:
+            self.__entries[key] = (value, expires)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+
+    def incr(self, key):
+        """adds 1 to the integer stored under key (0 if absent), kept
+        forever, and returns it"""
+        with self.__lock:
+            value = self.__entries.get(key, (0, None))[0] + 1
+            self.__entries[key] = (value, None)
+            self.__entries.move_to_end(key)
+            return value
+
+    def __len__(self):
+        """returns the number of entries"""
+        return len(self.__entries)
+
+
+class ResponseCache:
+    """caches GET responses by path, query string and Accept header"""
+
+    def __init__(self, backend=None, ttl=None):
+        """Instantiate a cache storing into backend, disabled if None"""
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """returns the cache configured by the HBNB_API_CACHE_* variables"""
+        size = int(getenv("HBNB_API_CACHE_SIZE") or 0)
+        if size <= 0:
+            return cls()
+        ttl = float(getenv("HBNB_API_CACHE_TTL") or 0) or None
+        path = getenv("HBNB_API_CACHE_BACKEND")
+        if path:
+            module, name = path.split(":")
+            backend = getattr(importlib.import_module(module), name)()
+        else:
+            backend = LocalBackend(size)
+        return cls(backend, ttl)
+
+    @property
+    def enabled(self):
+        """tells whether responses are cached"""
+        return self.backend is not None
+
+    def invalidate(self, name, key=None):
+        """drops the responses built from the objects of class name; key,
+        the object changed, is not needed"""
+        if self.backend is not None:
+            self.backend.incr("generation:" + name)
+
+    def generations(self, names):
+        """returns the current generation of each class in names"""
+        return tuple(self.backend.get("generation:" + name) or 0
+                     for name in names)
+
+    def get(self, key, names):
+        """returns the response cached under key if none of the classes
+        in names changed since, None otherwise"""
+        entry = self.backend.get(key)
+        hit = entry is not None and entry[0] == self.generations(names)
+        with self.__lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            status, headers, body = entry[1:]
+            return make_response(body, status, headers)
+        return None
+
+    def set(self, key, generations, response):
+        """caches response under key, built at generations"""
+        entry = (generations, response.status_code,
+                 list(response.headers.items()), response.get_data())
+        self.backend.set(key, entry, self.ttl)
+
+    def stats(self):
+        """returns the hit and miss counters"""
+        return {"enabled": self.enabled, "hits": self.hits,
+                "misses": self.misses}
+
+
+cache = ResponseCache.from_env()
+storage.subscribe(cache.invalidate)
+
+
+def cached(*names):
+    """caches the GET responses of the view, until an object of one of
+    the classes names is stored or deleted"""
+    def decorator(view):
+        """returns the caching version of view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """answers from the cache, or calls view and caches its 200s"""
+            if not cache.enabled or request.method != "GET":
+                return view(*args, **kwargs)
+            key = "response:{} {} {}".format(
+                request.path, request.query_string.decode(),
+                request.headers.get("Accept", ""))
+            response = cache.get(key, names)
+            if response is not None:
+                response.headers["X-Cache"] = "HIT"
+                return response.make_conditional(request)
+            # read before the view runs: a change made meanwhile makes
+            # the entry stale rather than hiding the change
+            generations = cache.generations(names)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(key, generations, response)
+                response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
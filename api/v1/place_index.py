@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+"""
+Columnar index of the numeric attributes of the places, for range queries
+
+The index holds one array per attribute of NUMERIC_FIELDS, a row per place,
+and answers "price_by_night between 50 and 200, max_guest at least 4,
+latitude and longitude inside a box" by comparing whole columns at once:
+with NumPy when it is installed, otherwise by bisecting sorted copies of
+the stdlib array columns. The storage calls changed(<class name>, <key>)
+on each change; the next search updates the row of each place changed,
+and reads every place again only when the storage cannot name them.
+
+In database mode, the views pass the ranges to the query instead (see
+place_ranges in views/places.py), and there is no index.
+"""
+from array import array
+import bisect
+from models import storage, storage_t
+from models.place import Place
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the attributes of Place the index answers range queries on
+NUMERIC_FIELDS = ("number_rooms", "number_bathrooms", "max_guest",
+                  "price_by_night", "latitude", "longitude")
+INF = float("inf")
+NAN = float("nan")
+
+
+def number(value):
+    """returns value as a float, NaN (which no range holds) if it is not a
+    number"""
+    if type(value) is float or type(value) is int:
+        return float(value)
+    if type(value) is bool:
+        return NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class PlaceIndex:
+    """per-field columns of the numeric attributes of the places of a
+    storage, read on the first search of the field
+
+    A changed place gets its row updated, a new one a row appended, and a
+    deleted one its row emptied (NaN in every column) until more than half
+    of the rows are empty and the columns are read again. Without NumPy, a
+    column also gets a sorted copy and the rows in that order, so a search
+    bisects the narrowest range instead of comparing every row in
+    Python."""
+
+    def __init__(self, storage):
+        """Instantiate the index of the places of storage"""
+        self.__storage = storage
+        # the place of each row, None once deleted
+        self.__places = []
+        # {<place id>: row}
+        self.__rows = {}
+        self.__columns = {}
+        self.__sorted = {}
+        self.__stale = True
+        # the keys of the places changed since the last search; guarded by
+        # __changes_lock alone, as changed() runs under the storage lock
+        self.__changed = set()
+        self.__changes_lock = threading.Lock()
+        self.__lock = threading.Lock()
+        storage.subscribe(self.changed)
+
+    def changed(self, name, key=None):
+        """records that the place key changed, that any place may have if
+        key is None; it runs under the storage lock, so the rows are
+        updated by the next search"""
+        if name == "Place":
+            with self.__changes_lock:
+                if key is None:
+                    self.__stale = True
+                else:
+                    self.__changed.add(key)
+
+    def __column(self, field):
+        """returns the column of field, reading it on first use"""
+        if field not in self.__columns:
+            self.__columns[field] = array(
+                "d", [number(getattr(place, field, None))
+                      for place in self.__places])
+        return self.__columns[field]
+
+    def __sort(self, field):
+        """returns the sorted values of the column of field and their rows,
+        sorting them on first use"""
+        if field not in self.__sorted:
+            column = self.__column(field)
+            # NaN has no place in a sorted order, and is in no range
+            rows = [row for row in range(len(column))
+                    if column[row] == column[row]]
+            rows.sort(key=column.__getitem__)
+            self.__sorted[field] = (array("d", [column[row] for row in rows]),
+                                    array("q", rows))
+        return self.__sorted[field]
+
+    def __update(self):
+        """reads every place if the index is stale, otherwise updates the
+        rows of the places changed since the last search"""
+        with self.__changes_lock:
+            stale, self.__stale = self.__stale, False
+            changed, self.__changed = self.__changed, set()
+        if stale or 2 * len(self.__rows) < len(self.__places):
+            # a change made while reading the places is applied by the
+            # next search
+            self.__places = list(self.__storage.all(Place).values())
+            self.__rows = {place.id: row
+                           for row, place in enumerate(self.__places)}
+            self.__columns = {}
+            self.__sorted = {}
+            return
+        for key in changed:
+            place_id = key.partition(".")[2]
+            place = self.__storage.get(Place, place_id)
+            row = self.__rows.get(place_id)
+            if row is None:
+                if place is None:
+                    continue
+                row = len(self.__places)
+                self.__rows[place_id] = row
+                self.__places.append(None)
+                for column in self.__columns.values():
+                    column.append(NAN)
+            elif place is None:
+                del self.__rows[place_id]
+            self.__places[row] = place
+            for field, column in self.__columns.items():
+                self.__set(field, row, number(getattr(place, field, None)))
+
+    def __set(self, field, row, value):
+        """sets the value of row in the column of field and its sorted
+        copy"""
+        column = self.__columns[field]
+        old = column[row]
+        if old == value or (old != old and value != value):
+            return
+        column[row] = value
+        if field in self.__sorted:
+            values, rows = self.__sorted[field]
+            if old == old:
+                i = bisect.bisect_left(values, old)
+                while rows[i] != row:
+                    i += 1
+                del values[i]
+                del rows[i]
+            if value == value:
+                i = bisect.bisect_right(values, value)
+                values.insert(i, value)
+                rows.insert(i, row)
+
+    def search(self, ranges):
+        """returns the set of the ids of the places whose attributes are
+        within ranges, {<field>: (<lowest or None>, <highest or None>)}
+        with inclusive bounds"""
+        ranges = {field: (-INF if low is None else low,
+                          INF if high is None else high)
+                  for field, (low, high) in ranges.items()}
+        with self.__lock:
+            self.__update()
+            if not ranges:
+                return set(self.__rows)
+            if numpy is not None:
+                rows = self.__match(ranges)
+            else:
+                rows = self.__bisect(ranges)
+            places = self.__places
+            return {places[row].id for row in rows}
+
+    def __match(self, ranges):
+        """returns the rows within ranges, comparing whole columns with
+        NumPy; the views of the columns are gone once it returns, so the
+        columns can grow again"""
+        if not self.__places:
+            return []
+        mask = numpy.ones(len(self.__places), dtype=bool)
+        for field, (low, high) in ranges.items():
+            column = numpy.frombuffer(self.__column(field),
+                                      dtype=numpy.float64)
+            mask &= (column >= low) & (column <= high)
+        return numpy.flatnonzero(mask).tolist()
+
+    def __bisect(self, ranges):
+        """returns the rows within ranges: those of the narrowest range,
+        bisected in its sorted copy, checked against the others"""
+        rows = None
+        for field, (low, high) in ranges.items():
+            values, order = self.__sort(field)
+            found = order[bisect.bisect_left(values, low):
+                          bisect.bisect_right(values, high)]
+            if rows is None or len(found) < len(rows):
+                rows = found
+        for field, (low, high) in ranges.items():
+            column = self.__column(field)
+            rows = [row for row in rows if low <= column[row] <= high]
+        return rows
+
+
+def ranges_of(params):
+    """returns the {<field>: (<lowest>, <highest>)} ranges given by the
+    <field>_min and <field>_max keys of the dict params, None for a
+    missing bound; raises ValueError naming a bound that is not a
+    number"""
+    ranges = {}
+    for field in NUMERIC_FIELDS:
+        bounds = []
+        for suffix in ("_min", "_max"):
+            value = params.get(field + suffix)
+            if value is not None:
+                value = number(value)
+                if value != value:
+                    raise ValueError(field + suffix)
+            bounds.append(value)
+        if bounds != [None, None]:
+            ranges[field] = tuple(bounds)
+    return ranges
+
+
+# the database answers range queries itself
+place_index = None if storage_t == "db" else PlaceIndex(storage)
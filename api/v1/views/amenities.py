@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 """Handles all default RESTful API actions for Amenity objects"""
+from api.v1.cache import cached
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.collection import list_response
 from flask import jsonify, abort, request
 from models import storage
 from models.amenity import Amenity
@@ -8,6 +11,7 @@ from models.amenity import Amenity
 
 @app_views.route("/amenities", methods=["GET"])
 @app_views.route("/amenities/<amenity_id>", methods=["GET"])
+@cached("Amenity")
 def get_amenities(amenity_id=None):
     """Retrieves Amenity object(s)
 
@@ -23,13 +27,9 @@ def get_amenities(amenity_id=None):
         amenity_obj = storage.get(Amenity, amenity_id)
         if not amenity_obj:
             abort(404)
-        return jsonify(amenity_obj.to_dict())
-    # Returns all existing amenity objs
-    amenities_list = []
-    for obj_key, amenity_object in storage.all(Amenity).items():
-        amenity_dict = amenity_object.to_dict()
-        amenities_list.append(amenity_dict)
-    return jsonify(amenities_list)
+        return object_response(amenity_obj)
+    # Returns a page of the existing amenity objs
+    return list_response(Amenity)
 
 
 @app_views.route("/amenities/<amenity_id>", methods=["DELETE"])
@@ -43,14 +43,13 @@ def delete_amenity(amenity_id):
         dict: empty dictionary and Status:200 on success,
               otherwise abort(404)
     """
-    if amenity_id:
-        amenity_key = "Amenity." + amenity_id
-        if amenity_key in storage.all():
-            storage.all()[amenity_key].delete()
-            storage.save()
-            return jsonify({}), 200
+    amenity_obj = storage.get(Amenity, amenity_id)
     # Returns error if amenity_id doesn't match any objects
-    abort(404)
+    if not amenity_obj:
+        abort(404)
+    amenity_obj.delete()
+    storage.save()
+    return jsonify({}), 200
 
 
 @app_views.route("/amenities", methods=["POST"])
@@ -77,7 +76,7 @@ def create_amenity(amenity_id=None):
         for key, value in data.items():
             if key not in ["id", "created_at", "updated_at"]:
                 setattr(amenity_obj, key, value)
-        storage.save()
+        amenity_obj.save()
         return jsonify(amenity_obj.to_dict()), 200
     if "name" not in data:
         abort(400, description="Missing name")
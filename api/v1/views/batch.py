@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Applies lists of create, update and delete operations at once"""
+from api.v1.views import app_views
+from datetime import datetime
+from flask import jsonify, abort, request
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from os import getenv
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+# attributes a create must give, by class name
+required = {"Amenity": ("name",), "City": ("name", "state_id"),
+            "Place": ("name", "city_id", "user_id"),
+            "Review": ("text", "place_id", "user_id"), "State": ("name",),
+            "User": ("email", "password")}
+# class of the object each reference attribute points to, by class name
+parents = {"City": {"state_id": "State"},
+           "Place": {"city_id": "City", "user_id": "User"},
+           "Review": {"place_id": "Place", "user_id": "User"}}
+# attributes an update leaves as they are, like the PUT views do
+frozen = {"Place": ("user_id", "city_id"), "Review": ("user_id", "place_id"),
+          "User": ("email",)}
+# largest number of operations in one batch
+BATCH_MAX = int(getenv("HBNB_API_BATCH_MAX") or 100000)
+
+
+@app_views.route("/batch", methods=["POST"])
+def batch():
+    """Applies a json list of operations with a single storage save
+
+    Each operation is one of:
+        {"op": "create", "class": <class name>, "data": {...}}
+        {"op": "update", "class": <class name>, "id": <id>, "data": {...}}
+        {"op": "delete", "class": <class name>, "id": <id>}
+    A create may give the id of the new object in data, so that later
+    operations of the batch can refer to it.
+
+    Returns:
+        json: list of the results of the operations (the created or
+              updated obj, {} for a deletion) and Status:200, otherwise
+              abort(400) naming the first invalid operation, with nothing
+              applied
+    """
+    if not request.is_json:
+        abort(400, description="Not a JSON")
+    operations = request.get_json(silent=True)
+    if not isinstance(operations, list):
+        abort(400, description="Not a JSON")
+    if len(operations) > BATCH_MAX:
+        abort(413, description="More than {:d} operations".format(BATCH_MAX))
+    # the objects of the batch by key, as the operations before the
+    # current one left them (None once deleted); the storage is only asked
+    # once per id
+    objs = {}
+
+    def lookup(name, obj_id):
+        """returns the object of class name with obj_id, None if none"""
+        key = "{}.{}".format(name, obj_id)
+        if key not in objs:
+            objs[key] = storage.get(classes[name], str(obj_id))
+        return objs[key]
+
+    def invalid(index, description):
+        """aborts with a 400 naming the operation at index"""
+        abort(400, description="Operation {:d}: {}".format(
+            index, description))
+
+    plan = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            invalid(index, "Not a JSON")
+        op = operation.get("op")
+        name = operation.get("class")
+        data = operation.get("data", {})
+        if type(name) is not str or name not in classes:
+            invalid(index, "Unknown class")
+        if not isinstance(data, dict):
+            invalid(index, "Not a JSON")
+        if op == "create":
+            for attr in required[name]:
+                if attr not in data:
+                    invalid(index, "Missing " + attr)
+            if "id" in data:
+                if type(data["id"]) is not str or not data["id"]:
+                    invalid(index, "Invalid id")
+                if lookup(name, data["id"]) is not None:
+                    invalid(index, "Duplicate id")
+        elif op in ("update", "delete"):
+            obj = lookup(name, operation.get("id"))
+            if obj is None:
+                invalid(index, "Not found")
+        else:
+            invalid(index, "Unknown op")
+        for attr, parent in parents.get(name, {}).items():
+            if op == "update" and attr in frozen.get(name, ()):
+                continue
+            if attr in data and lookup(parent, data[attr]) is None:
+                invalid(index, "Not found: " + attr)
+        if op == "create":
+            obj = classes[name](**data)
+            objs[name + "." + obj.id] = obj
+        elif op == "delete":
+            objs[name + "." + obj.id] = None
+        plan.append((op, obj, data))
+    results = []
+    for op, obj, data in plan:
+        if op == "delete":
+            storage.delete(obj)
+            results.append({})
+            continue
+        if op == "update":
+            ignored = ("id", "created_at", "updated_at")
+            ignored += frozen.get(obj.__class__.__name__, ())
+            for key, value in data.items():
+                if key not in ignored:
+                    setattr(obj, key, value)
+            obj.updated_at = datetime.utcnow()
+        storage.new(obj)
+        results.append(obj.to_dict())
+    storage.save()
+    return jsonify(results), 200
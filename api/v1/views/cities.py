@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Handles all default RESTful API actions for City objects"""
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.collection import list_response
 from flask import jsonify, abort, request
 from models import storage
 from models.city import City
@@ -17,16 +19,11 @@ def get_cities(state_id=None):
     Returns:
         json: Returns json list of all city objs for state if state_id given.
     """
-    # Returns all city objs containing matching state_id
+    # Returns a page of the city objs containing matching state_id
     state_obj = storage.get(State, state_id)
     if not state_obj:
         abort(404)
-    city_list = []
-    for obj_key, city_obj in storage.all(City).items():
-        if city_obj.state_id == state_id:
-            city_dict = city_obj.to_dict()
-            city_list.append(city_dict)
-    return jsonify(city_list)
+    return list_response(City, state_id=state_id)
 
 
 @app_views.route("/cities/<city_id>", methods=["GET"])
@@ -43,7 +40,7 @@ def get_city(city_id=None):
     city_obj = storage.get(City, city_id)
     if not city_obj:
         abort(404)
-    return jsonify(city_obj.to_dict())
+    return object_response(city_obj)
 
 
 @app_views.route("/cities/<city_id>", methods=["DELETE"])
@@ -57,14 +54,13 @@ def delete_city(city_id):
         dict: empty dictionary and Status:200 on success,
               otherwise abort(404)
     """
-    if city_id:
-        city_key = "City." + city_id
-        if city_key in storage.all():
-            storage.all()[city_key].delete()
-            storage.save()
-            return jsonify({}), 200
+    city_obj = storage.get(City, city_id)
     # Returns error if city_id doesn't match any objects
-    abort(404)
+    if not city_obj:
+        abort(404)
+    city_obj.delete()
+    storage.save()
+    return jsonify({}), 200
 
 
 @app_views.route("/states/<state_id>/cities", methods=["POST"])
@@ -112,5 +108,5 @@ def update_city(city_id=None):
     for key, value in data.items():
         if key not in ["id", "created_at", "updated_at"]:
             setattr(city_obj, key, value)
-    storage.save()
+    city_obj.save()
     return jsonify(city_obj.to_dict()), 200
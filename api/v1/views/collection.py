@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""Pagination and field projection shared by the list views"""
+from api.v1.views.conditional import make_etag, not_modified, validate
+import base64
+from flask import abort, current_app, jsonify, request
+from flask import stream_with_context
+import json
+from models import storage
+from models.base_model import format_time, parse_time
+
+# objects written out at a time by the streamed responses
+STREAM_CHUNK = 1000
+
+
+def encode_cursor(obj):
+    """returns the opaque cursor of the page starting after obj"""
+    position = json.dumps([format_time(obj.created_at), obj.id])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """returns the (created_at, id) pair the cursor points after, or
+    abort(400) if it is not a cursor"""
+    try:
+        created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+        created_at = parse_time(created_at)
+    except (ValueError, TypeError):
+        abort(400, description="Invalid cursor")
+    # the stored timestamps are naive and the ids strings, anything else
+    # could not be compared with them
+    if created_at.tzinfo is not None or type(obj_id) is not str:
+        abort(400, description="Invalid cursor")
+    return (created_at, obj_id)
+
+
+def project(obj, fields):
+    """returns the dict of obj, restricted to fields if given"""
+    obj_dict = obj.to_dict()
+    if fields:
+        obj_dict = {key: obj_dict[key] for key in fields if key in obj_dict}
+    return obj_dict
+
+
+def stream(objs, fields, ndjson):
+    """yields the objs as a JSON array, or one JSON document per line if
+    ndjson, STREAM_CHUNK objs at a time"""
+    dumps = current_app.json.dumps
+    separator = "\n" if ndjson else ","
+    lines = []
+    started = False
+    if not ndjson:
+        yield "["
+    for obj in objs:
+        lines.append(dumps(project(obj, fields)))
+        if len(lines) == STREAM_CHUNK:
+            yield (separator if started else "") + separator.join(lines)
+            lines = []
+            started = True
+    if lines:
+        yield (separator if started else "") + separator.join(lines)
+    yield "\n" if ndjson else "]\n"
+
+
+def list_response(cls, **criteria):
+    """Returns the json list of the objs of class cls matching criteria
+
+    The query string may give:
+        limit (int): the maximum number of objs to return
+        cursor (str): the X-Next-Cursor header of the previous page
+        fields (str): comma-separated attributes to keep in each obj
+        stream (int): 1 to write the list as the objs are serialized
+
+    The list is streamed as NDJSON, one obj per line, to clients that
+    prefer application/x-ndjson over application/json.
+
+    The ETag comes from the storage version of the class: a client that
+    sends it back gets an empty 304 until an obj of the class changes.
+
+    Returns:
+        json: list of obj dicts ordered by created_at, with the cursor of
+              the next page in the X-Next-Cursor header when limit is
+              reached, otherwise abort(400) on an invalid parameter
+    """
+    limit = request.args.get("limit")
+    if limit is not None:
+        if not limit.isdigit() or int(limit) == 0:
+            abort(400, description="Invalid limit")
+        limit = int(limit)
+    cursor = request.args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+    fields = request.args.get("fields")
+    fields = fields.split(",") if fields else None
+    ndjson = request.accept_mimetypes.best_match(
+        ["application/json", "application/x-ndjson"]) == "application/x-ndjson"
+    streamed = ndjson or request.args.get("stream") == "1"
+    mimetype = "application/x-ndjson" if ndjson else "application/json"
+    token, changed_at = storage.version(cls, **criteria)
+    etag = make_etag(request.path, request.query_string, mimetype, token)
+    response = not_modified(etag, changed_at)
+    if response is not None:
+        return response
+    if streamed and limit is None:
+        # the whole collection, in a single pass of the storage over it,
+        # never held in memory at once
+        objs = storage.iterate(cls, after=after, fields=fields, **criteria)
+    else:
+        objs = storage.page(cls, limit=limit, after=after, fields=fields,
+                            **criteria)
+    if streamed:
+        body = stream_with_context(stream(objs, fields, ndjson))
+        response = current_app.response_class(body, mimetype=mimetype)
+    else:
+        response = jsonify([project(obj, fields) for obj in objs])
+    if limit is not None and len(objs) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(objs[-1])
+    response.vary.add("Accept")
+    return validate(response, etag, changed_at)
@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""Conditional GET support (ETag, Last-Modified) shared by the views"""
+from flask import current_app, jsonify, request
+import hashlib
+from werkzeug.http import is_resource_modified
+
+
+def make_etag(*parts):
+    """returns a strong ETag for the representation identified by parts"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def validate(response, etag, last_modified=None):
+    """sets the ETag and, if given, Last-Modified headers of response"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def not_modified(etag, last_modified=None):
+    """returns an empty 304 response if the If-None-Match or
+    If-Modified-Since headers of the request match, None otherwise"""
+    if is_resource_modified(request.environ, etag=etag,
+                            last_modified=last_modified):
+        return None
+    return validate(current_app.response_class(status=304), etag,
+                    last_modified)
+
+
+def object_response(obj):
+    """Returns the json of obj with its validators
+
+    Returns:
+        json: obj dict with an ETag from its id and updated_at, or an
+              empty 304 without serializing obj if the client has it
+    """
+    etag = make_etag(obj.__class__.__name__, obj.id, obj.updated_at)
+    response = not_modified(etag, obj.updated_at)
+    if response is None:
+        response = validate(jsonify(obj.to_dict()), etag, obj.updated_at)
+    return response
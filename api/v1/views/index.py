@@ -3,7 +3,11 @@
 """defines status route"""
 
 from flask import jsonify
+from api.v1.cache import cache, cached
 from api.v1.views import app_views
+from os import getenv
+import threading
+import time
 from models import storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -15,6 +19,14 @@ from models.user import User
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# seconds a /stats result is served again before counting anew, 0 to
+# count on every request
+STATS_TTL = float(getenv("HBNB_API_STATS_TTL", 0))
+stats_names = {"Amenity": "amenities", "City": "cities", "Place": "places",
+               "Review": "reviews", "State": "states", "User": "users"}
+stats_cache = {"expires": 0, "response": None}
+stats_lock = threading.Lock()
+
 
 @app_views.route("/status")
 def status():
@@ -23,13 +35,26 @@ def status():
 
 
 @app_views.route("/stats")
+@cached("Amenity", "City", "Place", "Review", "State", "User")
 def stats():
-    response = {
-        "amenities": storage.count(Amenity),
-        "cities": storage.count(City),
-        "places": storage.count(Place),
-        "reviews": storage.count(Review),
-        "states": storage.count(State),
-        "users": storage.count(User)
-    }
+    if STATS_TTL <= 0:
+        return jsonify(count_stats())
+    # one request counts while the others wait for its result
+    with stats_lock:
+        if time.monotonic() >= stats_cache["expires"]:
+            stats_cache["response"] = count_stats()
+            stats_cache["expires"] = time.monotonic() + STATS_TTL
+        response = stats_cache["response"]
     return jsonify(response)
+
+
+def count_stats():
+    """returns the number of objects of each class, by plural name"""
+    counts = storage.counts(Amenity, City, Place, Review, State, User)
+    return {stats_names[name]: count for name, count in counts.items()}
+
+
+@app_views.route("/cache")
+def cache_stats():
+    """returns the hit and miss counters of the response cache"""
+    return jsonify(cache.stats())
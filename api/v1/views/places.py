@@ -1,9 +1,13 @@
 #!/usr/bin/python3
 """Handles all default RESTful API actions for place objects"""
+from api.v1.place_index import place_index, ranges_of
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.collection import list_response
 from flask import jsonify, abort, request
-from models import storage
+from models import storage, storage_t
 from models.city import City
+from models.engine.db_storage import Between
 from models.place import Place
 from models.user import User
 
@@ -15,19 +19,35 @@ def get_places(city_id=None):
     Args:
         city_id (uuid): uuid for city linked to place objs
 
+    The query string may also give <field>_min and <field>_max bounds of
+    the numeric attributes (see place_index.NUMERIC_FIELDS), e.g.
+    price_by_night_max=200&max_guest_min=4.
+
     Returns:
         json: Returns json list of all place objs for city if city_id given.
     """
-    # Returns all place objs containing matching city_id
+    # Returns a page of the place objs containing matching city_id
     city_obj = storage.get(City, city_id)
     if not city_obj:
         abort(404)
-    place_list = []
-    for obj_key, place_obj in storage.all(Place).items():
-        if place_obj.city_id == city_id:
-            place_dict = place_obj.to_dict()
-            place_list.append(place_dict)
-    return jsonify(place_list)
+    return list_response(Place, city_id=city_id, **place_ranges(request.args))
+
+
+def place_ranges(params):
+    """returns the criteria of the places within the numeric bounds the
+    dict params gives (see place_index.ranges_of), {} if none, otherwise
+    abort(400): {"id": <ids of the places>} from the place index, or a
+    Between per attribute in database mode, compared by the query"""
+    try:
+        ranges = ranges_of(params)
+    except ValueError as e:
+        abort(400, description="Invalid " + str(e))
+    if storage_t == "db":
+        return {field: Between(low, high)
+                for field, (low, high) in ranges.items()}
+    if not ranges:
+        return {}
+    return {"id": place_index.search(ranges)}
 
 
 @app_views.route("/places/<place_id>", methods=["GET"])
@@ -44,7 +64,7 @@ def get_place(place_id=None):
     place_obj = storage.get(Place, place_id)
     if not place_obj:
         abort(404)
-    return jsonify(place_obj.to_dict())
+    return object_response(place_obj)
 
 
 @app_views.route("/places/<place_id>", methods=["DELETE"])
@@ -58,14 +78,13 @@ def delete_place(place_id):
         dict: empty dictionary and Status:200 on success,
               otherwise abort(404)
     """
-    if place_id:
-        place_key = "Place." + place_id
-        if place_key in storage.all():
-            storage.all()[place_key].delete()
-            storage.save()
-            return jsonify({}), 200
+    place_obj = storage.get(Place, place_id)
     # Returns error if place_id doesn't match any objects
-    abort(404)
+    if not place_obj:
+        abort(404)
+    place_obj.delete()
+    storage.save()
+    return jsonify({}), 200
 
 
 @app_views.route("/cities/<city_id>/places", methods=["POST"])
@@ -116,5 +135,47 @@ def update_place(place_id=None):
     for key, value in data.items():
         if key not in ["id", "user_id", "city_id", "created_at", "updated_at"]:
             setattr(place_obj, key, value)
-    storage.save()
+    place_obj.save()
     return jsonify(place_obj.to_dict()), 200
+
+
+@app_views.route("/places_search", methods=["POST"])
+def places_search():
+    """Retrieves the place objs matching json lists of ids
+
+    The json may give:
+        states (list): ids of states whose cities' places are included
+        cities (list): ids of cities whose places are included
+        amenities (list): ids of amenities every place must have
+        <field>_min, <field>_max (number): bounds of the numeric
+            attributes, as for GET /cities/<city_id>/places
+
+    Returns:
+        json: list of matching place objs, all of them if no list is
+              given (or only empty ones), otherwise abort(400), also
+              when a list holds something other than id strings
+    """
+    if not request.is_json:
+        abort(400, description="Not a JSON")
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        abort(400, description="Not a JSON")
+    for key in ("states", "cities", "amenities"):
+        ids = data.get(key) or []
+        if not isinstance(ids, list) or \
+                not all(type(item) is str for item in ids):
+            abort(400, description="Invalid " + key)
+    state_ids = data.get("states") or []
+    city_ids = set(data.get("cities") or [])
+    amenity_ids = data.get("amenities") or []
+    criteria = place_ranges(data)
+    if state_ids or city_ids:
+        # the cities of the states, then their places, from the indexes
+        for city_obj in storage.filter(City, state_id=state_ids).values():
+            city_ids.add(city_obj.id)
+        criteria["city_id"] = list(city_ids)
+    if amenity_ids:
+        places = storage.linked(Place, "amenities", amenity_ids, **criteria)
+    else:
+        places = storage.filter(Place, **criteria)
+    return jsonify([place_obj.to_dict() for place_obj in places.values()])
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Handles all default RESTful API actions for place-amenity links"""
+from api.v1.views import app_views
+from flask import jsonify, abort
+from models import storage
+from models.amenity import Amenity
+from models.place import Place
+
+
+@app_views.route("/places/<place_id>/amenities", methods=["GET"])
+def get_place_amenities(place_id=None):
+    """Retrieves list of all amenities linked to given place id
+
+    Args:
+        place_id (uuid): uuid for place linked to amenity objs
+
+    Returns:
+        json: Returns json list of all amenity objs for place if place_id
+              given.
+    """
+    place_obj = storage.get(Place, place_id)
+    if not place_obj:
+        abort(404)
+    return jsonify([amenity_obj.to_dict()
+                    for amenity_obj in place_obj.amenities])
+
+
+@app_views.route("/places/<place_id>/amenities/<amenity_id>",
+                 methods=["DELETE"])
+def unlink_place_amenity(place_id=None, amenity_id=None):
+    """Unlinks the amenity obj matching amenity_id from the place obj
+    matching place_id
+
+    Args:
+        place_id (uuid): uuid of place obj
+        amenity_id (uuid): uuid of amenity obj
+
+    Returns:
+        dict: empty dictionary and Status:200 on success,
+              otherwise abort(404)
+    """
+    place_obj = storage.get(Place, place_id)
+    amenity_obj = storage.get(Amenity, amenity_id)
+    # Returns error if either id doesn't match, or they are not linked
+    if not place_obj or not amenity_obj:
+        abort(404)
+    if not storage.unlink(place_obj, "amenities", amenity_obj):
+        abort(404)
+    storage.save()
+    return jsonify({}), 200
+
+
+@app_views.route("/places/<place_id>/amenities/<amenity_id>",
+                 methods=["POST"])
+def link_place_amenity(place_id=None, amenity_id=None):
+    """Links the amenity obj matching amenity_id to the place obj matching
+    place_id
+
+    Args:
+        place_id (uuid): uuid of place obj
+        amenity_id (uuid): uuid of amenity obj
+
+    Returns:
+        json: amenity obj and Status:201 once linked, Status:200 if it
+              already was, otherwise abort(404)
+    """
+    place_obj = storage.get(Place, place_id)
+    amenity_obj = storage.get(Amenity, amenity_id)
+    if not place_obj or not amenity_obj:
+        abort(404)
+    if not storage.link(place_obj, "amenities", amenity_obj):
+        return jsonify(amenity_obj.to_dict()), 200
+    storage.save()
+    return jsonify(amenity_obj.to_dict()), 201
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Handles all default RESTful API actions for review objects"""
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.collection import list_response
 from flask import jsonify, abort, request
 from models import storage
 from models.place import Place
@@ -18,16 +20,11 @@ def get_reviews(place_id=None):
     Returns:
         json: Returns json list of all review objs for place if place_id given.
     """
-    # Returns all review objs containing matching place_id
+    # Returns a page of the review objs containing matching place_id
     place_obj = storage.get(Place, place_id)
     if not place_obj:
         abort(404)
-    review_list = []
-    for obj_key, review_obj in storage.all(Review).items():
-        if review_obj.place_id == place_id:
-            review_dict = review_obj.to_dict()
-            review_list.append(review_dict)
-    return jsonify(review_list)
+    return list_response(Review, place_id=place_id)
 
 
 @app_views.route("/reviews/<review_id>", methods=["GET"])
@@ -44,7 +41,7 @@ def get_review(review_id=None):
     review_obj = storage.get(Review, review_id)
     if not review_obj:
         abort(404)
-    return jsonify(review_obj.to_dict())
+    return object_response(review_obj)
 
 
 @app_views.route("/reviews/<review_id>", methods=["DELETE"])
@@ -58,14 +55,13 @@ def delete_review(review_id):
         dict: empty dictionary and Status:200 on success,
               otherwise abort(404)
     """
-    if review_id:
-        review_key = "Review." + review_id
-        if review_key in storage.all():
-            storage.all()[review_key].delete()
-            storage.save()
-            return jsonify({}), 200
+    review_obj = storage.get(Review, review_id)
     # Returns error if review_id doesn't match any objects
-    abort(404)
+    if not review_obj:
+        abort(404)
+    review_obj.delete()
+    storage.save()
+    return jsonify({}), 200
 
 
 @app_views.route("/places/<place_id>/reviews", methods=["POST"])
@@ -118,5 +114,5 @@ def update_review(review_id=None):
             "id", "user_id", "place_id", "created_at", "updated_at"
         ]:
             setattr(review_obj, key, value)
-    storage.save()
+    review_obj.save()
     return jsonify(review_obj.to_dict()), 200
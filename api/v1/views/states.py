@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 """Handles all default RESTful API actions for State objects"""
+from api.v1.cache import cached
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.collection import list_response
 from flask import jsonify, abort, request
 from models import storage
 from models.state import State
@@ -8,6 +11,7 @@ from models.state import State
 
 @app_views.route("/states", methods=["GET"])
 @app_views.route("/states/<state_id>", methods=["GET"])
+@cached("State")
 def get_states(state_id=None):
     """Retrieves State object(s)
 
@@ -24,13 +28,9 @@ def get_states(state_id=None):
         state_obj = storage.get(State, state_id)
         if not state_obj:
             abort(404)
-        return jsonify(state_obj.to_dict())
-    # Returns all existing state objs
-    states_list = []
-    for obj_key, state_object in storage.all(State).items():
-        state_dict = state_object.to_dict()
-        states_list.append(state_dict)
-    return jsonify(states_list)
+        return object_response(state_obj)
+    # Returns a page of the existing state objs
+    return list_response(State)
 
 
 @app_views.route("/states/<state_id>", methods=["DELETE"])
@@ -44,14 +44,13 @@ def delete_state(state_id):
         dict: empty dictionary and Status:200 on success,
               otherwise abort(404)
     """
-    if state_id:
-        state_key = "State." + state_id
-        if state_key in storage.all():
-            storage.all()[state_key].delete()
-            storage.save()
-            return jsonify({}), 200
+    state_obj = storage.get(State, state_id)
     # if state_id doesn't match any objects, return 404
-    abort(404)
+    if not state_obj:
+        abort(404)
+    state_obj.delete()
+    storage.save()
+    return jsonify({}), 200
 
 
 @app_views.route("/states", methods=["POST"])
@@ -78,7 +77,7 @@ def create_state(state_id=None):
         for key, value in data.items():
             if key not in ["id", "created_at", "updated_at"]:
                 setattr(state_obj, key, value)
-        storage.save()
+        state_obj.save()
         return jsonify(state_obj.to_dict()), 200
     if "name" not in data:
         abort(400, description="Missing name")
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """Handles all default RESTful API actions for user objects"""
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.collection import list_response
 from flask import jsonify, abort, request
 from models import storage
 from models.user import User
@@ -23,13 +25,9 @@ def get_users(user_id=None):
         user_obj = storage.get(User, user_id)
         if not user_obj:
             abort(404)
-        return jsonify(user_obj.to_dict())
-    # Returns all existing user objs
-    users_list = []
-    for obj_key, user_object in storage.all(User).items():
-        user_dict = user_object.to_dict()
-        users_list.append(user_dict)
-    return jsonify(users_list)
+        return object_response(user_obj)
+    # Returns a page of the existing user objs
+    return list_response(User)
 
 
 @app_views.route("/users/<user_id>", methods=["DELETE"])
@@ -43,14 +41,13 @@ def delete_user(user_id):
         dict: empty dictionary and Status:200 on success,
               otherwise abort(404)
     """
-    if user_id:
-        user_key = "User." + user_id
-        if user_key in storage.all():
-            storage.all()[user_key].delete()
-            storage.save()
-            return jsonify({}), 200
+    user_obj = storage.get(User, user_id)
     # Returns error if user_id doesn't match any objects
-    abort(404)
+    if not user_obj:
+        abort(404)
+    user_obj.delete()
+    storage.save()
+    return jsonify({}), 200
 
 
 @app_views.route("/users", methods=["POST"])
@@ -77,7 +74,7 @@ def create_user(user_id=None):
         for key, value in data.items():
             if key not in ["id", "email", "created_at", "updated_at"]:
                 setattr(user_obj, key, value)
-        storage.save()
+        user_obj.save()
         return jsonify(user_obj.to_dict()), 200
     if "email" not in data:
         abort(400, description="Missing email")
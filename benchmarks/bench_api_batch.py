@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Times importing states, cities and places through the API: one POST per
+object against a single POST /api/v1/batch, which saves once
+
+usage: ./benchmarks/bench_api_batch.py [number of objects in the batch]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+import models  # noqa: E402
+from models.user import User  # noqa: E402
+from api.v1.app import app  # noqa: E402
+
+# objects imported one request at a time, the batch is extrapolated from
+SINGLE = 300
+
+
+def operations(size, user_id, prefix=""):
+    """returns the batch creating size objects: states of 10 cities of
+    10 places, the ids of the states and cities starting with prefix"""
+    batch = []
+    for number in range(size):
+        name = str(number)
+        if number % 111 == 0:
+            state_id = prefix + "state-" + name
+            batch.append({"op": "create", "class": "State",
+                          "data": {"id": state_id, "name": name}})
+        elif number % 111 % 11 == 1:
+            city_id = prefix + "city-" + name
+            batch.append({"op": "create", "class": "City",
+                          "data": {"id": city_id, "name": name,
+                                   "state_id": state_id}})
+        else:
+            batch.append({"op": "create", "class": "Place",
+                          "data": {"name": name, "city_id": city_id,
+                                   "user_id": user_id}})
+    return batch
+
+
+def single(client, batch):
+    """sends the operations of batch one request each"""
+    for operation in batch:
+        data = operation["data"]
+        name = operation["class"]
+        if name == "State":
+            client.post("/api/v1/states", json=data)
+        elif name == "City":
+            client.post("/api/v1/states/{}/cities".format(data["state_id"]),
+                        json=data)
+        else:
+            client.post("/api/v1/cities/{}/places".format(data["city_id"]),
+                        json=data)
+
+
+def main(size):
+    """imports SINGLE objects one by one, then size objects in a batch"""
+    client = app.test_client()
+    user = User(email="bench@hbnb.io", password="pwd")
+    models.storage.new(user)
+    models.storage.save()
+    start = time.perf_counter()
+    single(client, operations(SINGLE, user.id))
+    elapsed = time.perf_counter() - start
+    print("{:8d} objects  one request each {:8.2f} s  (at least {:.0f} s "
+          "for {:d})".format(SINGLE, elapsed, elapsed * size / SINGLE,
+                             size))
+    batch = operations(size, user.id, "batch-")
+    start = time.perf_counter()
+    response = client.post("/api/v1/batch", json=batch)
+    assert response.status_code == 200, response.get_data()
+    print("{:8d} objects  one batch          {:8.2f} s".format(
+        size, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Compares GET /api/v1/states answered with jsonify() and streamed
+(?stream=1): time to the first byte, total time and peak memory of the
+request, as the number of states grows
+
+usage: ./benchmarks/bench_api_stream.py [largest number of states]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+import models  # noqa: E402
+from models.state import State  # noqa: E402
+from api.v1.app import app  # noqa: E402
+
+
+def request(client, url):
+    """returns the seconds to the first chunk and to the last of the
+    response to url"""
+    start = time.perf_counter()
+    first = None
+    response = client.get(url, buffered=False)
+    for chunk in response.response:
+        if first is None:
+            first = time.perf_counter() - start
+    response.close()
+    return first, time.perf_counter() - start
+
+
+def peak(client, url):
+    """returns the peak memory allocated while answering url, in MB"""
+    tracemalloc.start()
+    request(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main(largest):
+    """grows the states by steps of 10x and measures both responses"""
+    client = app.test_client()
+    size = 1000
+    while size <= largest:
+        while models.storage.count(State) < size:
+            models.storage.new(State(name="State"))
+        for name, url in [("jsonify", "/api/v1/states"),
+                          ("stream", "/api/v1/states?stream=1")]:
+            first, total = request(client, url)
+            print("{:8d} states  {:8s} first byte {:7.1f} ms  total "
+                  "{:7.1f} ms  peak {:6.1f} MB".format(
+                      size, name, first * 1e3, total * 1e3,
+                      peak(client, url)))
+        size *= 10
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
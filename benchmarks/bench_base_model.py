@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Measures the throughput of building every model class from a to_dict()
+(what reload() and the API do) and of serializing it back with to_dict(),
+against the setattr()/strptime()/strftime() implementation they replace
+
+usage: ./benchmarks/bench_base_model.py [number of objects per class]
+"""
+
+from datetime import datetime
+import os
+import sys
+import tempfile
+import time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.base_model import time  # noqa: E402
+from models.engine.file_storage import classes  # noqa: E402
+
+samples = {
+    "Amenity": {"name": "Wifi"},
+    "BaseModel": {},
+    "City": {"name": "Fremont", "state_id": "1"},
+    "Place": {"name": "Loft", "city_id": "1", "user_id": "1",
+              "description": "Sunny", "number_rooms": 2,
+              "number_bathrooms": 1, "max_guest": 4, "price_by_night": 120,
+              "latitude": 37.77, "longitude": -122.41,
+              "amenity_ids": ["1", "2"]},
+    "Review": {"text": "Nice", "place_id": "1", "user_id": "1"},
+    "State": {"name": "California"},
+    "User": {"email": "bob@hbnb.io", "password": "pwd",
+             "first_name": "Bob", "last_name": "Dylan"},
+}
+
+
+def legacy_init(obj, kwargs):
+    """the former BaseModel.__init__ with kwargs"""
+    for key, value in kwargs.items():
+        if key != "__class__":
+            setattr(obj, key, value)
+    obj.created_at = datetime.strptime(kwargs["created_at"], time)
+    obj.updated_at = datetime.strptime(kwargs["updated_at"], time)
+
+
+def legacy_to_dict(obj):
+    """the former BaseModel.to_dict"""
+    new_dict = obj.__dict__.copy()
+    new_dict["created_at"] = new_dict["created_at"].strftime(time)
+    new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+    new_dict["__class__"] = obj.__class__.__name__
+    if "_sa_instance_state" in new_dict:
+        del new_dict["_sa_instance_state"]
+    return new_dict
+
+
+def rate(func, items):
+    """returns the number of items per second func processes"""
+    start = clock.perf_counter()
+    for item in items:
+        func(item)
+    return len(items) / (clock.perf_counter() - start)
+
+
+def main(count):
+    """builds and serializes count objects of every class both ways"""
+    print("{:10s}{:>13s}{:>13s}{:>13s}{:>13s}".format(
+        "objects/s", "init before", "init now", "dict before",
+        "dict now"))
+    for name, cls in sorted(classes.items()):
+        dicts = [cls(**samples[name]).to_dict() for _ in range(count)]
+        objs = []
+        before = rate(lambda d: legacy_init(cls.__new__(cls), d), dicts)
+        now = rate(lambda d: objs.append(cls(**d)), dicts)
+        dict_before = rate(legacy_to_dict, objs)
+        dict_now = rate(cls.to_dict, objs)
+        print("{:10s}{:13,.0f}{:13,.0f}{:13,.0f}{:13,.0f}".format(
+            name, before, now, dict_before, dict_now))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
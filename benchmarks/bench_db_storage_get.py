@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Times DBStorage.get() as the states table grows, to check that a lookup
+costs the same with 1k or 100k rows
+
+Runs against the database configured by the HBNB_MYSQL_* variables, with
+HBNB_TYPE_STORAGE=db; the rows it inserts are deleted at the end.
+
+usage: ./benchmarks/bench_db_storage_get.py [largest table size]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import models  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def time_get(ids, lookups=1000):
+    """returns the mean time of a get() on a random-ish id, with a fresh
+    session so the identity map does not answer for the database"""
+    models.storage.close()
+    step = max(len(ids) // lookups, 1)
+    sample = ids[::step][:lookups]
+    start = time.perf_counter()
+    for state_id in sample:
+        models.storage.get(State, state_id)
+    return (time.perf_counter() - start) / len(sample)
+
+
+def main(largest):
+    """grows the states table by steps of 10x and times get() at each"""
+    if models.storage_t != "db":
+        sys.exit("set HBNB_TYPE_STORAGE=db and the HBNB_MYSQL_* variables")
+    ids = []
+    size = 1000
+    try:
+        while size <= largest:
+            while len(ids) < size:
+                state = State(name="Bench {:d}".format(len(ids)))
+                models.storage.new(state)
+                ids.append(state.id)
+            models.storage.save()
+            print("{:8d} rows  {:8.1f} us per get".format(
+                size, time_get(ids) * 1e6))
+            size *= 10
+    finally:
+        for state_id in ids:
+            state = models.storage.get(State, state_id)
+            if state is not None:
+                models.storage.delete(state)
+        models.storage.save()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
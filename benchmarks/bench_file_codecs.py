@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Compares the FileStorage codecs on a generated dataset: time to save,
+time to load (decode and build the instances) and file size
+
+usage: ./benchmarks/bench_file_codecs.py [number of objects]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.engine import file_codecs  # noqa: E402
+from models.engine.file_storage import classes  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.user import User  # noqa: E402
+
+
+def dataset(count):
+    """returns {<key>: obj} with count users, places and reviews"""
+    objects = {}
+    while len(objects) < count:
+        user = User(email="user@hbnb.io", password="pwd", first_name="Bob")
+        place = Place(user_id=user.id, name="Loft", number_rooms=2,
+                      price_by_night=120, latitude=37.77, longitude=-122.4)
+        review = Review(user_id=user.id, place_id=place.id, text="Nice")
+        for obj in (user, place, review):
+            objects[obj.__class__.__name__ + "." + obj.id] = obj
+    return objects
+
+
+def main(count):
+    """times every codec on count objects"""
+    objects = dataset(count)
+    print("{:d} objects".format(len(objects)))
+    print("{:8} {:>10} {:>10} {:>10}".format("codec", "save (s)",
+                                             "load (s)", "size (MB)"))
+    for codec in file_codecs.codecs.values():
+        path = "file" + codec.extension
+        start = time.perf_counter()
+        with open(path, "wb") as f:
+            f.write(codec.encode(objects))
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            data = f.read()
+        loaded = {}
+        for key, attrs in codec.decode(data).items():
+            loaded[key] = classes[attrs["__class__"]](**attrs)
+        load = time.perf_counter() - start
+        print("{:8} {:10.2f} {:10.2f} {:10.1f}".format(
+            codec.name, saved, load, os.path.getsize(path) / 1e6))
+        del data, loaded
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Measures the memory FileStorage holds per object after reload(), by class,
+by default and with HBNB_FILE_COMPACT=1 (slotted models), on a dataset
+shaped like a real one: many reviews per place, several places per city
+and user. Given another checkout, e.g. of the code before a change
+(git worktree add /tmp/before <commit>), it measures that one too
+
+usage: ./benchmarks/bench_file_storage_memory.py [number of reviews]
+       [checkout]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+TREE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TREE)
+os.chdir(tempfile.mkdtemp())
+
+from models.city import City  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.user import User  # noqa: E402
+
+FIRST_NAMES = ["Bob", "Alice", "Carol", "Dave", "Eve", "Frank"]
+
+# run in a process of its own per checkout and mode, as the models read
+# the mode when imported: prints the bytes per object the storage of the
+# checkout argv[1] holds after reloading the JSON file argv[2]
+HELD = """
+import gc, os, shutil, sys, tempfile, tracemalloc
+sys.path.insert(0, sys.argv[1])
+os.chdir(tempfile.mkdtemp())
+import models
+shutil.copy(sys.argv[2], "file.json")
+gc.collect()
+tracemalloc.start()
+models.storage.reload()
+gc.collect()
+print(tracemalloc.get_traced_memory()[0] / models.storage.count())
+"""
+
+
+def dataset(reviews):
+    """returns {<class name>: [objects]} with reviews reviews, a place per
+    10 of them, a user per 5 and a city per 50"""
+    random.seed(0)
+    cities = [City(name="City {:d}".format(i), state_id="state")
+              for i in range(max(1, reviews // 50))]
+    users = [User(email="user{:d}@hbnb.io".format(i), password="pwd",
+                  first_name=random.choice(FIRST_NAMES), last_name="Doe")
+             for i in range(max(1, reviews // 5))]
+    places = [Place(name="Place {:d}".format(i), number_rooms=2,
+                    city_id=random.choice(cities).id,
+                    user_id=random.choice(users).id,
+                    price_by_night=random.randrange(50, 500),
+                    latitude=random.uniform(-90, 90),
+                    longitude=random.uniform(-180, 180))
+              for i in range(max(1, reviews // 10))]
+    return {"City": cities, "User": users, "Place": places,
+            "Review": [Review(text="Review {:d}".format(i),
+                              place_id=random.choice(places).id,
+                              user_id=random.choice(users).id)
+                       for i in range(reviews)]}
+
+
+def write(objs, path):
+    """saves objs alone to path"""
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    storage.new_all(objs)
+    storage.save()
+    os.replace("file.json", path)
+
+
+def held(tree, path, compact):
+    """returns the bytes per object the storage of tree holds after
+    reloading path, with HBNB_FILE_COMPACT=1 if compact"""
+    env = dict(os.environ)
+    env.pop("HBNB_TYPE_STORAGE", None)
+    env.pop("HBNB_FILE_COMPACT", None)
+    if compact:
+        env["HBNB_FILE_COMPACT"] = "1"
+    output = subprocess.run([sys.executable, "-c", HELD, tree, path],
+                            env=env, stdout=subprocess.PIPE, check=True,
+                            universal_newlines=True).stdout
+    return float(output)
+
+
+def main(reviews, before=None):
+    """reports the bytes per object of every class, each way"""
+    counts = {}
+    objs_by_class = dataset(reviews)
+    for name, objs in objs_by_class.items():
+        write(objs, os.path.abspath(name + ".json"))
+        counts[name] = len(objs)
+    # stored together, children share the ids of their parents
+    write([obj for objs in objs_by_class.values() for obj in objs],
+          os.path.abspath("all.json"))
+    counts["all"] = sum(counts.values())
+    del objs_by_class
+    runs = [("default", TREE, False), ("compact", TREE, True)]
+    if before is not None:
+        runs.insert(0, ("before", os.path.abspath(before), False))
+    print("{:8s}{:>10s}".format("class", "objects") +
+          "".join("{:>15s}".format(label + " B/obj")
+                  for label, tree, compact in runs))
+    for name, count in counts.items():
+        path = os.path.abspath(name + ".json")
+        print("{:8s}{:10d}".format(name, count) +
+              "".join("{:15.0f}".format(held(tree, path, compact))
+                      for label, tree, compact in runs))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Compares FileStorage.reload() with and without lazy mode: time to
+reload and memory held afterwards
+
+usage: ./benchmarks/bench_file_storage_reload.py [number of objects]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.user import User  # noqa: E402
+
+
+def fill(count):
+    """saves count users, places and reviews to file.json"""
+    storage = FileStorage()
+    while storage.count() < count:
+        user = User(email="user@hbnb.io", password="pwd", first_name="Bob")
+        place = Place(user_id=user.id, name="Loft", number_rooms=2,
+                      price_by_night=120, latitude=37.77, longitude=-122.4)
+        review = Review(user_id=user.id, place_id=place.id, text="Nice")
+        for obj in (user, place, review):
+            storage.new(obj)
+    storage.save()
+    return storage.count()
+
+
+def reload(lazy, trace=False):
+    """reloads file.json into an empty storage, returns the time it took,
+    or the memory the storage holds afterwards if trace is set (tracing
+    slows the reload down too much to time it)"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__raw = {}
+    gc.collect()
+    storage = FileStorage()
+    storage._FileStorage__lazy = lazy
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    storage.reload()
+    elapsed = time.perf_counter() - start
+    if not trace:
+        return elapsed
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held
+
+
+def main(count):
+    """times an eager and a lazy reload of count objects"""
+    print("{:d} objects, file.json is {:.1f} MB".format(
+        fill(count), os.path.getsize("file.json") / 1e6))
+    for lazy in (False, True):
+        elapsed = reload(lazy)
+        held = reload(lazy, trace=True)
+        print("{:6} reload {:7.2f} s, {:7.1f} MB held".format(
+            "lazy" if lazy else "eager", elapsed, held / 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Measures the cost of FileStorage's atomic save (temp file, fsync, rename,
+optional backup) against a plain in-place json.dump of the same objects
+
+usage: ./benchmarks/bench_file_storage_save.py [number of objects]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.user import User  # noqa: E402
+
+
+def best_of(func, repeat=5):
+    """returns the fastest of repeat runs of func, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def plain_save(storage):
+    """the pre-atomic save: dumps straight into file.json"""
+    json_objects = {}
+    objects = storage.all()
+    for key in objects:
+        json_objects[key] = objects[key].to_dict()
+    with open("file.json", 'w') as f:
+        json.dump(json_objects, f)
+
+
+def main(count):
+    """fills a FileStorage with count objects and times its save()"""
+    storage = FileStorage()
+    for i in range(count):
+        user = User(email="user{:d}@hbnb.io".format(i), password="pwd")
+        place = Place(user_id=user.id, name="Place {:d}".format(i))
+        review = Review(user_id=user.id, place_id=place.id, text="Nice")
+        for obj in (user, place, review):
+            storage.new(obj)
+        if storage.count() >= count:
+            break
+    storage.save()
+    print("{:d} objects, file.json is {:.1f} MB".format(
+        storage.count(), os.path.getsize("file.json") / 1e6))
+    plain = best_of(lambda: plain_save(storage))
+    atomic = best_of(storage.save)
+    storage._FileStorage__backups = 3
+    backup = best_of(storage.save)
+    print("plain json.dump       {:8.3f} s".format(plain))
+    print("atomic save           {:8.3f} s  ({:+.1%})".format(
+        atomic, atomic / plain - 1))
+    print("atomic save + backups {:8.3f} s  ({:+.1%})".format(
+        backup, backup / plain - 1))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
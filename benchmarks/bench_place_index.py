@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Times a range query over the places (price, guests and a bounding box)
+answered by the columnar PlaceIndex, with NumPy if installed and with its
+stdlib fallback, against a loop over every place, and again right after a
+place changed
+
+usage: ./benchmarks/bench_place_index.py [number of places]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+from api.v1 import place_index  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+RANGES = {"price_by_night": (100, 200), "max_guest": (4, None),
+          "latitude": (30, 45), "longitude": (-125, -100)}
+
+
+def best_of(func, repeat=5):
+    """returns the fastest of repeat runs of func, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def loop(storage):
+    """the loop over every place"""
+    found = set()
+    for place in storage.all(Place).values():
+        if (100 <= place.price_by_night <= 200 and place.max_guest >= 4 and
+                30 <= place.latitude <= 45 and
+                place.longitude >= -125 and place.longitude <= -100):
+            found.add(place.id)
+    return found
+
+
+def timed(storage, label):
+    """times building then searching a PlaceIndex of storage, and
+    searching after each change to a place"""
+    index = place_index.PlaceIndex(storage)
+    start = time.perf_counter()
+    found = index.search(RANGES)
+    build = time.perf_counter() - start
+    assert found == loop(storage)
+    print("{:8s} {:9.1f} ms, first search (building) {:9.1f} ms".format(
+        label, best_of(lambda: index.search(RANGES)) * 1e3, build * 1e3))
+    places = list(storage.all(Place).values())
+
+    def change():
+        """moves the price of a place, then searches"""
+        place = random.choice(places)
+        place.price_by_night = random.randrange(20, 1000)
+        storage.new(place)
+        index.search(RANGES)
+    print("{:8s} {:9.1f} ms after a change".format(
+        "", best_of(change) * 1e3))
+    assert index.search(RANGES) == loop(storage)
+    return found
+
+
+def main(size):
+    """stores size places and times each way"""
+    random.seed(0)
+    storage = FileStorage()
+    storage.new_all(Place(price_by_night=random.randrange(20, 1000),
+                          max_guest=random.randrange(1, 16),
+                          latitude=random.uniform(-90, 90),
+                          longitude=random.uniform(-180, 180))
+                    for _ in range(size))
+    found = loop(storage)
+    print("{:d} places, {:d} found".format(size, len(found)))
+    print("loop     {:9.1f} ms".format(best_of(lambda: loop(storage)) * 1e3))
+    if place_index.numpy is not None:
+        timed(storage, "numpy")
+    numpy = place_index.numpy
+    place_index.numpy = None
+    timed(storage, "array")
+    place_index.numpy = numpy
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Times a places_search body (cities of a few states, with two amenities)
+answered with FileStorage's index intersection against the nested loops
+over every city and place it replaces
+
+usage: ./benchmarks/bench_places_search.py [number of places]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.city import City  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+STATES = 50
+CITIES = 1000
+AMENITIES = 50
+
+
+def best_of(func, repeat=5):
+    """returns the fastest of repeat runs of func, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def loops(storage, state_ids, amenity_ids):
+    """the nested loops: every city of the states, then every place of
+    those cities, then every amenity of those places"""
+    city_ids = [city.id for city in storage.all(City).values()
+                if city.state_id in state_ids]
+    places = []
+    for city_id in city_ids:
+        for place in storage.all(Place).values():
+            if place.city_id == city_id and all(
+                    amenity_id in place.amenity_ids
+                    for amenity_id in amenity_ids):
+                places.append(place)
+    return places
+
+
+def search(storage, state_ids, amenity_ids):
+    """what the places_search view does"""
+    city_ids = [city.id for city in
+                storage.filter(City, state_id=state_ids).values()]
+    return storage.linked(Place, "amenities", amenity_ids, city_id=city_ids)
+
+
+def main(size):
+    """stores size places over CITIES cities with some of AMENITIES
+    amenities each, and times both ways"""
+    random.seed(0)
+    storage = FileStorage()
+    for number in range(CITIES):
+        storage.new(City(id=str(number), state_id=str(number % STATES)))
+    for number in range(size):
+        amenity_ids = random.sample(range(AMENITIES), 5)
+        storage.new(Place(city_id=str(number % CITIES),
+                          amenity_ids=[str(item) for item in amenity_ids]))
+    state_ids = ["1", "2", "3"]
+    amenity_ids = ["4", "5"]
+    found = search(storage, state_ids, amenity_ids)
+    assert sorted(found.values(), key=id) == sorted(
+        loops(storage, state_ids, amenity_ids), key=id)
+    print("{:d} places, {:d} found".format(size, len(found)))
+    print("loops  {:9.1f} ms".format(
+        best_of(lambda: loops(storage, state_ids, amenity_ids), 1) * 1e3))
+    print("index  {:9.1f} ms".format(
+        best_of(lambda: search(storage, state_ids, amenity_ids)) * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -3,42 +3,299 @@
 Contains class BaseModel
 """
 
+from collections.abc import MutableMapping
 from datetime import datetime
 import models
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+# the column type of the timestamps: a MySQL DATETIME keeps whole seconds
+# unless given a precision, so two changes within a second would leave the
+# same updated_at, and the same ETag and storage.version(), behind them
+Timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+
+def parse_time(string):
+    """returns the datetime of string, a timestamp in the time format;
+    fromisoformat() reads it about 30 times faster than strptime()"""
+    return datetime.fromisoformat(string)
+
+
+def format_time(value):
+    """returns the datetime value in the time format; isoformat() writes
+    it about twice as fast as strftime()"""
+    return value.isoformat(timespec="microseconds")
+
+
+# HBNB_FILE_COMPACT=1 in file mode: the models hold their attributes in
+# __slots__ instead of a dict per instance (see Compact)
+compact = (models.storage_t not in ("db", "mmap") and
+           getenv("HBNB_FILE_COMPACT") == "1")
+
+# per class, the names of the attributes whose assignment runs code
+# (properties, SQLAlchemy columns), which __init__ sets with setattr; the
+# others, Indexed ones and slots included as a new object is not stored
+# yet, go straight into the instance dict
+setters = {}
+# in compact mode, per class, the slot of each attribute it declares or
+# inherits, and the class-level default of each
+members = {}
+defaults = {}
+
+
+def setters_of(cls):
+    """returns the names of the attributes of cls set with setattr"""
+    names = setters.get(cls)
+    if names is None:
+        names = frozenset(name for klass in cls.__mro__
+                          for name, value in vars(klass).items()
+                          if hasattr(value, "__set__") and
+                          not isinstance(value, Indexed) and
+                          name not in members.get(cls, ()))
+        setters[cls] = names
+    return names
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
     Base = object
 
 
-class BaseModel:
+class Indexed:
+    """class attribute whose changes on an instance are reported to the
+    storage, so it can keep an index of the instances by value"""
+
+    # in compact mode, the slot holding the value of an instance
+    slot = None
+
+    def __init__(self, default=""):
+        """Instantiate the attribute with its class-level default"""
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        """remembers the name the attribute is set under"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """returns the value of obj, the default if it has none"""
+        if obj is None:
+            return self.default
+        if self.slot is not None:
+            try:
+                return self.slot.__get__(obj)
+            except AttributeError:
+                if type(self.default) is not list:
+                    return self.default
+                self.slot.__set__(obj, list(self.default))
+                return self.slot.__get__(obj)
+        if type(self.default) is list and self.name not in obj.__dict__:
+            # a list of its own, or appending to it would change the
+            # default of every instance
+            obj.__dict__[self.name] = list(self.default)
+        return obj.__dict__.get(self.name, self.default)
+
+    def __set__(self, obj, value):
+        """sets the value of obj, telling the storage if it changed"""
+        if self.slot is not None:
+            old = self.__get__(obj)
+            self.slot.__set__(obj, value)
+        else:
+            old = obj.__dict__.get(self.name, self.default)
+            obj.__dict__[self.name] = value
+        storage = getattr(models, "storage", None)
+        if old != value and hasattr(storage, "reindex"):
+            storage.reindex(obj, self.name, old)
+
+
+class Compact(type):
+    """metaclass of the models in compact mode: the attributes a class
+    declares with a class-level default, Indexed ones included, become
+    __slots__, so an instance is a fixed row of pointers instead of an
+    object and a dict. Unset, a slot reads as the default"""
+
+    def __new__(mcs, name, bases, namespace):
+        """returns the class, its attributes moved to __slots__"""
+        fields = {attr: value for attr, value in namespace.items()
+                  if not attr.startswith("__") and
+                  (isinstance(value, Indexed) or
+                   not hasattr(value, "__get__"))}
+        namespace = {attr: value for attr, value in namespace.items()
+                     if attr not in fields}
+        slots = tuple(namespace.get("__slots__", ())) + tuple(fields)
+        namespace["__slots__"] = slots
+        cls = super().__new__(mcs, name, bases, namespace)
+        members[cls] = {}
+        defaults[cls] = {}
+        for base in reversed(cls.__mro__[1:]):
+            members[cls].update(members.get(base, {}))
+            defaults[cls].update(defaults.get(base, {}))
+        for attr in slots:
+            if attr == "__weakref__":
+                continue
+            if attr.startswith("__"):
+                # a private slot reads as None while unset
+                defaults[cls]["_" + name.lstrip("_") + attr] = None
+            else:
+                members[cls][attr] = vars(cls)[attr]
+        for attr, value in fields.items():
+            if isinstance(value, Indexed):
+                # reads and writes go through the Indexed attribute, which
+                # keeps the value in the slot
+                value.slot = members[cls][attr]
+                value.__set_name__(cls, attr)
+                setattr(cls, attr, value)
+            else:
+                defaults[cls][attr] = value
+        return cls
+
+
+class Attributes(MutableMapping):
+    """the attributes of an instance of a compact model, standing in for
+    its __dict__: the slots set, then the attributes the model does not
+    declare"""
+
+    def __init__(self, obj):
+        """Instantiate the attributes of obj"""
+        self.__obj = obj
+        self.__members = members[obj.__class__]
+
+    def __extras(self, create=False):
+        """returns the dict of the attributes of obj the model does not
+        declare, None if it has none and not create"""
+        extras = self.__obj._BaseModel__extras
+        if extras is None and create:
+            extras = {}
+            object.__setattr__(self.__obj, "_BaseModel__extras", extras)
+        return extras
+
+    def __getitem__(self, name):
+        """returns the value of the attribute name of obj"""
+        member = self.__members.get(name)
+        if member is not None:
+            try:
+                return member.__get__(self.__obj)
+            except AttributeError:
+                raise KeyError(name)
+        return (self.__extras() or {})[name]
+
+    def __setitem__(self, name, value):
+        """sets the attribute name of obj, as the instance dict would,
+        without going through the attribute"""
+        member = self.__members.get(name)
+        if member is not None:
+            member.__set__(self.__obj, value)
+        else:
+            self.__extras(True)[name] = value
+
+    def __delitem__(self, name):
+        """unsets the attribute name of obj"""
+        if name not in self:
+            raise KeyError(name)
+        member = self.__members.get(name)
+        if member is not None:
+            member.__delete__(self.__obj)
+        else:
+            del self.__extras()[name]
+
+    def __iter__(self):
+        """returns an iterator over the names of the attributes set"""
+        return iter(self.copy())
+
+    def __len__(self):
+        """returns the number of attributes set"""
+        return len(self.copy())
+
+    def copy(self):
+        """returns the attributes of obj as a dict"""
+        attrs = {}
+        obj = self.__obj
+        for name, member in self.__members.items():
+            try:
+                attrs[name] = member.__get__(obj)
+            except AttributeError:
+                pass
+        attrs.update(self.__extras() or {})
+        return attrs
+
+    def __repr__(self):
+        """returns the representation of the dict of the attributes"""
+        return repr(self.copy())
+
+
+class BaseModel(metaclass=Compact if compact else type):
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow)
+        created_at = Column(Timestamp, default=datetime.utcnow)
+        updated_at = Column(Timestamp, default=datetime.utcnow)
+    elif compact:
+        # the attributes the model does not declare, in a dict of their
+        # own, None until one is set; MmapStorage holds weak references
+        __slots__ = ("id", "created_at", "updated_at", "__extras",
+                     "__weakref__")
+
+        def __getattr__(self, name):
+            """returns the default of the attribute name, or its value if
+            the model does not declare it; called once name is neither a
+            slot set nor a class attribute"""
+            default = defaults[self.__class__]
+            if name in default:
+                return default[name]
+            extras = self.__extras
+            if extras is None or name not in extras:
+                raise AttributeError("{!r} object has no attribute {!r}".
+                                     format(self.__class__.__name__, name))
+            return extras[name]
+
+        def __setattr__(self, name, value):
+            """sets the attribute name, in the dict of the attributes the
+            model does not declare if it has neither a slot nor a
+            setter"""
+            if (name in members[self.__class__] or
+                    hasattr(getattr(self.__class__, name, None),
+                            "__set__")):
+                object.__setattr__(self, name, value)
+            else:
+                Attributes(self)[name] = value
+
+        @property
+        def __dict__(self):
+            """the attributes of the instance, as a dict would give them"""
+            return Attributes(self)
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
         if kwargs:
+            names = setters_of(self.__class__)
+            attrs = self.__dict__
             for key, value in kwargs.items():
-                if key != "__class__":
+                if key == "__class__":
+                    continue
+                if key in names:
                     setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+                else:
+                    attrs[key] = value
+            # timestamps come as strings from JSON, as datetime objects
+            # from the binary codec
+            created_at = kwargs.get("created_at", None)
+            if type(created_at) is str:
+                self.created_at = parse_time(created_at)
+            elif type(created_at) is not datetime:
                 self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
+            updated_at = kwargs.get("updated_at", None)
+            if updated_at == created_at:
+                # never changed since created: one datetime for both
+                self.updated_at = self.created_at
+            elif type(updated_at) is str:
+                self.updated_at = parse_time(updated_at)
+            elif type(updated_at) is not datetime:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
                 self.id = str(uuid.uuid4())
@@ -61,13 +318,17 @@ class BaseModel:
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+        created_at = new_dict.get("created_at")
+        if created_at is not None:
+            new_dict["created_at"] = format_time(created_at)
+        updated_at = new_dict.get("updated_at")
+        if updated_at is created_at and created_at is not None:
+            # never changed since created: formatted once for both
+            new_dict["updated_at"] = new_dict["created_at"]
+        elif updated_at is not None:
+            new_dict["updated_at"] = format_time(updated_at)
         new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
+        new_dict.pop("_sa_instance_state", None)
         return new_dict
 
     def delete(self):
@@ -1,7 +1,7 @@
 #!/usr/bin/python
 """ holds class City"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, Indexed
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, ForeignKey
@@ -16,7 +16,7 @@ class City(BaseModel, Base):
         name = Column(String(128), nullable=False)
         places = relationship("Place", backref="cities")
     else:
-        state_id = ""
+        state_id = Indexed()
         name = ""
 
     def __init__(self, *args, **kwargs):
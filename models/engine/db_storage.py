@@ -3,27 +3,45 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.file_storage import link_attributes
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, func, insert, literal, or_
+from sqlalchemy.orm import load_only, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# rows fetched at a time by iterate()
+CHUNK = 1000
+
+
+class Between:
+    """criteria value matching the values from low to high, both
+    included, in a WHERE clause; a None bound leaves that side open"""
+
+    def __init__(self, low=None, high=None):
+        """Instantiate the range from low to high"""
+        self.low = low
+        self.high = high
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # functions called with the <class name> and None of every committed
+    # change
+    __listeners = []
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -39,39 +57,224 @@ class DBStorage:
                                              HBNB_MYSQL_DB))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        # <class name> of the rows inserted by new_all() since the last
+        # commit
+        self.__inserted = set()
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, preload=()):
+        """query on the current database session; preload names the
+        relationships to load along, in one extra query each"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                for name in preload:
+                    query = query.options(
+                        selectinload(getattr(classes[clss], name)))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
     def get(self, cls, id):
-        """retrieve one object"""
+        """retrieve one object by primary key, from the session identity
+        map if it is already loaded"""
         if cls and id:
-            obj_key = cls.__name__ + '.' + id
-            class_dict = self.all(cls)
-            if obj_key in class_dict:
-                return class_dict[obj_key]
+            cls = classes.get(cls, cls) if type(cls) is str else cls
+            if cls in classes.values():
+                return self.__session.get(cls, id)
         return None
 
     def count(self, cls=None):
-        """counts the number of objects in storage"""
-        count_dict = self.all(cls)
-        return len(count_dict)
+        """counts the number of objects in storage with SELECT COUNT(*)"""
+        if cls is None:
+            return sum(self.counts(*classes.values()).values())
+        cls = classes.get(cls, cls) if type(cls) is str else cls
+        if cls not in classes.values():
+            return 0
+        return self.__session.query(func.count()).select_from(cls).scalar()
+
+    def counts(self, *clss):
+        """returns {<class name>: number of objects} for every class in
+        clss, in a single UNION ALL query"""
+        queries = []
+        for cls in clss:
+            cls = classes.get(cls, cls) if type(cls) is str else cls
+            queries.append(self.__session.query(literal(cls.__name__),
+                                                func.count())
+                           .select_from(cls))
+        if not queries:
+            return {}
+        return dict(queries[0].union_all(*queries[1:]).all())
+
+    def filter(self, cls, **criteria):
+        """returns {<key>: obj} for the objects of class cls whose
+        attributes equal criteria, in a WHERE clause; a list, tuple or set
+        value matches any of its items, a Between value its range"""
+        cls = classes.get(cls, cls) if type(cls) is str else cls
+        query = self.__where(self.__session.query(cls), cls, criteria)
+        return {obj.__class__.__name__ + '.' + obj.id: obj for obj in query}
+
+    def linked(self, cls, name, ids, **criteria):
+        """returns {<key>: obj} for the objects of class cls linked to
+        every id in ids through their many-to-many relationship name, and
+        matching criteria (see filter()), in one query"""
+        cls = classes.get(cls, cls) if type(cls) is str else cls
+        relationship = getattr(cls, name)
+        target = relationship.property.mapper.class_
+        query = self.__where(self.__session.query(cls), cls, criteria)
+        for link_id in set(ids):
+            query = query.filter(relationship.any(target.id == link_id))
+        return {obj.__class__.__name__ + '.' + obj.id: obj for obj in query}
+
+    def link(self, obj, name, other):
+        """links obj to other through the many-to-many relationship name
+        of its class; returns False if they were already linked"""
+        links = getattr(obj, name)
+        if other in links:
+            return False
+        links.append(other)
+        # the ETag of obj comes from its updated_at
+        obj.updated_at = datetime.utcnow()
+        return True
+
+    def unlink(self, obj, name, other):
+        """unlinks obj from other through the many-to-many relationship
+        name of its class; returns False if they were not linked"""
+        links = getattr(obj, name)
+        if other not in links:
+            return False
+        links.remove(other)
+        # the ETag of obj comes from its updated_at
+        obj.updated_at = datetime.utcnow()
+        return True
+
+    def page(self, cls, limit=None, after=None, fields=None, preload=(),
+             **criteria):
+        """returns a list of at most limit objects of class cls matching
+        criteria (see filter()), ordered by (created_at, id) and starting
+        after the (created_at, id) pair after, in one keyset query; only
+        the columns in fields (plus created_at and id) are loaded, and the
+        relationships in preload along, in one extra query each"""
+        cls = classes.get(cls, cls) if type(cls) is str else cls
+        query = self.__where(self.__session.query(cls), cls, criteria)
+        for name in preload:
+            query = query.options(selectinload(getattr(cls, name)))
+        if after is not None:
+            query = query.filter(or_(cls.created_at > after[0],
+                                     and_(cls.created_at == after[0],
+                                          cls.id > after[1])))
+        if fields:
+            names = set(fields) | {"created_at", "id"}
+            columns = [getattr(cls, name) for name in names
+                       if name in cls.__table__.columns]
+            query = query.options(load_only(*columns))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def iterate(self, cls, after=None, fields=None, **criteria):
+        """yields the objects of class cls matching criteria (see
+        filter()) in (created_at, id) order from after on, one keyset page
+        of CHUNK rows at a time (see page()), so the session never holds
+        more than a page"""
+        while True:
+            objs = self.page(cls, limit=CHUNK, after=after, fields=fields,
+                             **criteria)
+            yield from objs
+            if len(objs) < CHUNK:
+                return
+            after = (objs[-1].created_at, objs[-1].id)
+
+    def version(self, cls, **criteria):
+        """returns (token, None): token is the number of rows of class cls
+        matching criteria and their latest updated_at, to the microsecond,
+        which a change through any process alters; the time of the last
+        change is not known, a deletion leaves the latest updated_at as it
+        is"""
+        cls = classes.get(cls, cls) if type(cls) is str else cls
+        query = self.__session.query(func.count(), func.max(cls.updated_at))
+        return tuple(self.__where(query, cls, criteria).one()), None
+
+    @staticmethod
+    def __where(query, cls, criteria):
+        """returns query restricted to the rows of cls matching criteria"""
+        for attr, value in criteria.items():
+            column = getattr(cls, attr)
+            if isinstance(value, Between):
+                if value.low is not None and value.high is not None:
+                    query = query.filter(column.between(value.low,
+                                                        value.high))
+                elif value.low is not None:
+                    query = query.filter(column >= value.low)
+                elif value.high is not None:
+                    query = query.filter(column <= value.high)
+            elif isinstance(value, (list, tuple, set)):
+                query = query.filter(column.in_(value))
+            else:
+                query = query.filter(column == value)
+        return query
 
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def new_all(self, objs):
+        """inserts the rows of objs, one executemany per class, in the
+        current transaction; the ids of a list attribute standing for a
+        many-to-many relationship (Place.amenity_ids) become rows of its
+        link table. The objects are not added to the session"""
+        rows = {}
+        for obj in objs:
+            rows.setdefault(obj.__class__, []).append(obj)
+        for cls, cls_objs in rows.items():
+            columns = {column.name: column.default.arg
+                       if column.default is not None and
+                       column.default.is_scalar else None
+                       for column in cls.__table__.columns}
+            self.__session.execute(
+                insert(cls.__table__),
+                [{name: obj.__dict__.get(name, default)
+                  for name, default in columns.items()}
+                 for obj in cls_objs])
+            for name, (attr, target) in link_attributes.get(
+                    cls.__name__, {}).items():
+                relationship = getattr(cls, name).property
+                local = relationship.synchronize_pairs[0][1].name
+                remote = relationship.secondary_synchronize_pairs[0][1].name
+                links = [{local: obj.id, remote: link_id}
+                         for obj in cls_objs
+                         for link_id in obj.__dict__.get(attr) or ()]
+                if links:
+                    self.__session.execute(
+                        insert(relationship.secondary), links)
+            self.__inserted.add(cls.__name__)
+
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        session = self.__session()
+        names = {obj.__class__.__name__ for obj in
+                 list(session.new) + list(session.dirty) +
+                 list(session.deleted)}
+        names |= self.__inserted
+        self.__inserted = set()
+        session.commit()
+        for name in names:
+            for listener in self.__listeners:
+                listener(name, None)
+
+    def sync(self):
+        """commit all changes of the current database session; save() is
+        already synchronous, this mirrors FileStorage.sync()"""
+        self.save()
+
+    def subscribe(self, listener):
+        """calls listener(<class name>, None) after every commit changing
+        the objects of a class through this process; unlike FileStorage,
+        it does not name the objects changed"""
+        self.__listeners.append(listener)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
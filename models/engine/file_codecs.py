@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage can serialize its file with
+
+usage: python3 -m models.engine.file_codecs <source file> <destination file>
+converts a storage file between codecs, picked from the file extensions
+"""
+
+from datetime import datetime, timedelta
+import json
+import marshal
+from models.base_model import format_time, parse_time
+import os
+import sys
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+TIMESTAMPS = ("created_at", "updated_at")
+
+
+def pack(attrs):
+    """returns the attributes dictionary attrs as compact bytes, its
+    timestamps as integers; the dictionary is changed in place"""
+    for name in TIMESTAMPS:
+        if type(attrs.get(name)) is datetime:
+            attrs[name] = (attrs[name] - EPOCH) // MICROSECOND
+    return marshal.dumps(attrs)
+
+
+def unpack(blob):
+    """returns the attributes dictionary packed in blob by pack()"""
+    attrs = marshal.loads(blob)
+    for name in TIMESTAMPS:
+        if type(attrs.get(name)) is int:
+            attrs[name] = EPOCH + attrs[name] * MICROSECOND
+    return attrs
+
+
+class JSONCodec:
+    """the original format: a JSON object of <key>: <obj>.to_dict()"""
+    name = "json"
+    extension = ".json"
+
+    @staticmethod
+    def encode(objects, records=None):
+        """returns the bytes of the {<key>: obj} dictionary objects, and of
+        the {<key>: attributes} dictionary records of unbuilt objects"""
+        json_objects = {}
+        for key, attrs in (records or {}).items():
+            for name in TIMESTAMPS:
+                if type(attrs.get(name)) is datetime:
+                    attrs[name] = format_time(attrs[name])
+            json_objects[key] = attrs
+        for key in objects:
+            json_objects[key] = objects[key].to_dict()
+        return json.dumps(json_objects).encode("utf-8")
+
+    @staticmethod
+    def decode(data):
+        """returns the {<key>: attributes} dictionary stored in data"""
+        return json.loads(data)
+
+
+class BinaryCodec:
+    """compact format: a marshal-ed list of (<class name>, attributes)
+    tuples, timestamps stored as integer microseconds since the epoch
+
+    marshal may change between Python releases, so the header records its
+    version; a file written by another release has to be converted through
+    JSON."""
+    name = "binary"
+    extension = ".hbnb"
+    magic = b"HBNB"
+
+    @classmethod
+    def encode(cls, objects, records=None):
+        """returns the bytes of the {<key>: obj} dictionary objects, and of
+        the {<key>: attributes} dictionary records of unbuilt objects"""
+        rows = []
+        for attrs in (records or {}).values():
+            name = attrs.pop("__class__")
+            for stamp in TIMESTAMPS:
+                if type(attrs.get(stamp)) is str:
+                    attrs[stamp] = parse_time(attrs[stamp])
+            rows.append((name, attrs))
+        for obj in objects.values():
+            attrs = obj.__dict__.copy()
+            attrs.pop("_sa_instance_state", None)
+            rows.append((obj.__class__.__name__, attrs))
+        for name, attrs in rows:
+            for stamp in TIMESTAMPS:
+                if stamp in attrs:
+                    attrs[stamp] = (attrs[stamp] - EPOCH) // MICROSECOND
+        return cls.magic + bytes([marshal.version]) + marshal.dumps(rows)
+
+    @classmethod
+    def decode(cls, data):
+        """returns the {<key>: attributes} dictionary stored in data, the
+        timestamps as datetime objects"""
+        if data[:len(cls.magic)] != cls.magic:
+            raise ValueError("not a binary storage file")
+        version = data[len(cls.magic)]
+        if version != marshal.version:
+            raise ValueError("binary storage file written with marshal "
+                             "version {:d}, convert it through JSON with a "
+                             "Python using that version".format(version))
+        objects = {}
+        for name, attrs in marshal.loads(data[len(cls.magic) + 1:]):
+            for stamp in TIMESTAMPS:
+                if stamp in attrs:
+                    attrs[stamp] = EPOCH + attrs[stamp] * MICROSECOND
+            attrs["__class__"] = name
+            objects[name + "." + attrs["id"]] = attrs
+        return objects
+
+
+codecs = {JSONCodec.name: JSONCodec, BinaryCodec.name: BinaryCodec}
+
+
+def sniff(data):
+    """returns the codec the bytes data were written with"""
+    if data[:len(BinaryCodec.magic)] == BinaryCodec.magic:
+        return BinaryCodec
+    return JSONCodec
+
+
+def by_extension(path):
+    """returns the codec writing files named like path"""
+    extension = os.path.splitext(path)[1]
+    for codec in codecs.values():
+        if codec.extension == extension:
+            return codec
+    raise ValueError("no codec writes {} files".format(extension or path))
+
+
+def convert(source, destination):
+    """rewrites the storage file source as destination, with the codec
+    matching the extension of destination; returns the number of objects"""
+    from models.engine.file_storage import classes
+
+    with open(source, "rb") as f:
+        data = f.read()
+    objects = {}
+    for key, attrs in sniff(data).decode(data).items():
+        objects[key] = classes[attrs["__class__"]](**attrs)
+    with open(destination, "wb") as f:
+        f.write(by_extension(destination).encode(objects))
+    return len(objects)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python3 -m models.engine.file_codecs <source> "
+              "<destination>", file=sys.stderr)
+        sys.exit(1)
+    count = convert(sys.argv[1], sys.argv[2])
+    print("{:d} objects written to {}".format(count, sys.argv[2]))
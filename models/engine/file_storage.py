@@ -3,10 +3,26 @@
 Contains the FileStorage class
 """
 
+import atexit
+import bisect
+from collections.abc import Mapping
+from datetime import datetime
+import heapq
+from itertools import islice
 import json
+import os
+from os import getenv
+import shutil
+import sys
+import tempfile
+import threading
+import traceback
+import uuid
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Indexed, parse_time
 from models.city import City
+from models.engine import file_codecs
+from models.engine.rwlock import ReadWriteLock
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -15,70 +31,892 @@ from models.user import User
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# attributes filter() finds objects by without scanning their class: the
+# foreign keys, which report their changes through reindex(); a list value
+# (Place.amenity_ids) is indexed under each of its items
+indexed_attributes = {name: tuple(attr for attr, value in vars(cls).items()
+                                  if isinstance(value, Indexed))
+                      for name, cls in classes.items()}
+# many-to-many relationships, by class name then relationship name: the
+# attribute holding the ids of the linked objects and their class. With
+# the index of the attribute, they are the place_amenity table of
+# database mode indexed on both columns: place.amenity_ids lists the
+# amenity ids of a place, the index the place keys of an amenity id
+link_attributes = {"Place": {"amenities": ("amenity_ids", "Amenity")}}
+
+
+# objects of the class order checked at a time by a filtered page()
+WINDOW = 1024
+
+
+def values_of(value):
+    """returns the items of the list value, or value alone"""
+    return value if isinstance(value, (list, tuple)) else (value,)
+
+
+def matches(obj, terms):
+    """returns True if obj holds one of the values of every (attribute,
+    values) term"""
+    return all(any(item in values
+                   for item in values_of(getattr(obj, attr, None)))
+               for attr, values in terms)
+
+
+def keys_of(posting):
+    """returns the keys listed by an entry of the attribute index: the key
+    alone while a single object has the value, as most values belong to
+    one object, a dict of keys otherwise"""
+    if posting is None:
+        return ()
+    return (posting,) if type(posting) is str else posting
+
+
+def post(by_value, value, key):
+    """adds key to the entry of value in the attribute index by_value"""
+    posting = by_value.get(value)
+    if posting is None:
+        by_value[value] = key
+    elif type(posting) is str:
+        if posting != key:
+            # a dict rather than a set, to list objects in insertion order
+            by_value[value] = {posting: None, key: None}
+    else:
+        posting[key] = None
+
+
+def unpost(by_value, value, key):
+    """drops key from the entry of value in the attribute index by_value"""
+    posting = by_value.get(value)
+    if posting == key:
+        del by_value[value]
+    elif type(posting) is dict:
+        posting.pop(key, None)
+        if len(posting) == 1:
+            by_value[value] = next(iter(posting))
+
+
+class ClassView(Mapping):
+    """read-only, live view of the objects of one class in FileStorage
+
+    Iterating the view walks a copy of its keys, values or items taken
+    under the storage read lock, so other threads may add and delete
+    objects meanwhile."""
+
+    def __init__(self, objects, lock):
+        """Instantiate a view of the {<key>: obj} dict objects"""
+        self.__objects = objects
+        self.__lock = lock
+
+    def __getitem__(self, key):
+        """returns the object stored under key"""
+        return self.__objects[key]
+
+    def __contains__(self, key):
+        """tells whether an object is stored under key"""
+        return key in self.__objects
+
+    def __len__(self):
+        """returns the number of objects in the view"""
+        return len(self.__objects)
+
+    def __iter__(self):
+        """iterates over a copy of the keys"""
+        return iter(self.keys())
+
+    def keys(self):
+        """returns a list of the keys"""
+        with self.__lock.reading():
+            return list(self.__objects)
+
+    def values(self):
+        """returns a list of the objects"""
+        with self.__lock.reading():
+            return list(self.__objects.values())
+
+    def items(self):
+        """returns a list of the (key, object) pairs"""
+        with self.__lock.reading():
+            return list(self.__objects.items())
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # string - path to the append-only journal replayed over the JSON file
+    __log_path = __file_path + ".log"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects grouped by <class name>
+    __by_class = {}
+    # dictionary - the keys of the objects by (<class name>, <attribute>)
+    # then attribute value, for the indexed_attributes
+    __by_value = {}
+    # dictionary - the sorted (created_at, id) of the objects by <class
+    # name>, built on the first page() of the class; entries may be stale
+    # if created_at changed, page() checks the objects it finds
+    __order = {}
+    # the __objects dictionary that __by_class was built from
+    __indexed = None
+    # dictionary - in lazy mode, the objects not built yet, as packed
+    # attributes by <class name> then <class name>.id
+    __raw = {}
+    # (mtime, size, inode) of __file_path and of __log_path when they were
+    # last read or written
+    __file_stamp = (None, None)
+    # sets - keys stored or deleted since the last save
+    __dirty = set()
+    __deleted = set()
+    # dictionary - (number of changes, time of the last one) by <class
+    # name>, for version(); __boot tells this process's counts apart
+    __versions = {}
+    __boot = uuid.uuid4().hex
+    # list - functions called with the <class name> and key of every change
+    __listeners = []
+    # thread compacting the journal into the JSON file, if any
+    __compactor = None
+    # held for reading while iterating __objects, for writing while changing
+    # it; single lookups need no lock as they are atomic in CPython
+    __lock = ReadWriteLock()
+    # serializes save() so the last one to start is the last one written
+    __save_lock = threading.Lock()
+
+    def __init__(self):
+        """Instantiate a FileStorage object"""
+        # HBNB_FILE_CODEC=binary: save in the compact binary format, to
+        # file.hbnb instead of file.json; reload() reads either format
+        self.__codec = file_codecs.codecs[getenv("HBNB_FILE_CODEC") or
+                                          "json"]
+        self.__file_path = (os.path.splitext(FileStorage.__file_path)[0] +
+                            self.__codec.extension)
+        self.__log_path = self.__file_path + ".log"
+        # HBNB_FILE_JOURNAL=1: save() appends the changed objects to
+        # __log_path instead of rewriting the whole JSON file
+        self.__journal = getenv("HBNB_FILE_JOURNAL") == "1"
+        # the journal is compacted once it outgrows both this many bytes
+        # and the JSON file itself
+        self.__journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX") or 1 << 20)
+        # HBNB_FILE_BACKUPS=N: keep the N previous versions of the JSON file
+        # as <__file_path>.1 (newest) to <__file_path>.N
+        self.__backups = int(getenv("HBNB_FILE_BACKUPS") or 0)
+        # HBNB_FILE_WRITE_BEHIND=1: save() only marks the storage dirty, a
+        # background thread calls sync() every HBNB_FILE_FLUSH_INTERVAL
+        # seconds, or as soon as HBNB_FILE_FLUSH_EVERY objects changed
+        self.__write_behind = getenv("HBNB_FILE_WRITE_BEHIND") == "1"
+        self.__flush_interval = float(getenv("HBNB_FILE_FLUSH_INTERVAL") or
+                                      1)
+        self.__flush_every = int(getenv("HBNB_FILE_FLUSH_EVERY") or 100)
+        self.__pending = False
+        self.__flusher = None
+        self.__wake = threading.Event()
+        # HBNB_FILE_LAZY=1: reload() only packs the stored attributes, each
+        # object is built the first time all() or get() hands it out
+        self.__lazy = getenv("HBNB_FILE_LAZY") == "1"
+        # HBNB_FILE_COMPACT=1: the models are slotted (see Compact in
+        # base_model), and reload() makes the objects holding equal
+        # strings (names, the id of a parent and the foreign keys to it)
+        # share a single copy, for a lookup per string while reloading
+        self.__compact_strings = getenv("HBNB_FILE_COMPACT") == "1"
+
+    def __index(self):
+        """returns the per-class index {<class name>: {<key>: obj}},
+        rebuilding it and the attribute index when __objects has been
+        replaced by another dict"""
+        if FileStorage.__indexed is not self.__objects:
+            by_class = {}
+            FileStorage.__by_value = {}
+            FileStorage.__order = {}
+            for key, obj in self.__objects.items():
+                name = obj.__class__.__name__
+                by_class.setdefault(name, {})[key] = obj
+                self.__add_values(name, key, obj.__dict__)
+            for name, raw in self.__raw.items():
+                if indexed_attributes.get(name):
+                    for key, blob in raw.items():
+                        self.__add_values(name, key,
+                                          file_codecs.unpack(blob))
+            FileStorage.__by_class = by_class
+            FileStorage.__indexed = self.__objects
+        return FileStorage.__by_class
+
+    def __add_values(self, name, key, attrs, attrs_names=None):
+        """indexes key under the values the dict attrs gives the indexed
+        attributes of class name, or only those in attrs_names"""
+        for attr in (indexed_attributes.get(name, ()) if attrs_names is None
+                     else attrs_names):
+            by_value = FileStorage.__by_value.setdefault((name, attr), {})
+            value = attrs.get(attr)
+            if type(value) is str:
+                # the objects sharing a foreign key, and the index, then
+                # hold a single copy of it
+                value = attrs[attr] = sys.intern(value)
+            for value in values_of(value):
+                post(by_value, value, key)
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def __remove_values(self, name, key, attrs):
+        """drops key from the attribute index entries of the dict attrs"""
+        for attr in indexed_attributes.get(name, ()):
+            by_value = FileStorage.__by_value.get((name, attr), {})
+            for value in values_of(attrs.get(attr)):
+                unpost(by_value, value, key)
+
+    def __stamp(self):
+        """returns the (mtime, size, inode) of __file_path and __log_path,
+        None for a file that does not exist"""
+        stamp = []
+        for path in (self.__file_path, self.__log_path):
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def __hydrate(self, name, key=None):
+        """builds the objects of class name still held as raw attributes,
+        or only the one stored under key, and moves them to __objects"""
+        with self.__lock.writing():
+            raw = self.__raw.get(name)
+            if not raw:
+                return
+            by_class = self.__index().setdefault(name, {})
+            for raw_key in (list(raw) if key is None else [key]):
+                blob = raw.pop(raw_key, None)
+                if blob is not None:
+                    obj = self.__build(file_codecs.unpack(blob))
+                    by_class[raw_key] = obj
+                    self.__objects[raw_key] = obj
+
+    def all(self, cls=None, preload=()):
+        """returns the dictionary __objects, or a read-only view of the
+        objects of class cls; preload is accepted for compatibility with
+        DBStorage, relationships are looked up in the indexes"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = cls if type(cls) is str else cls.__name__
+            if self.__raw.get(name):
+                self.__hydrate(name)
+            return ClassView(self.__index().setdefault(name, {}),
+                             self.__lock)
+        for name in list(self.__raw):
+            self.__hydrate(name)
         return self.__objects
 
     def get(self, cls, id):
         """retrieve one object"""
         if cls and id:
-            obj_key = cls.__name__ + '.' + id
-            class_dict = self.all(cls)
-            if obj_key in class_dict:
-                return class_dict[obj_key]
+            name = cls if type(cls) is str else cls.__name__
+            key = name + '.' + id
+            obj = self.__objects.get(key)
+            if obj is None and key in self.__raw.get(name, ()):
+                self.__hydrate(name, key)
+                obj = self.__objects.get(key)
+            return obj
         return None
 
     def count(self, cls=None):
         """counts the number of objects in storage"""
-        count_dict = self.all(cls)
-        return len(count_dict)
+        if cls is not None:
+            name = cls if type(cls) is str else cls.__name__
+            return (len(self.__index().get(name, ())) +
+                    len(self.__raw.get(name, ())))
+        return len(self.__objects) + sum(map(len, self.__raw.values()))
+
+    def filter(self, cls, **criteria):
+        """returns {<key>: obj} for the objects of class cls whose
+        attributes equal criteria; a list, tuple or set value matches any
+        of its items, and a list attribute matches if one of its items
+        does. Ids and indexed attributes are looked up, not scanned for"""
+        name = cls if type(cls) is str else cls.__name__
+        terms = [(attr, value if isinstance(value, (list, tuple, set))
+                  else (value,)) for attr, value in criteria.items()]
+        return self.__find(name, terms)
+
+    def linked(self, cls, name, ids, **criteria):
+        """returns {<key>: obj} for the objects of class cls linked to
+        every id in ids through their many-to-many relationship name, and
+        matching criteria (see filter())"""
+        cls_name = cls if type(cls) is str else cls.__name__
+        attr = link_attributes[cls_name][name][0]
+        terms = [(attr, (link_id,)) for link_id in set(ids)]
+        terms += [(attr, value if isinstance(value, (list, tuple, set))
+                   else (value,)) for attr, value in criteria.items()]
+        return self.__find(cls_name, terms)
+
+    def link(self, obj, name, other):
+        """links obj to other through the many-to-many relationship name
+        of its class; returns False if they were already linked"""
+        return self.__relink(obj, name, other, True)
+
+    def unlink(self, obj, name, other):
+        """unlinks obj from other through the many-to-many relationship
+        name of its class; returns False if they were not linked"""
+        return self.__relink(obj, name, other, False)
+
+    def __relink(self, obj, name, other, link):
+        """adds other.id to the ids obj keeps for its relationship name, or
+        removes it, and updates their index; returns False if there was
+        nothing to do
+
+        The list decides, as it may have been changed in place; the index
+        entries of its ids are then posted again."""
+        cls_name = obj.__class__.__name__
+        attr = link_attributes[cls_name][name][0]
+        key = cls_name + "." + obj.id
+        ids = getattr(obj, attr)
+        with self.__lock.writing():
+            if (other.id in ids) == link:
+                return False
+            if link:
+                ids.append(other.id)
+            else:
+                ids.remove(other.id)
+            # the ids are in to_dict(), the ETag of obj must change
+            obj.updated_at = datetime.utcnow()
+            if self.__objects.get(key) is obj:
+                self.__index()
+                if not link:
+                    unpost(FileStorage.__by_value.setdefault(
+                        (cls_name, attr), {}), other.id, key)
+                self.__add_values(cls_name, key, obj.__dict__, (attr,))
+                self.__dirty.add(key)
+                self.__touch(cls_name, key)
+        return True
+
+    def __find(self, name, terms):
+        """returns {<key>: obj} for the objects of class name matching
+        every (attribute, values) term, by intersecting the index entries
+        of the indexed attributes and checking the objects left"""
+        with self.__lock.reading():
+            candidates = self.__candidates(name, terms)
+        if candidates is None:
+            candidates = self.all(name).keys()
+        new_dict = {}
+        for key in candidates:
+            obj = self.get(name, key.split(".", 1)[1])
+            if obj is not None and matches(obj, terms):
+                new_dict[key] = obj
+        return new_dict
+
+    def __postings(self, name, terms):
+        """returns, for every term on the id or an indexed attribute, the
+        lists of the keys of the objects having each of its values; under
+        the read lock"""
+        self.__index()
+        postings = []
+        for attr, values in terms:
+            if attr == "id":
+                # the keys of the objects are made of their ids
+                postings.append([(name + "." + str(value),)
+                                 for value in values])
+            elif attr in indexed_attributes.get(name, ()):
+                by_value = FileStorage.__by_value.get((name, attr), {})
+                postings.append([keys_of(by_value.get(value))
+                                 for value in values])
+        return postings
+
+    def __candidates(self, name, terms):
+        """returns the keys of the objects of class name found in the
+        index entries of every term, None if no term is indexed; under the
+        read lock"""
+        postings = [dict.fromkeys(key for keys in lists for key in keys)
+                    for lists in self.__postings(name, terms)]
+        if not postings:
+            return None
+        postings.sort(key=len)
+        return [key for key in postings[0]
+                if all(key in keys for keys in postings[1:])]
+
+    def counts(self, *clss):
+        """returns {<class name>: number of objects} for every class in
+        clss"""
+        counts = {}
+        for cls in clss:
+            name = cls if type(cls) is str else cls.__name__
+            counts[name] = self.count(name)
+        return counts
+
+    def page(self, cls, limit=None, after=None, fields=None, preload=(),
+             **criteria):
+        """returns a list of at most limit objects of class cls matching
+        criteria (see filter()), ordered by (created_at, id) and starting
+        after the (created_at, id) pair after; fields and preload are
+        accepted for compatibility with DBStorage, the objects are already
+        in memory"""
+        name = cls if type(cls) is str else cls.__name__
+        terms = [(attr, value if isinstance(value, (list, tuple, set))
+                  else (value,)) for attr, value in criteria.items()]
+        return list(islice(self.__walk(name, after, terms, limit), limit))
+
+    def iterate(self, cls, after=None, fields=None, **criteria):
+        """yields the objects of class cls matching criteria (see
+        filter()) in (created_at, id) order from after on, in a single walk
+        (see page()); fields is accepted for compatibility with
+        DBStorage"""
+        name = cls if type(cls) is str else cls.__name__
+        terms = [(attr, value if isinstance(value, (list, tuple, set))
+                  else (value,)) for attr, value in criteria.items()]
+        return self.__walk(name, after, terms)
+
+    def __walk(self, name, after, terms, limit=None):
+        """yields the objects of class name matching every (attribute,
+        values) term, ordered by (created_at, id) from after on; limit is
+        how many of them are wanted, None for all
+
+        When the index entries of the terms list few objects, they are
+        sorted; otherwise the class order is read from after on, a window
+        at a time, skipping the keys missing from the index entries, until
+        the caller stops."""
+        with self.__lock.reading():
+            order = self.__ordering(name)
+            postings = self.__postings(name, terms)
+            size = min((sum(len(keys) for keys in lists)
+                        for lists in postings), default=None)
+            wanted = size if limit is None else limit
+            if size is not None and size * size < wanted * len(order):
+                keys = self.__candidates(name, terms)
+            else:
+                keys = None
+        if keys is not None:
+            found = []
+            for key in keys:
+                obj = self.get(name, key.split(".", 1)[1])
+                if obj is not None and matches(obj, terms):
+                    entry = (obj.created_at, obj.id)
+                    if after is None or entry > after:
+                        found.append((entry, obj))
+            if limit is None:
+                found.sort(key=lambda item: item[0])
+            else:
+                found = heapq.nsmallest(limit, found,
+                                        key=lambda item: item[0])
+            for entry, obj in found:
+                yield obj
+            return
+        window = limit if limit is not None and not terms else WINDOW
+        while True:
+            with self.__lock.reading():
+                order = self.__ordering(name)
+                start = 0
+                if after is not None:
+                    start = bisect.bisect_right(order, after)
+                entries = order[start:start + window]
+                # read again, an entry may have been replaced meanwhile
+                postings = self.__postings(name, terms)
+            if not entries:
+                return
+            for created_at, id in entries:
+                key = name + "." + id
+                if not all(any(key in keys for keys in lists)
+                           for lists in postings):
+                    continue
+                obj = self.get(name, id)
+                if obj is not None and obj.created_at == created_at and \
+                   matches(obj, terms):
+                    yield obj
+            after = entries[-1]
+
+    def __ordering(self, name):
+        """returns the sorted (created_at, id) list of class name, building
+        it on first use"""
+        by_class = self.__index()
+        order = FileStorage.__order.get(name)
+        if order is None:
+            order = [(obj.created_at, obj.id)
+                     for obj in by_class.get(name, {}).values()]
+            for blob in self.__raw.get(name, {}).values():
+                attrs = file_codecs.unpack(blob)
+                created_at = attrs["created_at"]
+                if type(created_at) is str:
+                    created_at = parse_time(created_at)
+                order.append((created_at, attrs["id"]))
+            order.sort()
+            FileStorage.__order[name] = order
+        return order
+
+    def version(self, cls, **criteria):
+        """returns (token, time): token changes whenever an object of class
+        cls is stored or deleted, time is when that last happened (None if
+        never); criteria are accepted for compatibility with DBStorage"""
+        name = cls if type(cls) is str else cls.__name__
+        count, changed_at = FileStorage.__versions.get(name, (0, None))
+        return (FileStorage.__boot, count), changed_at
+
+    def subscribe(self, listener):
+        """calls listener(<class name>, <key>) after every change to an
+        object, key None when any object of the class may have changed
+        (reload(), new_all()); it runs under the storage lock and must not
+        use the storage"""
+        FileStorage.__listeners.append(listener)
+
+    def __touch(self, name, key=None):
+        """records a change to the object key of class name, to any of
+        them if key is None"""
+        count = FileStorage.__versions.get(name, (0, None))[0]
+        FileStorage.__versions[name] = (count + 1, datetime.utcnow())
+        for listener in FileStorage.__listeners:
+            listener(name, key)
+
+    def reindex(self, obj, attr, old):
+        """moves obj in the index of the attribute attr from the value old
+        to its current one, if obj is stored"""
+        name = obj.__class__.__name__
+        key = name + "." + str(obj.__dict__.get("id"))
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__lock.writing():
+            self.__index()
+            by_value = FileStorage.__by_value.setdefault((name, attr), {})
+            for value in values_of(old):
+                unpost(by_value, value, key)
+            self.__add_values(name, key, obj.__dict__, (attr,))
+            # the journal only writes the objects marked dirty
+            self.__dirty.add(key)
+            self.__touch(name, key)
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock.writing():
+                self.__touch(self.__add(obj),
+                             obj.__class__.__name__ + "." + obj.id)
+
+    def new_all(self, objs):
+        """sets in __objects every object of objs, taking the lock and
+        reporting the change of each class once"""
+        with self.__lock.writing():
+            names = {self.__add(obj): None for obj in objs}
+            for name in names:
+                self.__touch(name)
+
+    def __add(self, obj):
+        """sets obj in __objects and the indexes, under the write lock;
+        returns its class name"""
+        name = obj.__class__.__name__
+        key = name + "." + obj.id
+        self.__index().setdefault(name, {})[key] = obj
+        self.__objects[key] = obj
+        self.__add_values(name, key, obj.__dict__)
+        order = FileStorage.__order.get(name)
+        if order is not None:
+            entry = (obj.created_at, obj.id)
+            i = bisect.bisect_left(order, entry)
+            if i == len(order) or order[i] != entry:
+                order.insert(i, entry)
+        self.__raw.get(name, {}).pop(key, None)
+        self.__dirty.add(key)
+        self.__deleted.discard(key)
+        return name
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path), or
+        appends the objects changed since the last save to __log_path;
+        in write-behind mode, leaves that to the flusher thread"""
+        if self.__write_behind:
+            self.__schedule()
+            return
+        self.sync()
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    def sync(self):
+        """writes the changes made since the last save to disk right away,
+        whatever the save mode"""
+        with self.__save_lock:
+            self.__pending = False
+            if self.__journal:
+                self.__append()
+                return
+            with self.__lock.writing():
+                self.__dirty.clear()
+                self.__deleted.clear()
+            with self.__lock.reading():
+                data = self.__codec.encode(self.__objects, self.__records())
+            self.__write(data)
+            for path in (self.__log_path, self.__log_path + ".old"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            FileStorage.__file_stamp = self.__stamp()
+
+    def __schedule(self):
+        """marks the storage dirty for the flusher thread, starting it on
+        first use, and wakes it up once enough objects changed"""
+        self.__pending = True
+        if self.__flusher is None:
+            self.__flusher = threading.Thread(target=self.__flush_loop,
+                                              daemon=True)
+            self.__flusher.start()
+            atexit.register(self.sync)
+        if len(self.__dirty) + len(self.__deleted) >= self.__flush_every:
+            self.__wake.set()
+
+    def __flush_loop(self):
+        """body of the flusher thread: syncs pending saves on each tick"""
+        while True:
+            self.__wake.wait(self.__flush_interval)
+            self.__wake.clear()
+            if not self.__pending:
+                continue
+            try:
+                self.sync()
+            except Exception:
+                # keep the changes pending and try again on the next tick
+                self.__pending = True
+                traceback.print_exc()
+
+    def __records(self):
+        """returns the {<key>: attributes} of the objects not built yet"""
+        records = {}
+        for raw in self.__raw.values():
+            for key, blob in raw.items():
+                records[key] = file_codecs.unpack(blob)
+        return records
+
+    def __write(self, data):
+        """writes the bytes data to the file: they are written and fsynced
+        to a temporary file that is then renamed over the file, so a crash
+        never leaves a truncated file behind"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            mode = os.stat(self.__file_path).st_mode & 0o777
         except FileNotFoundError:
+            mode = 0o644
+        directory, name = os.path.split(os.path.abspath(self.__file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp",
+                                        prefix="." + name + ".")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(f.fileno(), mode)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.__backups:
+                self.__rotate()
+            os.replace(tmp_path, self.__file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.__fsync_dir(directory)
+
+    def __rotate(self):
+        """shifts the backups of the JSON file by one and makes the current
+        JSON file the newest backup"""
+        if not os.path.exists(self.__file_path):
+            return
+        path = self.__file_path + ".{:d}"
+        for i in range(self.__backups - 1, 0, -1):
+            if os.path.exists(path.format(i)):
+                os.replace(path.format(i), path.format(i + 1))
+        if os.path.exists(path.format(1)):
+            os.remove(path.format(1))
+        try:
+            os.link(self.__file_path, path.format(1))
+        except OSError:
+            shutil.copy2(self.__file_path, path.format(1))
+
+    @staticmethod
+    def __fsync_dir(directory):
+        """flushes a rename in directory to disk, where the OS allows it"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
             pass
+        finally:
+            os.close(fd)
+
+    def __append(self):
+        """appends the objects stored or deleted since the last save to the
+        journal, then compacts the journal if it grew too big"""
+        lines = []
+        with self.__lock.writing():
+            for key in self.__dirty:
+                if key in self.__objects:
+                    record = {"key": key,
+                              "obj": self.__objects[key].to_dict()}
+                    lines.append(json.dumps(record) + "\n")
+            for key in self.__deleted:
+                lines.append(json.dumps({"key": key}) + "\n")
+            self.__dirty.clear()
+            self.__deleted.clear()
+        if lines:
+            with open(self.__log_path, 'a') as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+        FileStorage.__file_stamp = self.__stamp()
+        log_stamp = FileStorage.__file_stamp[1]
+        file_stamp = FileStorage.__file_stamp[0]
+        limit = max(self.__journal_max, file_stamp[1] if file_stamp else 0)
+        if log_stamp and log_stamp[1] > limit:
+            self.__compact()
+
+    def __compact(self):
+        """folds the journal into the JSON file in a background thread"""
+        compactor = FileStorage.__compactor
+        if compactor is not None and compactor.is_alive():
+            return
+        # later saves go to a fresh journal, which reload() replays over
+        # whatever snapshot the thread writes
+        os.replace(self.__log_path, self.__log_path + ".old")
+        with self.__lock.reading():
+            objects = dict(self.__objects)
+            records = self.__records()
+
+        def compact():
+            """writes the snapshot and drops the journal it replaces"""
+            self.__write(self.__codec.encode(objects, records))
+            try:
+                os.remove(self.__log_path + ".old")
+            except FileNotFoundError:
+                pass
+            FileStorage.__file_stamp = self.__stamp()
+
+        FileStorage.__compactor = threading.Thread(target=compact,
+                                                   daemon=True)
+        FileStorage.__compactor.start()
+
+    def reload(self):
+        """deserializes the JSON file, then replays its journal, to
+        __objects"""
+        # a save landing between reading the file and applying it would
+        # make the file older than the objects it overwrites
+        with self.__save_lock:
+            FileStorage.__file_stamp = self.__stamp()
+            # objects are built (or packed, in lazy mode) without the lock,
+            # then swapped in all at once
+            loaded = []
+            # in compact mode, the first copy of every string value read,
+            # dropped once reloaded so values seen once cost nothing
+            strings = {} if self.__compact_strings else None
+            paths = [self.__file_path]
+            paths += ["{}.{:d}".format(self.__file_path, i)
+                      for i in range(1, self.__backups + 1)]
+            error = None
+            for path in paths:
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    jo = file_codecs.sniff(data).decode(data)
+                except FileNotFoundError:
+                    if error is not None:
+                        # no backup to fall back on: starting empty would
+                        # have the next save overwrite the unreadable file
+                        raise error
+                    break
+                except (ValueError, EOFError, TypeError) as e:
+                    # unreadable file, fall back on the newest backup
+                    error = error or e
+                    if path == paths[-1]:
+                        raise error
+                    continue
+                for key in jo:
+                    loaded.append((key, self.__prepare(jo[key], strings)))
+                break
+            for path in (self.__log_path + ".old", self.__log_path):
+                try:
+                    with open(path, 'r') as f:
+                        for line in f:
+                            try:
+                                record = json.loads(line)
+                            except ValueError:
+                                # torn write at the end of the journal
+                                break
+                            obj = self.__prepare(record.get("obj"), strings)
+                            loaded.append((record["key"], obj))
+                except FileNotFoundError:
+                    pass
+            with self.__lock.writing():
+                by_class = self.__index()
+                # rebuilt by the next page()
+                FileStorage.__order = {}
+                touched = set()
+                for key, obj in loaded:
+                    if key in self.__dirty or key in self.__deleted:
+                        # changed here since the last save, keep our version
+                        continue
+                    name = key.split(".", 1)[0]
+                    touched.add(name)
+                    old = self.__objects.pop(key, None)
+                    if old is not None:
+                        by_class.get(old.__class__.__name__,
+                                     {}).pop(key, None)
+                        self.__remove_values(name, key, old.__dict__)
+                    self.__raw.get(name, {}).pop(key, None)
+                    if type(obj) is tuple:
+                        self.__raw.setdefault(obj[0], {})[key] = obj[1]
+                        self.__add_values(obj[0], key, obj[2])
+                    elif obj is not None:
+                        by_class.setdefault(obj.__class__.__name__,
+                                            {})[key] = obj
+                        self.__objects[key] = obj
+                        self.__add_values(name, key, obj.__dict__)
+                for name in touched:
+                    self.__touch(name)
+
+    def __prepare(self, value, strings=None):
+        """returns the object described by the dict value, or in lazy mode
+        the (<class name>, packed value, indexed attributes) tuple to build
+        it from later; None if value is None (a deleted object). The string
+        values equal to a key of the dict strings are replaced by it"""
+        if value is not None and strings is not None:
+            for attr, item in value.items():
+                if type(item) is str:
+                    value[attr] = strings.setdefault(item, item)
+        if value is not None and self.__lazy:
+            name = value["__class__"]
+            values = {attr: value.get(attr)
+                      for attr in indexed_attributes.get(name, ())}
+            return (name, file_codecs.pack(value), values)
+        return self.__build(value)
+
+    @staticmethod
+    def __build(value):
+        """returns the object described by the dict value, None if value
+        is None (a deleted object)"""
+        if value is None:
+            return None
+        return classes[value["__class__"]](**value)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            name = obj.__class__.__name__
+            key = name + '.' + obj.id
+            with self.__lock.writing():
+                raw = self.__raw.get(name, {})
+                if key in self.__objects or key in raw:
+                    self.__objects.pop(key, None)
+                    self.__index().get(name, {}).pop(key, None)
+                    self.__remove_values(name, key, obj.__dict__)
+                    order = FileStorage.__order.get(name)
+                    if order is not None:
+                        entry = (obj.created_at, obj.id)
+                        i = bisect.bisect_left(order, entry)
+                        if i < len(order) and order[i] == entry:
+                            del order[i]
+                    raw.pop(key, None)
+                    self.__deleted.add(key)
+                    self.__dirty.discard(key)
+                    self.__touch(name, key)
+            # like the ON DELETE CASCADE of place_amenity, unlink the
+            # objects linked to obj
+            for cls_name, links in link_attributes.items():
+                for link_name, (attr, target) in links.items():
+                    if target == name:
+                        keys = keys_of(FileStorage.__by_value.get(
+                            (cls_name, attr), {}).get(obj.id))
+                        for linked_key in list(keys):
+                            linked = self.get(cls_name,
+                                              linked_key.split(".", 1)[1])
+                            if linked is not None:
+                                self.unlink(linked, link_name, obj)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method for deserializing the JSON file to objects,
+        unless the file is unchanged since it was last read or written"""
+        if self.__stamp() != FileStorage.__file_stamp:
+            self.reload()
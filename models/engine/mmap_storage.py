@@ -0,0 +1,559 @@
+#!/usr/bin/python3
+"""
+Contains the MmapStorage class
+"""
+
+import bisect
+import fcntl
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import uuid
+import weakref
+from datetime import datetime
+from itertools import islice
+from models.amenity import Amenity
+from models.base_model import BaseModel, format_time, parse_time
+from models.city import City
+from models.engine import file_codecs
+from models.engine.file_storage import WINDOW, link_attributes, matches
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
+           "Place": Place, "Review": Review, "State": State, "User": User}
+
+# every record in the data file is its length followed by its packed
+# attributes (see file_codecs.pack); every entry of the index log is its
+# length followed by the marshalled {<class name>.id: location or None}
+# changes of a save
+HEADER = struct.Struct("<I")
+
+
+class MmapStorage:
+    """keeps the objects in a memory-mapped data file, located through an
+    on-disk index, and only builds the ones that are asked for
+
+    The data file is append-only: saving an object appends a new record,
+    and the new locations go to a log next to the data file
+    (file.<n>.log), read over the index by reload(). Once dead records
+    take up more than half of the file, save() copies the live ones to a
+    new data file and writes the whole index, which names the data file it
+    belongs to and is replaced atomically, so a crash leaves either the
+    old or the new pair; an entry cut short by a crash ends the log."""
+
+    # string - path to the index, {"data": <data file>, "index":
+    # {<class name>: {<class name>.id: (offset, length, created_at)}}},
+    # created_at in the time format so page() needs no record
+    __index_path = "file.idx"
+
+    def __init__(self):
+        """Instantiate a MmapStorage object"""
+        self.__index_path = MmapStorage.__index_path
+        self.__data_path = None
+        self.__index = {}
+        self.__data = None
+        self.__map = None
+        # objects handed out, so get() returns the same instance while it
+        # is in use
+        self.__loaded = weakref.WeakValueDictionary()
+        # dictionary - objects passed to new() and not saved yet
+        self.__pending = {}
+        # dictionary - the sorted (created_at, id) of the objects by <class
+        # name>, built on the first page() of the class; entries may be
+        # stale if created_at changed, page() checks the objects it finds
+        self.__order = {}
+        # set - keys of the stored objects deleted since the last save
+        self.__deleted = set()
+        # size of the valid entries of the index log, and whether an entry
+        # cut short follows them
+        self.__log_size = 0
+        self.__torn = False
+        # the stamps of the index and of its log when last read or written
+        self.__stamp = (None, None)
+        self.__lock = threading.RLock()
+        # {<class name>: (number of changes, time of the last one)}, for
+        # version(); __boot tells this instance's counts apart
+        self.__versions = {}
+        self.__boot = uuid.uuid4().hex
+        # functions called with the <class name> and key of every change
+        self.__listeners = []
+
+    def __read(self, location):
+        """returns the object stored at the (offset, length) location"""
+        offset, length = location[0], location[1]
+        if self.__map is None or offset + length > len(self.__map):
+            self.__remap()
+        start = offset + HEADER.size
+        attrs = file_codecs.unpack(self.__map[start:offset + length])
+        return classes[attrs.pop("__class__")](**attrs)
+
+    def __remap(self):
+        """maps the whole data file in memory"""
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__data.flush()
+        if os.fstat(self.__data.fileno()).st_size:
+            self.__map = mmap.mmap(self.__data.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+
+    def __fetch(self, key, location):
+        """returns the object stored under key, built at most once while
+        it is in use"""
+        obj = self.__pending.get(key) or self.__loaded.get(key)
+        if obj is None:
+            obj = self.__read(location)
+            self.__loaded[key] = obj
+        return obj
+
+    def all(self, cls=None, preload=()):
+        """returns a dictionary of the objects, of class cls if given;
+        preload is accepted for compatibility with DBStorage"""
+        with self.__lock:
+            new_dict = {}
+            for name, keys in self.__index.items():
+                if cls is None or cls is classes.get(name) or cls == name:
+                    for key, location in keys.items():
+                        new_dict[key] = self.__fetch(key, location)
+            for key, obj in self.__pending.items():
+                name = obj.__class__.__name__
+                if cls is None or cls is obj.__class__ or cls == name:
+                    new_dict[key] = obj
+            return new_dict
+
+    def get(self, cls, id):
+        """retrieve one object"""
+        if cls and id:
+            name = cls if type(cls) is str else cls.__name__
+            key = name + "." + id
+            with self.__lock:
+                if key in self.__pending:
+                    return self.__pending[key]
+                location = self.__index.get(name, {}).get(key)
+                if location is not None:
+                    return self.__fetch(key, location)
+        return None
+
+    def count(self, cls=None):
+        """counts the number of objects in storage"""
+        with self.__lock:
+            if cls is None:
+                total = sum(map(len, self.__index.values()))
+                names = None
+            else:
+                name = cls if type(cls) is str else cls.__name__
+                total = len(self.__index.get(name, ()))
+                names = (name,)
+            for key, obj in self.__pending.items():
+                name = obj.__class__.__name__
+                if names is None or name in names:
+                    if key not in self.__index.get(name, ()):
+                        total += 1
+            return total
+
+    def counts(self, *clss):
+        """returns {<class name>: number of objects} for every class in
+        clss"""
+        counts = {}
+        for cls in clss:
+            name = cls if type(cls) is str else cls.__name__
+            counts[name] = self.count(name)
+        return counts
+
+    def filter(self, cls, **criteria):
+        """returns {<key>: obj} for the objects of class cls whose
+        attributes equal criteria; a list, tuple or set value matches any
+        of its items"""
+        criteria = {attr: (value if isinstance(value, (list, tuple, set))
+                           else (value,))
+                    for attr, value in criteria.items()}
+        terms = criteria.items()
+        return {key: obj for key, obj in self.all(cls).items()
+                if matches(obj, terms)}
+
+    def linked(self, cls, name, ids, **criteria):
+        """returns {<key>: obj} for the objects of class cls linked to
+        every id in ids through their many-to-many relationship name, and
+        matching criteria (see filter())"""
+        cls_name = cls if type(cls) is str else cls.__name__
+        attr = link_attributes[cls_name][name][0]
+        objs = self.filter(cls, **criteria) if criteria else self.all(cls)
+        return {key: obj for key, obj in objs.items()
+                if set(ids) <= set(getattr(obj, attr, ()))}
+
+    def link(self, obj, name, other):
+        """links obj to other through the many-to-many relationship name
+        of its class; returns False if they were already linked"""
+        ids = getattr(obj, link_attributes[obj.__class__.__name__][name][0])
+        if other.id in ids:
+            return False
+        ids.append(other.id)
+        obj.updated_at = datetime.utcnow()
+        self.new(obj)
+        return True
+
+    def unlink(self, obj, name, other):
+        """unlinks obj from other through the many-to-many relationship
+        name of its class; returns False if they were not linked"""
+        ids = getattr(obj, link_attributes[obj.__class__.__name__][name][0])
+        if other.id not in ids:
+            return False
+        ids.remove(other.id)
+        obj.updated_at = datetime.utcnow()
+        self.new(obj)
+        return True
+
+    def page(self, cls, limit=None, after=None, fields=None, preload=(),
+             **criteria):
+        """returns a list of at most limit objects of class cls matching
+        criteria (see filter()), ordered by (created_at, id) and starting
+        after the (created_at, id) pair after; fields and preload are
+        accepted for compatibility with DBStorage
+
+        Only the objects from after on are read, until limit of them
+        match."""
+        return list(islice(self.iterate(cls, after, **criteria), limit))
+
+    def iterate(self, cls, after=None, fields=None, **criteria):
+        """yields the objects of class cls matching criteria (see
+        filter()) in (created_at, id) order from after on, reading the
+        class order a window at a time and the records as they are asked
+        for; fields is accepted for compatibility with DBStorage"""
+        name = cls if type(cls) is str else cls.__name__
+        terms = [(attr, value if isinstance(value, (list, tuple, set))
+                  else (value,)) for attr, value in criteria.items()]
+        while True:
+            with self.__lock:
+                order = self.__ordering(name)
+                start = 0
+                if after is not None:
+                    start = bisect.bisect_right(order, after)
+                entries = order[start:start + WINDOW]
+            if not entries:
+                return
+            for created_at, id in entries:
+                obj = self.get(name, id)
+                if obj is not None and obj.created_at == created_at and \
+                   matches(obj, terms):
+                    yield obj
+            after = entries[-1]
+
+    def __ordering(self, name):
+        """returns the sorted (created_at, id) list of class name, building
+        it from the index on first use"""
+        order = self.__order.get(name)
+        if order is None:
+            order = {}
+            prefix = len(name) + 1
+            for key, location in self.__index.get(name, {}).items():
+                order[key] = (parse_time(location[2]), key[prefix:])
+            for key, obj in self.__pending.items():
+                if obj.__class__.__name__ == name:
+                    order[key] = (obj.created_at, obj.id)
+            order = sorted(order.values())
+            self.__order[name] = order
+        return order
+
+    def __place(self, name, entry, add):
+        """adds or removes the (created_at, id) entry in the order of
+        class name, if it is built"""
+        order = self.__order.get(name)
+        if order is not None:
+            i = bisect.bisect_left(order, entry)
+            found = i < len(order) and order[i] == entry
+            if add and not found:
+                order.insert(i, entry)
+            elif not add and found:
+                del order[i]
+
+    def version(self, cls, **criteria):
+        """returns (token, time): token changes whenever an object of class
+        cls is stored or deleted, time is when that last happened (None if
+        never); criteria are accepted for compatibility with DBStorage"""
+        name = cls if type(cls) is str else cls.__name__
+        count, changed_at = self.__versions.get(name, (0, None))
+        return (self.__boot, count), changed_at
+
+    def subscribe(self, listener):
+        """calls listener(<class name>, <key>) after every change to an
+        object, key None when any object of the class may have changed
+        (reload()); it runs under the storage lock"""
+        self.__listeners.append(listener)
+
+    def __touch(self, name, key=None):
+        """records a change to the object key of class name, to any of
+        them if key is None"""
+        count = self.__versions.get(name, (0, None))[0]
+        self.__versions[name] = (count + 1, datetime.utcnow())
+        for listener in self.__listeners:
+            listener(name, key)
+
+    def new(self, obj):
+        """keeps obj until the next save appends it to the data file"""
+        if obj is not None:
+            key = obj.__class__.__name__ + "." + obj.id
+            with self.__lock:
+                self.__pending[key] = obj
+                self.__loaded[key] = obj
+                self.__deleted.discard(key)
+                self.__place(obj.__class__.__name__,
+                             (obj.created_at, obj.id), True)
+                self.__touch(obj.__class__.__name__, key)
+
+    def new_all(self, objs):
+        """keeps every object of objs until the next save"""
+        for obj in objs:
+            self.new(obj)
+
+    def save(self):
+        """appends the new objects to the data file and their locations to
+        the index log"""
+        with self.__lock:
+            if not self.__pending and not self.__deleted:
+                return
+            # other processes (the console, another worker) save to the
+            # same files: one at a time, each reading the others' changes
+            # first
+            with open(self.__index_path + ".lock", "ab") as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                self.__catch_up()
+                self.__append()
+
+    def __catch_up(self):
+        """reads the changes saved by other processes since this one last
+        read or wrote the index and its log, under the file lock"""
+        if self.__file_stamp(self.__index_path) != self.__stamp[0]:
+            # replaced by a compaction, or written for the first time
+            self.reload()
+            return
+        changed = self.__replay_log(self.__log_size)
+        if changed:
+            self.__order = {}
+        for key in changed:
+            if key not in self.__pending:
+                self.__loaded.pop(key, None)
+            self.__touch(key.partition(".")[0], key)
+
+    def __append(self):
+        """appends the new objects to the data file and their locations to
+        the index log, under the file lock"""
+        changes = dict.fromkeys(self.__deleted)
+        for key in self.__deleted:
+            # in case the log of another process stored it again
+            self.__index.get(key.partition(".")[0], {}).pop(key, None)
+        self.__data.seek(0, os.SEEK_END)
+        offset = self.__data.tell()
+        chunks = []
+        for key, obj in self.__pending.items():
+            attrs = obj.__dict__.copy()
+            attrs.pop("_sa_instance_state", None)
+            attrs["__class__"] = obj.__class__.__name__
+            blob = file_codecs.pack(attrs)
+            chunks.append(HEADER.pack(len(blob)) + blob)
+            length = HEADER.size + len(blob)
+            location = (offset, length, format_time(obj.created_at))
+            self.__index.setdefault(obj.__class__.__name__,
+                                    {})[key] = location
+            changes[key] = location
+            offset += length
+        self.__data.write(b"".join(chunks))
+        self.__data.flush()
+        os.fsync(self.__data.fileno())
+        self.__pending.clear()
+        self.__deleted.clear()
+        live = sum(location[1] for keys in self.__index.values()
+                   for location in keys.values())
+        if offset > 2 * live and offset > 1 << 20:
+            self.__compact()
+        elif self.__stamp[0] is None:
+            # no index names this data file yet
+            self.__write_index()
+        else:
+            self.__append_log(changes)
+
+    def sync(self):
+        """writes the changes made since the last save to disk"""
+        self.save()
+
+    def __compact(self):
+        """copies the live records to a new data file, dropping the dead
+        ones, and switches to it"""
+        self.__remap()
+        path = self.__next_data_path()
+        index = {}
+        with open(path, "wb") as f:
+            offset = 0
+            for name, keys in self.__index.items():
+                index[name] = {}
+                for key, (start, length, created_at) in keys.items():
+                    f.write(self.__map[start:start + length])
+                    index[name][key] = (offset, length, created_at)
+                    offset += length
+            f.flush()
+            os.fsync(f.fileno())
+        old_path = self.__data_path
+        self.__open(path)
+        self.__index = index
+        # left by a compaction the index never pointed to
+        self.__remove(self.__log_path())
+        self.__write_index()
+        os.remove(old_path)
+        self.__remove(os.path.splitext(old_path)[0] + ".log")
+
+    def __next_data_path(self):
+        """returns the name of the data file to compact into"""
+        base = os.path.splitext(self.__index_path)[0]
+        generation = 0
+        if self.__data_path is not None:
+            generation = int(self.__data_path.rsplit(".", 2)[-2]) + 1
+        return "{}.{:d}.dat".format(base, generation)
+
+    def __log_path(self):
+        """returns the path to the index log of the data file"""
+        return os.path.splitext(self.__data_path)[0] + ".log"
+
+    @staticmethod
+    def __remove(path):
+        """removes the file path if it exists"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __append_log(self, changes):
+        """appends the {<key>: location or None} changes to the index log"""
+        blob = marshal.dumps(changes)
+        with open(self.__log_path(), "ab") as f:
+            if self.__torn:
+                # drops the entry cut short by a crash, found by the replay
+                # just made under the file lock
+                f.truncate(self.__log_size)
+                self.__torn = False
+            f.write(HEADER.pack(len(blob)) + blob)
+            f.flush()
+            os.fsync(f.fileno())
+            self.__log_size = f.tell()
+        self.__stamp = self.__index_stamp()
+
+    def __replay_log(self, start=0):
+        """applies the entries of the index log from the offset start on
+        to the index; returns the keys they change"""
+        try:
+            with open(self.__log_path(), "rb") as f:
+                f.seek(start)
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        changed = []
+        position = 0
+        while position + HEADER.size <= len(data):
+            length = HEADER.unpack_from(data, position)[0]
+            end = position + HEADER.size + length
+            if end > len(data):
+                break
+            try:
+                changes = marshal.loads(data[position + HEADER.size:end])
+            except (EOFError, ValueError, TypeError):
+                break
+            for key, location in changes.items():
+                keys = self.__index.setdefault(key.partition(".")[0], {})
+                if location is None:
+                    keys.pop(key, None)
+                else:
+                    keys[key] = location
+                changed.append(key)
+            position = end
+        self.__log_size = start + position
+        self.__torn = position < len(data)
+        return changed
+
+    def __write_index(self):
+        """atomically replaces the index file with the in-memory index"""
+        data = marshal.dumps({"data": os.path.basename(self.__data_path),
+                              "index": self.__index})
+        directory = os.path.dirname(os.path.abspath(self.__index_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), 0o644)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.__index_path)
+        self.__log_size = 0
+        self.__torn = False
+        self.__stamp = self.__index_stamp()
+
+    def __index_stamp(self):
+        """returns the stamps of the index and of its log"""
+        return (self.__file_stamp(self.__index_path),
+                self.__file_stamp(self.__log_path()))
+
+    @staticmethod
+    def __file_stamp(path):
+        """returns the (mtime, size, inode) of the file path, None if
+        absent"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def __open(self, path):
+        """opens the data file path for appending and mapping"""
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__data is not None:
+            self.__data.close()
+        self.__data_path = path
+        self.__data = open(path, "a+b")
+
+    def delete(self, obj=None):
+        """removes obj from the index, its record dies at the next save"""
+        if obj is not None:
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
+            with self.__lock:
+                self.__pending.pop(key, None)
+                self.__loaded.pop(key, None)
+                self.__place(name, (obj.created_at, obj.id), False)
+                if self.__index.get(name, {}).pop(key, None) is not None:
+                    self.__deleted.add(key)
+                self.__touch(name, key)
+
+    def reload(self):
+        """reads the index and its log, and maps its data file"""
+        with self.__lock:
+            # taken before reading, so a change made meanwhile is seen by
+            # the next close()
+            index_stamp = self.__file_stamp(self.__index_path)
+            directory = os.path.dirname(self.__index_path)
+            try:
+                with open(self.__index_path, "rb") as f:
+                    stored = marshal.load(f)
+                path = os.path.join(directory, stored["data"])
+                self.__index = stored["index"]
+            except FileNotFoundError:
+                path = self.__next_data_path()
+                self.__index = {}
+            self.__loaded = weakref.WeakValueDictionary()
+            self.__order = {}
+            self.__open(path)
+            self.__stamp = (index_stamp,
+                            self.__file_stamp(self.__log_path()))
+            self.__replay_log()
+            for key in self.__deleted:
+                self.__index.get(key.partition(".")[0], {}).pop(key, None)
+            for name in set(self.__versions) | set(self.__index):
+                self.__touch(name)
+
+    def close(self):
+        """reloads the index if another process changed it"""
+        if self.__index_stamp() != self.__stamp:
+            self.reload()
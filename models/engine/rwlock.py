@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Contains the ReadWriteLock class
+"""
+
+from contextlib import contextmanager
+import threading
+
+
+class ReadWriteLock:
+    """lock held by any number of readers or by a single writer
+
+    A writer waiting for the lock keeps new readers out, so a steady stream
+    of readers cannot starve it. The lock is not reentrant."""
+
+    def __init__(self):
+        """Instantiate an unlocked ReadWriteLock"""
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writing = False
+        self.__writers_waiting = 0
+
+    def acquire_read(self):
+        """blocks until no writer holds or waits for the lock"""
+        with self.__cond:
+            while self.__writing or self.__writers_waiting:
+                self.__cond.wait()
+            self.__readers += 1
+
+    def release_read(self):
+        """releases a read hold on the lock"""
+        with self.__cond:
+            self.__readers -= 1
+            if not self.__readers:
+                self.__cond.notify_all()
+
+    def acquire_write(self):
+        """blocks until the lock is free, then holds it exclusively"""
+        with self.__cond:
+            self.__writers_waiting += 1
+            while self.__writing or self.__readers:
+                self.__cond.wait()
+            self.__writers_waiting -= 1
+            self.__writing = True
+
+    def release_write(self):
+        """releases the exclusive hold on the lock"""
+        with self.__cond:
+            self.__writing = False
+            self.__cond.notify_all()
+
+    @contextmanager
+    def reading(self):
+        """context manager holding the lock for reading"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self):
+        """context manager holding the lock for writing"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
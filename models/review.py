@@ -1,7 +1,7 @@
 #!/usr/bin/python
 """ holds class Review"""
 import models
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, Indexed
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, ForeignKey
@@ -15,8 +15,8 @@ class Review(BaseModel, Base):
         user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
         text = Column(String(1024), nullable=False)
     else:
-        place_id = ""
-        user_id = ""
+        place_id = Indexed()
+        user_id = Indexed()
         text = ""
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""
+Contains the TestAppDocs and TestApp classes
+"""
+
+from api.v1 import app as app_module
+import pep8
+import unittest
+from unittest.mock import patch
+app = app_module.app
+
+
+class TestAppDocs(unittest.TestCase):
+    """Tests to check the documentation and style of api/v1/app.py"""
+    def test_pep8_conformance_app(self):
+        """Test that api/v1/app.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/app.py',
+                                    'tests/test_api/test_v1/test_app.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_app_module_docstring(self):
+        """Test for the app.py module docstring"""
+        self.assertIsNot(app_module.__doc__, None,
+                         "app.py needs a docstring")
+
+
+class TestApp(unittest.TestCase):
+    """Test the application-wide hooks of the API"""
+    def test_sync_header(self):
+        """Test that X-HBNB-Sync: 1 makes the request sync the storage"""
+        client = app.test_client()
+        with patch.object(app_module.storage, "sync") as mock_sync:
+            client.get("/api/v1/status")
+            self.assertFalse(mock_sync.called)
+            client.get("/api/v1/status", headers={"X-HBNB-Sync": "1"})
+            self.assertTrue(mock_sync.called)
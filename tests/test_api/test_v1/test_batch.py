@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+import pep8
+import unittest
+from unittest.mock import patch
+from api.v1.app import app
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the style of views/batch.py"""
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'api/v1/views/batch.py',
+            'tests/test_api/test_v1/test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestBatch(unittest.TestCase):
+    """Test the POST /api/v1/batch view"""
+    def setUp(self):
+        """Store one State with one City"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.state = State(name="California")
+        self.city = City(name="Fremont", state_id=self.state.id)
+        models.storage.new(self.state)
+        models.storage.new(self.city)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Restore the objects and file.json"""
+        FileStorage._FileStorage__objects = self.save
+        models.storage.save()
+
+    def test_apply(self):
+        """Test that every operation is applied, with one save"""
+        operations = [
+            {"op": "create", "class": "State",
+             "data": {"id": "nv", "name": "Nevada"}},
+            {"op": "create", "class": "City",
+             "data": {"name": "Reno", "state_id": "nv"}},
+            {"op": "update", "class": "City", "id": self.city.id,
+             "data": {"name": "Napa", "id": "changed"}},
+            {"op": "delete", "class": "State", "id": self.state.id}]
+        with patch.object(FileStorage, "save") as mock_save:
+            resp = self.client.post("/api/v1/batch", json=operations)
+            self.assertEqual(mock_save.call_count, 1)
+        self.assertEqual(resp.status_code, 200)
+        results = resp.get_json()
+        self.assertEqual(results[0]["id"], "nv")
+        self.assertEqual(results[1]["state_id"], "nv")
+        self.assertEqual(results[3], {})
+        self.assertEqual(self.city.name, "Napa")
+        self.assertEqual(self.city.id, results[2]["id"])
+        self.assertEqual(len(models.storage.filter(City, state_id="nv")), 1)
+        self.assertIsNone(models.storage.get(State, self.state.id))
+
+    def test_lookups(self):
+        """Test that each parent id is looked up once"""
+        operations = [{"op": "create", "class": "City",
+                       "data": {"name": str(i), "state_id": self.state.id}}
+                      for i in range(10)]
+        with patch.object(FileStorage, "get",
+                          wraps=models.storage.get) as mock_get:
+            resp = self.client.post("/api/v1/batch", json=operations)
+            self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            len(models.storage.filter(City, state_id=self.state.id)), 11)
+
+    def test_invalid(self):
+        """Test that an invalid operation is a 400 applying nothing"""
+        for operation in [
+                {"op": "create", "class": "City", "data": {"name": "Reno"}},
+                {"op": "create", "class": "City",
+                 "data": {"name": "Reno", "state_id": "nope"}},
+                {"op": "create", "class": "State",
+                 "data": {"name": "Nevada", "id": self.state.id}},
+                {"op": "update", "class": "State", "id": "nope"},
+                {"op": "delete", "class": "Nope", "id": self.state.id},
+                {"op": "drop", "class": "State", "id": self.state.id},
+                "State"]:
+            operations = [{"op": "update", "class": "State",
+                           "id": self.state.id, "data": {"name": "Napa"}},
+                          operation]
+            resp = self.client.post("/api/v1/batch", json=operations)
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn(b"Operation 1", resp.get_data())
+        self.assertEqual(self.state.name, "California")
+        resp = self.client.post("/api/v1/batch", json={"op": "create"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_too_many(self):
+        """Test that a batch over BATCH_MAX operations is a 413"""
+        with patch("api.v1.views.batch.BATCH_MAX", 1):
+            resp = self.client.post("/api/v1/batch", json=[{}, {}])
+        self.assertEqual(resp.status_code, 413)
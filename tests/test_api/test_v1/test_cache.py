@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestLocalBackend and TestResponseCache classes
+"""
+
+from api.v1 import cache as cache_module
+from api.v1.cache import LocalBackend
+import models
+from models.engine.file_storage import FileStorage
+from models.state import State
+import pep8
+import time
+import unittest
+from unittest.mock import patch
+from api.v1.app import app
+cache = cache_module.cache
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of api/v1/cache.py"""
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py',
+                                    'tests/test_api/test_v1/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache_module.__doc__, None,
+                         "cache.py needs a docstring")
+
+
+class TestLocalBackend(unittest.TestCase):
+    """Test the in-process cache backend"""
+    def test_lru(self):
+        """Test that the least recently used entry is evicted first"""
+        backend = LocalBackend(2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(len(backend), 2)
+
+    def test_ttl(self):
+        """Test that an entry expires after its ttl"""
+        backend = LocalBackend()
+        backend.set("a", 1, ttl=0.01)
+        self.assertEqual(backend.get("a"), 1)
+        time.sleep(0.02)
+        self.assertIsNone(backend.get("a"))
+
+    def test_incr(self):
+        """Test that incr counts from 0"""
+        backend = LocalBackend()
+        self.assertEqual(backend.incr("n"), 1)
+        self.assertEqual(backend.incr("n"), 2)
+        self.assertEqual(backend.get("n"), 2)
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestResponseCache(unittest.TestCase):
+    """Test the caching of the GET views"""
+    def setUp(self):
+        """Enable the cache over a single stored State"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.state = State(name="California")
+        models.storage.new(self.state)
+        self.patch = patch.multiple(cache, backend=LocalBackend(), hits=0,
+                                    misses=0)
+        self.patch.start()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Disable the cache and restore the objects"""
+        self.patch.stop()
+        FileStorage._FileStorage__objects = self.save
+
+    def test_hit(self):
+        """Test that the second GET is served without running the view"""
+        first = self.client.get("/api/v1/states")
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        with patch.object(models.storage, "page") as mock_page:
+            second = self.client.get("/api/v1/states")
+            self.assertFalse(mock_page.called)
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(cache.stats(), {"enabled": True, "hits": 1,
+                                         "misses": 1})
+        self.assertEqual(self.client.get("/api/v1/cache").get_json(),
+                         cache.stats())
+
+    def test_key(self):
+        """Test that the query string and Accept header are in the key"""
+        self.client.get("/api/v1/states")
+        resp = self.client.get("/api/v1/states?fields=name")
+        self.assertEqual(resp.headers["X-Cache"], "MISS")
+        self.assertEqual(resp.get_json(), [{"name": "California"}])
+        resp = self.client.get("/api/v1/states",
+                               headers={"Accept": "application/x-ndjson"})
+        self.assertNotIn("X-Cache", resp.headers)
+        self.assertEqual(resp.mimetype, "application/x-ndjson")
+
+    def test_invalidation(self):
+        """Test that storing or deleting an object of the class drops the
+        responses built from it, and only those"""
+        self.client.get("/api/v1/states")
+        self.client.get("/api/v1/amenities")
+        self.client.get("/api/v1/stats")
+        models.storage.new(State(name="Nevada"))
+        resp = self.client.get("/api/v1/states")
+        self.assertEqual(resp.headers["X-Cache"], "MISS")
+        self.assertEqual(len(resp.get_json()), 2)
+        resp = self.client.get("/api/v1/stats")
+        self.assertEqual(resp.headers["X-Cache"], "MISS")
+        resp = self.client.get("/api/v1/amenities")
+        self.assertEqual(resp.headers["X-Cache"], "HIT")
+        models.storage.delete(self.state)
+        self.assertEqual(len(self.client.get("/api/v1/states").get_json()),
+                         1)
+
+    def test_conditional_hit(self):
+        """Test that a cached response still answers If-None-Match"""
+        etag = self.client.get("/api/v1/amenities").headers["ETag"]
+        resp = self.client.get("/api/v1/amenities",
+                               headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 304)
+
+    def test_errors_not_cached(self):
+        """Test that only successful responses are cached"""
+        url = "/api/v1/amenities/nope"
+        for _ in range(2):
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 404)
+            self.assertNotIn("X-Cache", resp.headers)
+        self.assertEqual(cache.misses, 2)
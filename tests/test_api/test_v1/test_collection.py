@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+"""
+Contains the TestCollectionDocs and TestCollection classes
+"""
+
+from api.v1.views import collection
+import base64
+from datetime import datetime, timedelta
+import json
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+import pep8
+import unittest
+from unittest.mock import patch
+from api.v1.app import app
+
+
+class TestCollectionDocs(unittest.TestCase):
+    """Tests to check the style of views/collection.py"""
+    def test_pep8_conformance_collection(self):
+        """Test that api/v1/views/collection.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'api/v1/views/collection.py',
+            'tests/test_api/test_v1/test_collection.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestCollection(unittest.TestCase):
+    """Test the pagination and projection of the list views"""
+    def setUp(self):
+        """Store five States created a second apart, and two Cities"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        start = datetime(2024, 1, 1)
+        self.states = [State(name="State {:d}".format(i),
+                             created_at=start + timedelta(seconds=i))
+                       for i in range(5)]
+        for state in reversed(self.states):
+            models.storage.new(state)
+        for name in ["Napa", "Fremont"]:
+            models.storage.new(City(name=name, state_id=self.states[0].id))
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.save
+
+    def test_no_limit(self):
+        """Test that the whole list comes in created_at order"""
+        resp = self.client.get("/api/v1/states")
+        self.assertEqual([s["id"] for s in resp.get_json()],
+                         [s.id for s in self.states])
+        self.assertNotIn("X-Next-Cursor", resp.headers)
+
+    def test_pages(self):
+        """Test that following X-Next-Cursor walks through every page"""
+        pages = []
+        url = "/api/v1/states?limit=2"
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            pages.append([s["name"] for s in resp.get_json()])
+            cursor = resp.headers.get("X-Next-Cursor")
+            url = cursor and "/api/v1/states?limit=2&cursor=" + cursor
+        self.assertEqual(pages, [["State 0", "State 1"],
+                                 ["State 2", "State 3"],
+                                 ["State 4"]])
+
+    def test_pages_see_new_objects(self):
+        """Test that an object created after the cursor is on a later page"""
+        resp = self.client.get("/api/v1/states?limit=2")
+        late = State(name="Late", created_at=datetime(2025, 1, 1))
+        models.storage.new(late)
+        models.storage.delete(self.states[2])
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = self.client.get("/api/v1/states?cursor=" + cursor)
+        self.assertEqual([s["name"] for s in resp.get_json()],
+                         ["State 3", "State 4", "Late"])
+
+    def test_fields(self):
+        """Test that fields keeps only the given attributes"""
+        resp = self.client.get("/api/v1/states?limit=1&fields=id,name,nope")
+        self.assertEqual(resp.get_json(), [{"id": self.states[0].id,
+                                            "name": "State 0"}])
+
+    def test_child_list(self):
+        """Test that the child lists are paginated too"""
+        url = "/api/v1/states/{}/cities?limit=1&fields=name".format(
+            self.states[0].id)
+        resp = self.client.get(url)
+        self.assertEqual(len(resp.get_json()), 1)
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = self.client.get(url + "&cursor=" + cursor)
+        self.assertEqual(len(resp.get_json()), 1)
+
+    def test_invalid_parameters(self):
+        """Test that a bad limit or cursor is a 400"""
+        for query in ["limit=0", "limit=-1", "limit=two", "cursor=nope",
+                      "cursor=bm9wZQ=="]:
+            resp = self.client.get("/api/v1/states?" + query)
+            self.assertEqual(resp.status_code, 400, query)
+
+    def test_cursor_types(self):
+        """Test that a cursor with an aware timestamp or an id which is not
+        a string is a 400"""
+        for position in (["2020-01-01T00:00:00.000000+00:00", "x"],
+                         ["2020-01-01T00:00:00.000000", 5],
+                         ["2020-01-01T00:00:00.000000", None]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps(position).encode()).decode()
+            resp = self.client.get("/api/v1/states?cursor=" + cursor)
+            self.assertEqual(resp.status_code, 400, position)
+
+    def test_stream(self):
+        """Test that stream=1 writes the same list as the plain response"""
+        with patch.object(collection, "STREAM_CHUNK", 2):
+            plain = self.client.get("/api/v1/states?fields=id,name")
+            streamed = self.client.get(
+                "/api/v1/states?fields=id,name&stream=1")
+        self.assertTrue(streamed.is_streamed)
+        self.assertEqual(streamed.get_json(), plain.get_json())
+
+    def test_stream_single_pass(self):
+        """Test that a streamed list, filtered or not, comes from a single
+        pass of the storage"""
+        url = "/api/v1/states/{}/cities".format(self.states[0].id)
+        plain = self.client.get(url).get_json()
+        self.assertEqual(len(plain), 2)
+        with patch.object(collection, "STREAM_CHUNK", 2), \
+                patch.object(models.storage, "page") as mock_page, \
+                patch.object(models.storage, "iterate",
+                             wraps=models.storage.iterate) as mock_iterate:
+            resp = self.client.get("/api/v1/states?stream=1")
+            self.assertEqual(len(resp.get_json()), 5)
+            resp = self.client.get(url + "?stream=1")
+            self.assertEqual(resp.get_json(), plain)
+        mock_page.assert_not_called()
+        self.assertEqual(mock_iterate.call_count, 2)
+
+    def test_ndjson(self):
+        """Test that NDJSON clients get one object per line"""
+        for limit in ["", "&limit=5"]:
+            resp = self.client.get("/api/v1/states?fields=name" + limit,
+                                   headers={"Accept": "application/x-ndjson"})
+            self.assertEqual(resp.mimetype, "application/x-ndjson")
+            lines = resp.get_data(as_text=True).splitlines()
+            self.assertEqual([json.loads(line) for line in lines],
+                             [{"name": s.name} for s in self.states])
+        self.assertIn("X-Next-Cursor", resp.headers)
+
+    def test_empty_stream(self):
+        """Test that an empty streamed list is still valid JSON"""
+        url = "/api/v1/states/{}/cities?stream=1".format(self.states[1].id)
+        self.assertEqual(self.client.get(url).get_json(), [])
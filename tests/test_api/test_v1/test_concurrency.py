@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Contains the TestConcurrentRequests class
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import models
+from models.engine.file_storage import FileStorage
+from models.state import State
+import pep8
+import threading
+import unittest
+from api.v1.app import app
+
+
+class TestConcurrencyDocs(unittest.TestCase):
+    """Tests to check the style of the concurrency tests"""
+    def test_pep8_conformance_test_concurrency(self):
+        """Test that tests/test_api/test_v1/test_concurrency.py conforms
+        to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_concurrency.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestConcurrentRequests(unittest.TestCase):
+    """Run many requests at once against the views and the FileStorage"""
+    workers = 32
+    rounds = 400
+
+    def round_trip(self, i):
+        """creates, reads, updates, lists and deletes one State, returning
+        the status codes seen along the way"""
+        client = app.test_client()
+        codes = []
+        resp = client.post("/api/v1/states",
+                           json={"name": "State {:d}".format(i)})
+        codes.append(resp.status_code)
+        state_id = resp.get_json()["id"]
+        url = "/api/v1/states/" + state_id
+        codes.append(client.get(url).status_code)
+        codes.append(client.put(url, json={"name": "S"}).status_code)
+        codes.append(client.get("/api/v1/states").status_code)
+        codes.append(client.get("/api/v1/stats").status_code)
+        codes.append(client.delete(url).status_code)
+        codes.append(client.get(url).status_code)
+        return codes
+
+    def test_concurrent_round_trips(self):
+        """Test that hundreds of concurrent requests all succeed"""
+        before = models.storage.count(State)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self.round_trip, range(self.rounds)))
+        for codes in results:
+            self.assertEqual(codes, [201, 200, 200, 200, 200, 200, 404])
+        self.assertEqual(models.storage.count(State), before)
+
+    def test_iterate_while_writing(self):
+        """Test that all(cls) can be walked while other threads write"""
+        storage = FileStorage()
+        stop = threading.Event()
+        errors = []
+
+        def writer():
+            """adds and deletes States until told to stop"""
+            while not stop.is_set():
+                state = State(name="Churn")
+                storage.new(state)
+                storage.delete(state)
+
+        def reader():
+            """walks the States many times over"""
+            try:
+                for _ in range(200):
+                    for key, state in storage.all(State).items():
+                        self.assertEqual(key, "State." + state.id)
+                    for key in storage.all(State):
+                        pass
+            except Exception as e:
+                errors.append(e)
+
+        writers = [threading.Thread(target=writer) for _ in range(4)]
+        readers = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in writers + readers:
+            thread.start()
+        for thread in readers:
+            thread.join()
+        stop.set()
+        for thread in writers:
+            thread.join()
+        self.assertEqual(errors, [])
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+from datetime import datetime
+import models
+from models.engine.file_storage import FileStorage
+from models.state import State
+import pep8
+import unittest
+from unittest.mock import patch
+from api.v1.app import app
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the style of views/conditional.py"""
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/views/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'api/v1/views/conditional.py',
+            'tests/test_api/test_v1/test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestConditional(unittest.TestCase):
+    """Test the ETag and Last-Modified validators of the GET views"""
+    def setUp(self):
+        """Store one State"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.state = State(name="California",
+                           updated_at=datetime(2024, 1, 1))
+        models.storage.new(self.state)
+        self.client = app.test_client()
+        self.url = "/api/v1/states/" + self.state.id
+
+    def tearDown(self):
+        """Restore the objects and file.json"""
+        FileStorage._FileStorage__objects = self.save
+        models.storage.save()
+
+    def test_object_if_none_match(self):
+        """Test that a matching ETag is a 304 that skips to_dict"""
+        resp = self.client.get(self.url)
+        etag = resp.headers["ETag"]
+        with patch.object(State, "to_dict") as mock_to_dict:
+            resp = self.client.get(self.url,
+                                   headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp.get_data(), b"")
+            self.assertFalse(mock_to_dict.called)
+        self.assertEqual(resp.headers["ETag"], etag)
+
+    def test_object_if_modified_since(self):
+        """Test that Last-Modified is the updated_at of the object"""
+        resp = self.client.get(self.url)
+        last_modified = resp.headers["Last-Modified"]
+        self.assertEqual(last_modified, "Mon, 01 Jan 2024 00:00:00 GMT")
+        with patch.object(State, "to_dict") as mock_to_dict:
+            resp = self.client.get(
+                self.url, headers={"If-Modified-Since": last_modified})
+            self.assertEqual(resp.status_code, 304)
+            self.assertFalse(mock_to_dict.called)
+
+    def test_object_changed(self):
+        """Test that an update gives the object a new ETag"""
+        etag = self.client.get(self.url).headers["ETag"]
+        self.client.put(self.url, json={"name": "Nevada"})
+        resp = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()["name"], "Nevada")
+        self.assertNotEqual(resp.headers["ETag"], etag)
+
+    def test_list_if_none_match(self):
+        """Test that a list is a 304 that skips to_dict until the class
+        changes"""
+        url = "/api/v1/states?limit=5"
+        etag = self.client.get(url).headers["ETag"]
+        with patch.object(State, "to_dict") as mock_to_dict:
+            resp = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 304)
+            self.assertFalse(mock_to_dict.called)
+        other = self.client.get(url + "&fields=name").headers["ETag"]
+        self.assertNotEqual(other, etag)
+        models.storage.new(State(name="Nevada"))
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.get_json()), 2)
+
+    def test_list_changed_by_delete(self):
+        """Test that deleting an object changes the list ETag"""
+        url = "/api/v1/states"
+        etag = self.client.get(url).headers["ETag"]
+        models.storage.delete(self.state)
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), [])
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestIndex classes
+"""
+
+from api.v1 import app as app_module
+from api.v1.views import index
+from models.state import State
+import pep8
+import unittest
+from unittest.mock import patch
+app = app_module.app
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of views/index.py"""
+    def test_pep8_conformance_index(self):
+        """Test that api/v1/views/index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/index.py',
+                                    'tests/test_api/test_v1/test_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestIndex(unittest.TestCase):
+    """Test the /status and /stats routes"""
+    def setUp(self):
+        """empty the /stats cache"""
+        index.stats_cache["expires"] = 0
+
+    def test_stats(self):
+        """Test that /stats reports the number of objects of each class"""
+        client = app.test_client()
+        stats = client.get("/api/v1/stats").get_json()
+        self.assertEqual(sorted(stats), ["amenities", "cities", "places",
+                                         "reviews", "states", "users"])
+        self.assertEqual(stats["states"], app_module.storage.count(State))
+
+    def test_stats_single_call(self):
+        """Test that /stats asks the storage for all counts at once"""
+        client = app.test_client()
+        with patch.object(app_module.storage, "counts",
+                          wraps=app_module.storage.counts) as mock_counts:
+            client.get("/api/v1/stats")
+            self.assertEqual(mock_counts.call_count, 1)
+            self.assertEqual(len(mock_counts.call_args[0]), 6)
+
+    def test_stats_ttl(self):
+        """Test that /stats serves the cached counts during the TTL"""
+        client = app.test_client()
+        with patch.object(index, "STATS_TTL", 60), \
+                patch.object(app_module.storage, "counts",
+                             wraps=app_module.storage.counts) as mock_counts:
+            client.get("/api/v1/stats")
+            client.get("/api/v1/stats")
+            self.assertEqual(mock_counts.call_count, 1)
+        with patch.object(app_module.storage, "counts",
+                          wraps=app_module.storage.counts) as mock_counts:
+            client.get("/api/v1/stats")
+            client.get("/api/v1/stats")
+            self.assertEqual(mock_counts.call_count, 2)
+
+    def test_stats_no_lock_without_ttl(self):
+        """Test that /stats requests do not wait on each other without
+        a TTL"""
+        client = app.test_client()
+        with patch.object(index, "stats_lock") as mock_lock:
+            client.get("/api/v1/stats")
+            self.assertFalse(mock_lock.__enter__.called)
@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceIndexDocs, TestPlaceIndex and TestPlaceRanges classes
+"""
+
+from api.v1 import place_index
+from api.v1.app import app
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest.mock import patch
+
+
+class TestPlaceIndexDocs(unittest.TestCase):
+    """Tests to check the style of place_index.py"""
+    def test_pep8_conformance_place_index(self):
+        """Test that api/v1/place_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'api/v1/place_index.py',
+            'tests/test_api/test_v1/test_place_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestPlaceIndex(unittest.TestCase):
+    """Test the PlaceIndex class"""
+    def setUp(self):
+        """Store three places"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.index = place_index.PlaceIndex(models.storage)
+        self.cheap = Place(name="Cheap", price_by_night=40, max_guest=2,
+                           latitude=37.7, longitude=-122.4)
+        self.loft = Place(name="Loft", price_by_night=150, max_guest=4,
+                          latitude=34.0, longitude=-118.2)
+        self.villa = Place(name="Villa", price_by_night=900, max_guest=12,
+                           latitude=36.1, longitude=-115.1)
+        for place in (self.cheap, self.loft, self.villa):
+            models.storage.new(place)
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.save
+
+    def search(self, ranges):
+        """returns the sorted names of the places within ranges"""
+        return sorted(models.storage.get(Place, place_id).name
+                      for place_id in self.index.search(ranges))
+
+    def test_search(self):
+        """Test bounds on one and several attributes"""
+        self.assertEqual(self.search({}), ["Cheap", "Loft", "Villa"])
+        self.assertEqual(self.search({"price_by_night": (40, 150)}),
+                         ["Cheap", "Loft"])
+        self.assertEqual(self.search({"max_guest": (4, None)}),
+                         ["Loft", "Villa"])
+        box = {"latitude": (33, 37), "longitude": (-120, -110)}
+        self.assertEqual(self.search(box), ["Loft", "Villa"])
+        box["price_by_night"] = (None, 500)
+        self.assertEqual(self.search(box), ["Loft"])
+
+    def test_search_without_numpy(self):
+        """Test the stdlib fallback gives the same results"""
+        with patch.object(place_index, "numpy", None):
+            index = place_index.PlaceIndex(models.storage)
+            ids = index.search({"price_by_night": (100, None)})
+        self.assertEqual(ids, {self.loft.id, self.villa.id})
+
+    def test_follows_changes(self):
+        """Test that the index is rebuilt after a place changes"""
+        self.assertEqual(self.search({"max_guest": (10, None)}), ["Villa"])
+        self.loft.max_guest = 10
+        models.storage.new(self.loft)
+        self.assertEqual(self.search({"max_guest": (10, None)}),
+                         ["Loft", "Villa"])
+        models.storage.delete(self.villa)
+        self.assertEqual(self.search({"max_guest": (10, None)}), ["Loft"])
+
+    def test_updates_rows(self):
+        """Test that a change updates the row of the place instead of
+        reading every place again"""
+        for numpy in (place_index.numpy, None):
+            with patch.object(place_index, "numpy", numpy):
+                index = place_index.PlaceIndex(models.storage)
+                ranges = {"price_by_night": (100, 900)}
+                self.assertEqual(index.search(ranges),
+                                 {self.loft.id, self.villa.id})
+                with patch.object(models.storage, "all") as all_places:
+                    self.cheap.price_by_night = 300
+                    models.storage.new(self.cheap)
+                    models.storage.delete(self.villa)
+                    house = Place(name="House", price_by_night=100)
+                    models.storage.new(house)
+                    self.assertEqual(index.search(ranges),
+                                     {self.cheap.id, self.loft.id, house.id})
+                    self.assertEqual(index.search({}),
+                                     {self.cheap.id, self.loft.id, house.id})
+                    all_places.assert_not_called()
+                models.storage.new(self.villa)
+                self.cheap.price_by_night = 40
+                models.storage.new(self.cheap)
+                models.storage.delete(house)
+
+    def test_not_a_number(self):
+        """Test that a value which is not a number is in no range"""
+        self.cheap.price_by_night = "free"
+        models.storage.new(self.cheap)
+        self.assertEqual(self.search({"price_by_night": (None, None)}),
+                         ["Loft", "Villa"])
+        self.assertEqual(self.search({"max_guest": (None, None)}),
+                         ["Cheap", "Loft", "Villa"])
+
+    def test_ranges_of(self):
+        """Test that bounds are read from <field>_min and <field>_max"""
+        self.assertEqual(place_index.ranges_of({"max_guest_min": "4",
+                                                "latitude_max": 1.5,
+                                                "other": "x"}),
+                         {"max_guest": (4.0, None),
+                          "latitude": (None, 1.5)})
+        with self.assertRaises(ValueError):
+            place_index.ranges_of({"price_by_night_max": "cheap"})
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestPlaceRanges(unittest.TestCase):
+    """Test the numeric bounds of the place views"""
+    def setUp(self):
+        """Store a city with two places and another with one"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="California")
+        self.sf = City(name="San Francisco", state_id=state.id)
+        la = City(name="Los Angeles", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        self.places = [
+            Place(name="Loft", city_id=self.sf.id, user_id=user.id,
+                  price_by_night=150, max_guest=4),
+            Place(name="Room", city_id=self.sf.id, user_id=user.id,
+                  price_by_night=60, max_guest=1),
+            Place(name="Villa", city_id=la.id, user_id=user.id,
+                  price_by_night=900, max_guest=12)]
+        for obj in [state, self.sf, la, user] + self.places:
+            models.storage.new(obj)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Restore the objects and file.json"""
+        FileStorage._FileStorage__objects = self.save
+        models.storage.save()
+
+    def test_city_places(self):
+        """Test the bounds of GET /cities/<city_id>/places"""
+        url = "/api/v1/cities/{}/places".format(self.sf.id)
+        resp = self.client.get(url + "?price_by_night_min=100")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p["name"] for p in resp.get_json()], ["Loft"])
+        resp = self.client.get(url + "?max_guest_min=1&max_guest_max=4")
+        self.assertEqual(sorted(p["name"] for p in resp.get_json()),
+                         ["Loft", "Room"])
+        resp = self.client.get(url + "?max_guest_min=5")
+        self.assertEqual(resp.get_json(), [])
+
+    def test_places_search(self):
+        """Test the bounds of POST /places_search"""
+        resp = self.client.post("/api/v1/places_search",
+                                json={"max_guest_min": 4})
+        self.assertEqual(sorted(p["name"] for p in resp.get_json()),
+                         ["Loft", "Villa"])
+        resp = self.client.post("/api/v1/places_search",
+                                json={"cities": [self.sf.id],
+                                      "price_by_night_max": 100})
+        self.assertEqual([p["name"] for p in resp.get_json()], ["Room"])
+
+    def test_invalid_bound(self):
+        """Test that a bound which is not a number is a 400"""
+        url = "/api/v1/cities/{}/places".format(self.sf.id)
+        resp = self.client.get(url + "?price_by_night_min=cheap")
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post("/api/v1/places_search",
+                                json={"latitude_min": [1]})
+        self.assertEqual(resp.status_code, 400)
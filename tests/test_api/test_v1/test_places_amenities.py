@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesAmenitiesDocs and TestPlacesAmenities classes
+"""
+
+import models
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import pep8
+import unittest
+from api.v1.app import app
+
+
+class TestPlacesAmenitiesDocs(unittest.TestCase):
+    """Tests to check the style of views/places_amenities.py"""
+    def test_pep8_conformance_places_amenities(self):
+        """Test that api/v1/views/places_amenities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'api/v1/views/places_amenities.py',
+            'tests/test_api/test_v1/test_places_amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestPlacesAmenities(unittest.TestCase):
+    """Test the /api/v1/places/<place_id>/amenities views"""
+    def setUp(self):
+        """Store a place and two amenities, one of them linked"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.wifi = Amenity(name="Wifi")
+        self.pool = Amenity(name="Pool")
+        self.place = Place(name="Loft", amenity_ids=[self.wifi.id])
+        for obj in (self.wifi, self.pool, self.place):
+            models.storage.new(obj)
+        self.client = app.test_client()
+        self.url = "/api/v1/places/{}/amenities".format(self.place.id)
+
+    def tearDown(self):
+        """Restore the objects and file.json"""
+        FileStorage._FileStorage__objects = self.save
+        models.storage.save()
+
+    def names(self):
+        """returns the names of the amenities listed for the place"""
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return sorted(amenity["name"] for amenity in resp.get_json())
+
+    def test_get(self):
+        """Test that the linked amenities are listed"""
+        self.assertEqual(self.names(), ["Wifi"])
+        resp = self.client.get("/api/v1/places/nope/amenities")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_post(self):
+        """Test that POST links once: 201, then 200"""
+        url = self.url + "/" + self.pool.id
+        resp = self.client.post(url)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.get_json()["id"], self.pool.id)
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(self.names(), ["Pool", "Wifi"])
+        found = models.storage.linked(Place, "amenities", [self.pool.id])
+        self.assertEqual(list(found.values()), [self.place])
+        resp = self.client.post(self.url + "/nope")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_delete(self):
+        """Test that DELETE unlinks, and 404s when not linked"""
+        url = self.url + "/" + self.wifi.id
+        resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), {})
+        self.assertEqual(self.names(), [])
+        self.assertEqual(self.client.delete(url).status_code, 404)
+        resp = self.client.delete(self.url + "/" + self.pool.id)
+        self.assertEqual(resp.status_code, 404)
+
+    def test_delete_after_change_in_place(self):
+        """Test that DELETE goes by amenity_ids when the list was changed
+        in place: 404 for an id taken out, not a 500"""
+        self.place.amenity_ids.remove(self.wifi.id)
+        resp = self.client.delete(self.url + "/" + self.wifi.id)
+        self.assertEqual(resp.status_code, 404)
+        self.place.amenity_ids.append(self.pool.id)
+        self.assertEqual(self.client.post(self.url + "/" +
+                                          self.pool.id).status_code, 200)
+        self.assertEqual(self.place.amenity_ids, [self.pool.id])
+        resp = self.client.delete(self.url + "/" + self.pool.id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.place.amenity_ids, [])
+
+    def test_link_changes_etag(self):
+        """Test that linking and unlinking make the ETag of the place
+        stale"""
+        place_url = "/api/v1/places/" + self.place.id
+        for method, amenity in (("post", self.pool), ("delete", self.wifi)):
+            etag = self.client.get(place_url).headers["ETag"]
+            getattr(self.client, method)(self.url + "/" + amenity.id)
+            resp = self.client.get(place_url,
+                                   headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.get_json()["amenity_ids"],
+                             self.place.amenity_ids)
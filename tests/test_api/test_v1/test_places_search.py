@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesSearchDocs and TestPlacesSearch classes
+"""
+
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from api.v1.app import app
+
+
+class TestPlacesSearchDocs(unittest.TestCase):
+    """Tests to check the style of views/places.py"""
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files([
+            'api/v1/views/places.py',
+            'tests/test_api/test_v1/test_places_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestPlacesSearch(unittest.TestCase):
+    """Test the POST /api/v1/places_search view"""
+    def setUp(self):
+        """Store two states with a city each and three places"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.wifi = Amenity(name="Wifi")
+        self.pool = Amenity(name="Pool")
+        self.ca = State(name="California")
+        self.nv = State(name="Nevada")
+        self.sf = City(name="San Francisco", state_id=self.ca.id)
+        self.la = City(name="Los Angeles", state_id=self.ca.id)
+        self.lv = City(name="Las Vegas", state_id=self.nv.id)
+        user = User(email="a@b.c", password="pwd")
+        self.loft = Place(name="Loft", city_id=self.sf.id, user_id=user.id,
+                          amenity_ids=[self.wifi.id, self.pool.id])
+        self.flat = Place(name="Flat", city_id=self.la.id, user_id=user.id,
+                          amenity_ids=[self.wifi.id])
+        self.suite = Place(name="Suite", city_id=self.lv.id,
+                           user_id=user.id, amenity_ids=[self.pool.id])
+        for obj in (self.wifi, self.pool, self.ca, self.nv, self.sf,
+                    self.la, self.lv, user, self.loft, self.flat,
+                    self.suite):
+            models.storage.new(obj)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Restore the objects and file.json"""
+        FileStorage._FileStorage__objects = self.save
+        models.storage.save()
+
+    def search(self, body):
+        """returns the names of the places found for body"""
+        resp = self.client.post("/api/v1/places_search", json=body)
+        self.assertEqual(resp.status_code, 200)
+        return sorted(place["name"] for place in resp.get_json())
+
+    def test_empty(self):
+        """Test that no list, or only empty ones, finds every place"""
+        self.assertEqual(self.search({}), ["Flat", "Loft", "Suite"])
+        self.assertEqual(self.search({"states": [], "cities": []}),
+                         ["Flat", "Loft", "Suite"])
+
+    def test_states(self):
+        """Test that states finds the places of all their cities"""
+        self.assertEqual(self.search({"states": [self.ca.id]}),
+                         ["Flat", "Loft"])
+
+    def test_cities(self):
+        """Test that cities finds their places"""
+        self.assertEqual(self.search({"cities": [self.lv.id]}), ["Suite"])
+
+    def test_states_and_cities(self):
+        """Test that states and cities add up"""
+        body = {"states": [self.nv.id], "cities": [self.sf.id]}
+        self.assertEqual(self.search(body), ["Loft", "Suite"])
+
+    def test_amenities(self):
+        """Test that amenities keeps the places having all of them"""
+        self.assertEqual(self.search({"amenities": [self.wifi.id]}),
+                         ["Flat", "Loft"])
+        body = {"amenities": [self.wifi.id, self.pool.id]}
+        self.assertEqual(self.search(body), ["Loft"])
+        body = {"states": [self.nv.id], "amenities": [self.wifi.id]}
+        self.assertEqual(self.search(body), [])
+
+    def test_amenity_change(self):
+        """Test that the index follows a change of amenity_ids"""
+        self.suite.amenity_ids = [self.wifi.id]
+        self.assertEqual(self.search({"amenities": [self.wifi.id]}),
+                         ["Flat", "Loft", "Suite"])
+
+    def test_not_json(self):
+        """Test that a body which is not a JSON object is a 400"""
+        resp = self.client.post("/api/v1/places_search", data="states")
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post("/api/v1/places_search", json=[])
+        self.assertEqual(resp.status_code, 400)
+
+    def test_invalid_lists(self):
+        """Test that lists of something other than ids are a 400"""
+        for body in ({"states": [{}]}, {"cities": "x"},
+                     {"amenities": [["x"]]}, {"states": [1]}):
+            resp = self.client.post("/api/v1/places_search", json=body)
+            self.assertEqual(resp.status_code, 400, body)
@@ -158,3 +158,111 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_time_format(self):
+        """Test that format_time and parse_time match strftime/strptime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in [datetime(2024, 1, 2, 3, 4, 5, 60708),
+                      datetime(2024, 1, 2, 3, 4, 5)]:
+            string = value.strftime(t_format)
+            self.assertEqual(models.base_model.format_time(value), string)
+            self.assertEqual(models.base_model.parse_time(string), value)
+            self.assertEqual(datetime.strptime(string, t_format), value)
+
+    def test_to_dict_follows_updated_at(self):
+        """Test that to_dict formats the current updated_at"""
+        inst = BaseModel()
+        inst_dict = inst.to_dict()
+        self.assertEqual(inst_dict["updated_at"], inst_dict["created_at"])
+        inst.updated_at = datetime(2024, 1, 1)
+        self.assertEqual(inst.to_dict()["updated_at"],
+                         "2024-01-01T00:00:00.000000")
+
+    def test_kwargs_setters(self):
+        """Test that kwargs go through the properties of the class"""
+        class Named(BaseModel):
+            """model with a property"""
+            @property
+            def name(self):
+                """getter attribute returns the name"""
+                return self.__dict__["_name"]
+
+            @name.setter
+            def name(self, value):
+                """setter attribute stores the name in uppercase"""
+                self.__dict__["_name"] = value.upper()
+        inst = Named(name="bob", other=1)
+        self.assertEqual(inst.name, "BOB")
+        self.assertEqual(inst.other, 1)
+        self.assertNotIn("__class__", Named(**inst.to_dict()).__dict__)
+
+    def test_kwargs_shared_timestamp(self):
+        """Test that equal timestamps make a single datetime"""
+        inst = BaseModel(**BaseModel().to_dict())
+        self.assertIs(inst.created_at, inst.updated_at)
+        record = inst.to_dict()
+        record["updated_at"] = "2030-01-01T00:00:00.000000"
+        inst = BaseModel(**record)
+        self.assertIsNot(inst.created_at, inst.updated_at)
+        self.assertLess(inst.created_at, inst.updated_at)
+
+    def test_timestamp_microseconds(self):
+        """Test that the timestamp columns keep microseconds in MySQL"""
+        from sqlalchemy.dialects import mysql, sqlite
+        timestamp = models.base_model.Timestamp
+        self.assertEqual(timestamp.compile(dialect=mysql.dialect()),
+                         "DATETIME(6)")
+        self.assertEqual(timestamp.compile(dialect=sqlite.dialect()),
+                         "DATETIME")
+
+
+@unittest.skipIf(not models.base_model.compact, "not testing compact models")
+class TestCompact(unittest.TestCase):
+    """Test the slotted models of HBNB_FILE_COMPACT=1"""
+
+    def test_no_instance_dict(self):
+        """Test that the attributes are slots, not a dict"""
+        from models.place import Place
+        place = Place(name="Loft", city_id="1")
+        for inst in [BaseModel(), place]:
+            self.assertEqual(type(inst).__dictoffset__, 0)
+        self.assertIn("city_id", Place.__slots__)
+        self.assertIn("name", Place.__slots__)
+
+    def test_defaults(self):
+        """Test that an unset attribute reads as the class default and is
+        not in to_dict"""
+        from models.place import Place
+        place = Place(name="Loft")
+        self.assertEqual(place.number_rooms, 0)
+        self.assertEqual(place.city_id, "")
+        self.assertNotIn("number_rooms", place.to_dict())
+        place.amenity_ids.append("1")
+        self.assertEqual(place.amenity_ids, ["1"])
+        self.assertEqual(Place().amenity_ids, [])
+        with self.assertRaises(AttributeError):
+            place.missing
+
+    def test_undeclared_attributes(self):
+        """Test that the attributes the model does not declare are kept"""
+        inst = BaseModel(other=1)
+        inst.name = "Bob"
+        self.assertEqual(inst.other, 1)
+        self.assertEqual(inst.name, "Bob")
+        inst_dict = inst.to_dict()
+        self.assertEqual(inst_dict["other"], 1)
+        self.assertEqual(inst_dict["name"], "Bob")
+        self.assertIn("'name': 'Bob'", str(inst))
+        self.assertEqual(BaseModel(**inst_dict).to_dict(), inst_dict)
+
+    def test_dict_writes_through(self):
+        """Test that __dict__ reads and writes the attributes"""
+        inst = BaseModel()
+        attrs = inst.__dict__
+        self.assertEqual(attrs["id"], inst.id)
+        attrs["id"] = "1"
+        attrs["other"] = 2
+        self.assertEqual((inst.id, inst.other), ("1", 2))
+        del attrs["other"]
+        self.assertFalse(hasattr(inst, "other"))
+        self.assertEqual(set(attrs), {"id", "created_at", "updated_at"})
@@ -139,3 +139,214 @@ class Test_DBStorage(unittest.TestCase):
 
         # Assert the expected behavior
         self.assertEqual(count, 5)
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_get_by_primary_key(self):
+        """Test that get finds one row by id without loading the table"""
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertIs(models.storage.get("State", state.id), state)
+        self.assertIsNone(models.storage.get(State, "no such id"))
+        with patch.object(DBStorage, "all") as mock_all:
+            models.storage.get(State, state.id)
+            self.assertFalse(mock_all.called)
+        models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_all_preload(self):
+        """Test that all(cls, preload) loads the relationships along, in
+        a number of queries that does not grow with the rows"""
+        from sqlalchemy import event
+        states = [State(name="State {:d}".format(i)) for i in range(5)]
+        for state in states:
+            models.storage.new(state)
+            models.storage.new(City(name="City", state_id=state.id))
+        models.storage.save()
+        models.storage.close()
+        queries = []
+
+        def count(*args):
+            """records one query"""
+            queries.append(args)
+
+        engine = models.storage._DBStorage__engine
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            loaded = models.storage.all(State, preload=["cities"])
+            for state in loaded.values():
+                self.assertEqual(len(state.cities), 1)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(len(queries), 2)
+        for state in loaded.values():
+            for city in state.cities:
+                models.storage.delete(city)
+            models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_page(self):
+        """Test that page walks the rows in (created_at, id) order"""
+        states = [State(name="State", created_at=datetime(2000, 1, i))
+                  for i in (3, 1, 2)]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        ordered = [states[1], states[2], states[0]]
+        self.assertEqual(models.storage.page(State, limit=2,
+                                             name="State"), ordered[:2])
+        after = (ordered[1].created_at, ordered[1].id)
+        self.assertEqual(models.storage.page(State, after=after,
+                                             name="State"), ordered[2:])
+        with patch.object(db_storage, "CHUNK", 2):
+            self.assertEqual(list(models.storage.iterate(State,
+                                                         name="State")),
+                             ordered)
+        models.storage.close()
+        page = models.storage.page(State, limit=1, fields=["name"])
+        self.assertEqual(page[0].id, ordered[0].id)
+        self.assertNotIn("updated_at", page[0].__dict__)
+        for state in states:
+            models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_version(self):
+        """Test that the version of a class changes with its rows"""
+        before = models.storage.version(State)
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        added = models.storage.version(State)
+        self.assertNotEqual(added, before)
+        # within the same second as the insert
+        state.save()
+        self.assertNotEqual(models.storage.version(State), added)
+        self.assertEqual(models.storage.version(State, name="Nowhere"),
+                         ((0, None), None))
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertEqual(models.storage.version(State), before)
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_filter(self):
+        """Test that filter returns the rows matching all criteria"""
+        state = State(name="California")
+        other = State(name="Nevada")
+        cities = [City(name="Fremont", state_id=state.id),
+                  City(name="Reno", state_id=other.id)]
+        for obj in [state, other] + cities:
+            models.storage.new(obj)
+        models.storage.save()
+        self.assertEqual(models.storage.filter(City, state_id=state.id),
+                         {"City." + cities[0].id: cities[0]})
+        found = models.storage.filter("City",
+                                      state_id=[state.id, other.id],
+                                      name="Reno")
+        self.assertEqual(list(found.values()), [cities[1]])
+        for obj in cities + [state, other]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_filter_between(self):
+        """Test that a Between criteria value matches its range"""
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        places = [Place(name=name, city_id=city.id, user_id=user.id,
+                        price_by_night=price)
+                  for name, price in [("Room", 60), ("Loft", 150),
+                                      ("Villa", 900)]]
+        for obj in [state, city, user] + places:
+            models.storage.new(obj)
+        models.storage.save()
+        for low, high, names in [(60, 150, ["Loft", "Room"]),
+                                 (100, None, ["Loft", "Villa"]),
+                                 (None, 100, ["Room"]),
+                                 (None, None, ["Loft", "Room", "Villa"])]:
+            found = models.storage.filter(
+                Place, city_id=city.id,
+                price_by_night=db_storage.Between(low, high))
+            self.assertEqual(sorted(p.name for p in found.values()), names)
+        for obj in places + [user, city, state]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_linked(self):
+        """Test that linked keeps the rows linked to every id"""
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        loft = Place(name="Loft", city_id=city.id, user_id=user.id)
+        flat = Place(name="Flat", city_id=city.id, user_id=user.id)
+        loft.amenities.extend([wifi, pool])
+        flat.amenities.append(wifi)
+        for obj in [state, city, user, wifi, pool, loft, flat]:
+            models.storage.new(obj)
+        models.storage.save()
+        found = models.storage.linked(Place, "amenities", [wifi.id],
+                                      city_id=city.id)
+        self.assertEqual(set(found.values()), {loft, flat})
+        found = models.storage.linked(Place, "amenities", [wifi.id, pool.id])
+        self.assertEqual(list(found.values()), [loft])
+        self.assertFalse(models.storage.link(flat, "amenities", wifi))
+        before = flat.updated_at
+        self.assertTrue(models.storage.link(flat, "amenities", pool))
+        self.assertGreater(flat.updated_at, before)
+        self.assertTrue(models.storage.unlink(loft, "amenities", pool))
+        self.assertFalse(models.storage.unlink(loft, "amenities", pool))
+        models.storage.save()
+        found = models.storage.linked(Place, "amenities", [pool.id])
+        self.assertEqual(list(found.values()), [flat])
+        for obj in [loft, flat, wifi, pool, user, city, state]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_new_all(self):
+        """Test that new_all inserts the rows and links of the objects"""
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        wifi = Amenity(name="Wifi")
+        place = Place(name="Loft", city_id=city.id, user_id=user.id,
+                      amenity_ids=[wifi.id])
+        changes = []
+        models.storage.subscribe(lambda name, key: changes.append(name))
+        models.storage.new_all([state, city, user, wifi, place])
+        models.storage.save()
+        self.assertIn("Place", changes)
+        models.storage.close()
+        found = models.storage.get(Place, place.id)
+        self.assertEqual(found.name, "Loft")
+        self.assertEqual([amenity.id for amenity in found.amenities],
+                         [wifi.id])
+        for cls, obj_id in [(Place, place.id), (Amenity, wifi.id),
+                            (User, user.id), (City, city.id),
+                            (State, state.id)]:
+            models.storage.delete(models.storage.get(cls, obj_id))
+        models.storage.save()
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_count_without_loading(self):
+        """Test that count and counts answer without loading the rows"""
+        before = models.storage.counts(State, "City")
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        with patch.object(DBStorage, "all") as mock_all:
+            self.assertEqual(models.storage.count(State),
+                             before["State"] + 1)
+            self.assertEqual(models.storage.counts(State, "City"),
+                             {"State": before["State"] + 1,
+                              "City": before["City"]})
+            self.assertFalse(mock_all.called)
+        models.storage.delete(state)
+        models.storage.save()
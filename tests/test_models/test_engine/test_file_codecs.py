@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+Contains the TestFileCodecsDocs and TestFileCodecs classes
+"""
+
+import inspect
+import json
+import marshal
+import models
+from models.engine import file_codecs
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import unittest
+BinaryCodec = file_codecs.BinaryCodec
+JSONCodec = file_codecs.JSONCodec
+
+
+class TestFileCodecsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of file_codecs.py"""
+    def test_pep8_conformance_file_codecs(self):
+        """Test that models/engine/file_codecs.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/file_codecs.py',
+                                    'tests/test_models/test_engine/\
+test_file_codecs.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_file_codecs_module_docstring(self):
+        """Test for the file_codecs.py module docstring"""
+        self.assertIsNot(file_codecs.__doc__, None,
+                         "file_codecs.py needs a docstring")
+
+    def test_codecs_func_docstrings(self):
+        """Test for the presence of docstrings in the codecs methods"""
+        for codec in [JSONCodec, BinaryCodec]:
+            for func in inspect.getmembers(codec, inspect.isroutine):
+                if func[0].startswith("__"):
+                    continue
+                with self.subTest(codec=codec, function=func[0]):
+                    self.assertIsNot(func[1].__doc__, None)
+
+
+class TestFileCodecs(unittest.TestCase):
+    """Test the JSON and binary codecs"""
+    def setUp(self):
+        """Build a few objects to encode"""
+        state = State(name="California")
+        place = Place(name="Loft", price_by_night=120, latitude=37.77)
+        self.objects = {"State." + state.id: state,
+                        "Place." + place.id: place}
+
+    def test_json_matches_to_dict(self):
+        """Test that the JSON codec writes to_dict() of every object"""
+        data = JSONCodec.encode(self.objects)
+        expected = {k: v.to_dict() for k, v in self.objects.items()}
+        self.assertEqual(json.loads(data), expected)
+        self.assertEqual(JSONCodec.decode(data), expected)
+
+    def test_binary_round_trip(self):
+        """Test that the binary codec gives back the same attributes, with
+        datetime timestamps"""
+        data = BinaryCodec.encode(self.objects)
+        decoded = BinaryCodec.decode(data)
+        self.assertEqual(set(decoded), set(self.objects))
+        for key, obj in self.objects.items():
+            attrs = dict(obj.__dict__, __class__=obj.__class__.__name__)
+            attrs.pop("_sa_instance_state", None)
+            self.assertEqual(decoded[key], attrs)
+            rebuilt = type(obj)(**decoded[key])
+            self.assertEqual(rebuilt.to_dict(), obj.to_dict())
+
+    def test_binary_is_smaller(self):
+        """Test that the binary file is smaller than the JSON one"""
+        self.assertLess(len(BinaryCodec.encode(self.objects)),
+                        len(JSONCodec.encode(self.objects)))
+
+    def test_sniff(self):
+        """Test that sniff tells the codecs apart"""
+        self.assertIs(file_codecs.sniff(BinaryCodec.encode(self.objects)),
+                      BinaryCodec)
+        self.assertIs(file_codecs.sniff(JSONCodec.encode(self.objects)),
+                      JSONCodec)
+
+    def test_binary_other_marshal_version(self):
+        """Test that a file from another marshal version is refused"""
+        data = bytearray(BinaryCodec.encode(self.objects))
+        data[len(BinaryCodec.magic)] = marshal.version + 1
+        with self.assertRaises(ValueError):
+            BinaryCodec.decode(bytes(data))
+
+    def test_convert(self):
+        """Test that convert rewrites a file with another codec"""
+        with open("codec_test.json", "wb") as f:
+            f.write(JSONCodec.encode(self.objects))
+        try:
+            count = file_codecs.convert("codec_test.json", "codec_test.hbnb")
+            self.assertEqual(count, 2)
+            with open("codec_test.hbnb", "rb") as f:
+                decoded = BinaryCodec.decode(f.read())
+            self.assertEqual(set(decoded), set(self.objects))
+        finally:
+            for path in ["codec_test.json", "codec_test.hbnb"]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_file_storage_binary(self):
+        """Test that FileStorage saves and reloads with the binary codec"""
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = dict(self.objects)
+        storage = FileStorage()
+        storage._FileStorage__codec = BinaryCodec
+        storage._FileStorage__file_path = "file.hbnb"
+        try:
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            for key, obj in self.objects.items():
+                self.assertEqual(storage.all()[key].to_dict(), obj.to_dict())
+        finally:
+            FileStorage._FileStorage__objects = save
+            os.remove("file.hbnb")
@@ -17,7 +17,9 @@ from models.user import User
 import json
 import os
 import pep8
+import time
 import unittest
+from unittest.mock import patch
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -150,3 +152,653 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(num_objects, 2)
 
         FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_counts(self):
+        """Test that counts returns the number of objects of each class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        storage.new(State())
+        storage.new(City())
+        storage.new(City())
+        self.assertEqual(storage.counts(State, "City", User),
+                         {"State": 1, "City": 2, "User": 0})
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_all_cls_only_returns_cls(self):
+        """Test that all(cls) only returns objects of cls, by class or name"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(dict(storage.all(State)),
+                         {"State." + state.id: state})
+        self.assertEqual(dict(storage.all("City")),
+                         {"City." + city.id: city})
+        self.assertEqual(len(storage.all(User)), 0)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_index_follows_delete(self):
+        """Test that get, count and all(cls) stop seeing deleted objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertEqual(storage.count(State), 1)
+        storage.delete(state)
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertEqual(storage.count(State), 0)
+        self.assertNotIn("State." + state.id, storage.all(State))
+        self.assertEqual(storage.count(), 0)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_close_skips_unchanged_file(self):
+        """Test that close only reloads when file.json changed on disk"""
+        storage = FileStorage()
+        storage.save()
+        with patch.object(FileStorage, "reload") as mock_reload:
+            storage.close()
+            self.assertFalse(mock_reload.called)
+            with open("file.json", "a") as f:
+                f.write(" ")
+            storage.close()
+            self.assertTrue(mock_reload.called)
+        storage.reload()
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_filter(self):
+        """Test that filter returns the objects matching all criteria"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        cities = [City(name="Fremont", state_id="1"),
+                  City(name="Napa", state_id="1"),
+                  City(name="Reno", state_id="2")]
+        for city in cities:
+            storage.new(city)
+        found = storage.filter(City, state_id="1")
+        self.assertEqual(list(found.values()), cities[:2])
+        found = storage.filter("City", state_id=["1", "2"], name="Reno")
+        self.assertEqual(list(found.values()), [cities[2]])
+        self.assertEqual(storage.filter(City, name="Napa"),
+                         {"City." + cities[1].id: cities[1]})
+        self.assertEqual(storage.filter(City, state_id="3"), {})
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_filter_follows_changes(self):
+        """Test that filter sees saved and deleted objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        city = City(name="Fremont", state_id="1")
+        storage.new(city)
+        city.state_id = "2"
+        storage.new(city)
+        self.assertEqual(storage.filter(City, state_id="1"), {})
+        self.assertEqual(list(storage.filter(City, state_id="2").values()),
+                         [city])
+        storage.delete(city)
+        self.assertEqual(storage.filter(City, state_id="2"), {})
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_page(self):
+        """Test that page walks the objects in (created_at, id) order"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State(created_at=datetime(2024, 1, i)) for i in (3, 1, 2)]
+        for state in states:
+            storage.new(state)
+        ordered = [states[1], states[2], states[0]]
+        self.assertEqual(storage.page(State), ordered)
+        self.assertEqual(storage.page(State, limit=2), ordered[:2])
+        after = (ordered[0].created_at, ordered[0].id)
+        self.assertEqual(storage.page(State, after=after), ordered[1:])
+        first = State(created_at=datetime(2023, 1, 1))
+        storage.new(first)
+        storage.delete(states[2])
+        self.assertEqual(storage.page(State, limit=2),
+                         [first, states[1]])
+        self.assertEqual(storage.page(State, after=after), [states[0]])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_page_criteria(self):
+        """Test that page only returns the objects matching criteria"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        cities = [City(state_id="1", created_at=datetime(2024, 1, i))
+                  for i in (2, 1)]
+        storage.new(cities[0])
+        storage.new(cities[1])
+        storage.new(City(state_id="2"))
+        self.assertEqual(storage.page(City, state_id="1"),
+                         [cities[1], cities[0]])
+        after = (cities[1].created_at, cities[1].id)
+        self.assertEqual(storage.page(City, limit=5, after=after,
+                                      state_id="1"), [cities[0]])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_page_criteria_walk(self):
+        """Test that a filtered page sorts few matches and walks the class
+        order for many, building only the objects it checks"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        cities = [City(state_id="1" if i % 30 else "2", name=str(i % 2),
+                       created_at=datetime(2024, 1, 1, 0, i // 60, i % 60))
+                  for i in range(300)]
+        storage.new_all(reversed(cities))
+        for criteria in [{"state_id": "1"}, {"state_id": "2"},
+                         {"state_id": ["2", "3"], "name": "0"},
+                         {"name": "1"}]:
+            terms = [(attr, file_storage.values_of(value))
+                     for attr, value in criteria.items()]
+            found = [city for city in cities
+                     if file_storage.matches(city, terms)]
+            self.assertEqual(storage.page(City, **criteria), found)
+            self.assertEqual(storage.page(City, limit=3, **criteria),
+                             found[:3])
+            after = (found[4].created_at, found[4].id)
+            self.assertEqual(storage.page(City, limit=4, after=after,
+                                          **criteria), found[5:9])
+        with patch.object(storage, "get", wraps=storage.get) as get:
+            self.assertEqual(storage.page(City, limit=5, state_id="1"),
+                             [city for city in cities if city.state_id ==
+                              "1"][:5])
+            self.assertEqual(get.call_count, 5)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_version(self):
+        """Test that the version of a class changes with its objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        versions = [storage.version(State)]
+        storage.new(state)
+        versions.append(storage.version(State))
+        self.assertEqual(storage.version("City"), storage.version(City))
+        storage.new(City())
+        self.assertEqual(storage.version(State), versions[-1])
+        storage.delete(state)
+        versions.append(storage.version(State))
+        tokens = [token for token, changed_at in versions]
+        self.assertEqual(len(set(tokens)), 3)
+        self.assertLess(versions[1][1], versions[2][1])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_new_all(self):
+        """Test that new_all stores the objects, one change per class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        versions = [storage.version(State), storage.version(City)]
+        states = [State(), State()]
+        city = City(state_id=states[0].id)
+        storage.new_all(states + [city])
+        self.assertEqual(list(storage.all(State).values()), states)
+        self.assertEqual(storage.filter(City, state_id=states[0].id),
+                         {"City." + city.id: city})
+        self.assertEqual(storage.version(State)[0][1], versions[0][0][1] + 1)
+        self.assertEqual(storage.version(City)[0][1], versions[1][0][1] + 1)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(not isinstance(models.storage, FileStorage),
+                     "not testing file storage")
+    def test_reindex(self):
+        """Test that changing a foreign key moves the object in the index"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        city = City(name="Fremont", state_id="1")
+        storage.new(city)
+        city.state_id = "2"
+        by_value = FileStorage._FileStorage__by_value[("City", "state_id")]
+        self.assertNotIn("1", by_value)
+        self.assertEqual(list(file_storage.keys_of(by_value["2"])),
+                         ["City." + city.id])
+        other = City(state_id="3")
+        other.state_id = "4"
+        self.assertNotIn("3", by_value)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_filter_uses_index(self):
+        """Test that filter on an indexed attribute does not scan"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        city = City(name="Fremont", state_id="1")
+        storage.new(city)
+        storage.new(City(name="Reno", state_id="2"))
+        with patch.object(FileStorage, "all") as mock_all:
+            self.assertEqual(len(storage.filter(City, state_id="1")), 1)
+            self.assertFalse(mock_all.called)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(not isinstance(models.storage, FileStorage),
+                     "not testing file storage")
+    def test_linked(self):
+        """Test that linked keeps the objects linked to every id"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        places = [Place(city_id="1", amenity_ids=["a", "b"]),
+                  Place(city_id="1", amenity_ids=["a"]),
+                  Place(city_id="2", amenity_ids=["b", "a"])]
+        for place in places:
+            storage.new(place)
+        found = storage.linked(Place, "amenities", ["a"])
+        self.assertEqual(list(found.values()), places)
+        found = storage.linked(Place, "amenities", ["a", "b"], city_id="1")
+        self.assertEqual(list(found.values()), places[:1])
+        self.assertEqual(storage.linked(Place, "amenities", ["c"]), {})
+        found = storage.filter(Place, amenity_ids=["b", "c"])
+        self.assertEqual(list(found.values()), [places[0], places[2]])
+        places[1].amenity_ids = ["b"]
+        found = storage.linked(Place, "amenities", ["b"], city_id="1")
+        self.assertEqual(list(found.values()), places[:2])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_link(self):
+        """Test that link and unlink keep amenity_ids and the index"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        place = Place()
+        amenity = Amenity()
+        storage.new(place)
+        storage.new(amenity)
+        self.assertTrue(storage.link(place, "amenities", amenity))
+        self.assertFalse(storage.link(place, "amenities", amenity))
+        self.assertEqual(place.amenity_ids, [amenity.id])
+        found = storage.linked(Place, "amenities", [amenity.id])
+        self.assertEqual(list(found.values()), [place])
+        self.assertTrue(storage.unlink(place, "amenities", amenity))
+        self.assertFalse(storage.unlink(place, "amenities", amenity))
+        self.assertEqual(place.amenity_ids, [])
+        self.assertEqual(storage.linked(Place, "amenities", [amenity.id]),
+                         {})
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_link_after_change_in_place(self):
+        """Test that link and unlink go by amenity_ids when the list was
+        changed in place, and bring the index back in line"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        place = Place()
+        wifi = Amenity()
+        pool = Amenity()
+        storage.new(place)
+        place.amenity_ids.append(wifi.id)
+        self.assertFalse(storage.link(place, "amenities", wifi))
+        self.assertEqual(place.amenity_ids, [wifi.id])
+        self.assertTrue(storage.link(place, "amenities", pool))
+        found = storage.linked(Place, "amenities", [wifi.id, pool.id])
+        self.assertEqual(list(found.values()), [place])
+        place.amenity_ids.remove(wifi.id)
+        self.assertFalse(storage.unlink(place, "amenities", wifi))
+        self.assertTrue(storage.link(place, "amenities", wifi))
+        self.assertEqual(place.amenity_ids, [pool.id, wifi.id])
+        self.assertTrue(storage.unlink(place, "amenities", wifi))
+        self.assertEqual(place.amenity_ids, [pool.id])
+        self.assertEqual(storage.linked(Place, "amenities", [wifi.id]), {})
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_delete_unlinks(self):
+        """Test that deleting an amenity unlinks it from its places"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        amenity = Amenity()
+        places = [Place(amenity_ids=[amenity.id, "1"]),
+                  Place(amenity_ids=["1"])]
+        for obj in places + [amenity]:
+            storage.new(obj)
+        storage.delete(amenity)
+        self.assertEqual(places[0].amenity_ids, ["1"])
+        self.assertEqual(places[1].amenity_ids, ["1"])
+        FileStorage._FileStorage__objects = save
+
+
+@unittest.skipIf(models.storage_t == "db", "not testing file storage")
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journaled save mode of the FileStorage class"""
+    def setUp(self):
+        """Start every test from an empty, journaled storage"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.storage.save()
+        self.storage._FileStorage__journal = True
+
+    def tearDown(self):
+        """Restore the objects and drop the journal"""
+        compactor = FileStorage._FileStorage__compactor
+        if compactor is not None:
+            compactor.join()
+        FileStorage._FileStorage__objects = self.save
+        for path in ["file.json.log", "file.json.log.old"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_save_appends_changes_only(self):
+        """Test that save appends the changed object, not the whole file"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["obj"], state.to_dict())
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f), {})
+        self.storage.save()
+        with open("file.json.log", "r") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_reload_replays_journal(self):
+        """Test that reload replays stored and deleted objects"""
+        state = State(name="California")
+        city = City(name="Fremont")
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.delete(city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "California")
+        self.assertIsNone(self.storage.get(City, city.id))
+
+    @unittest.skipIf(not isinstance(models.storage, FileStorage),
+                     "not testing file storage")
+    def test_journal_keeps_foreign_key_change(self):
+        """Test that setting an indexed foreign key is journaled"""
+        city = City(name="Fremont", state_id="1")
+        self.storage.new(city)
+        self.storage.save()
+        city.state_id = "2"
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(City, city.id).state_id, "2")
+
+    def test_journal_is_compacted(self):
+        """Test that a big journal is folded back into file.json"""
+        self.storage._FileStorage__journal_max = 0
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        FileStorage._FileStorage__compactor.join()
+        self.assertFalse(os.path.exists("file.json.log"))
+        self.assertFalse(os.path.exists("file.json.log.old"))
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+
+@unittest.skipIf(models.storage_t == "db", "not testing file storage")
+class TestFileStorageWrites(unittest.TestCase):
+    """Test that FileStorage writes file.json atomically"""
+    def setUp(self):
+        """Start every test from a single saved State"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.state = State(name="California")
+        self.storage.new(self.state)
+        self.storage.save()
+
+    def tearDown(self):
+        """Restore the objects and file.json, and drop the backups"""
+        FileStorage._FileStorage__objects = self.save
+        FileStorage().save()
+        for path in ["file.json.1", "file.json.2", "file.json.3"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_failed_save_keeps_file(self):
+        """Test that a save failing mid-write leaves file.json untouched"""
+        with open("file.json", "r") as f:
+            before = f.read()
+        self.storage.new(City(name="Fremont"))
+        with patch("os.fsync", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(f.read(), before)
+        leftovers = [name for name in os.listdir(".")
+                     if name.startswith(".file.json.")]
+        self.assertEqual(leftovers, [])
+
+    def test_backups_rotate(self):
+        """Test that HBNB_FILE_BACKUPS keeps the previous versions"""
+        self.storage._FileStorage__backups = 2
+        versions = []
+        for name in ["Nevada", "Oregon", "Texas"]:
+            with open("file.json", "r") as f:
+                versions.insert(0, f.read())
+            self.state.name = name
+            self.storage.save()
+        with open("file.json.1", "r") as f:
+            self.assertEqual(f.read(), versions[0])
+        with open("file.json.2", "r") as f:
+            self.assertEqual(f.read(), versions[1])
+        self.assertFalse(os.path.exists("file.json.3"))
+
+    def test_reload_falls_back_on_backup(self):
+        """Test that reload reads the newest backup of a corrupt file"""
+        self.storage._FileStorage__backups = 1
+        self.storage.save()
+        with open("file.json", "w") as f:
+            f.write('{"State.')
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "California")
+
+    def test_reload_without_backup_raises(self):
+        """Test that a corrupt file with no backup yet is an error, not an
+        empty storage"""
+        self.storage._FileStorage__backups = 2
+        with open("file.json", "w") as f:
+            f.write('{"State.')
+        with self.assertRaises(ValueError):
+            self.storage.reload()
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+
+
+@unittest.skipIf(models.storage_t == "db", "not testing file storage")
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Test the write-behind save mode of the FileStorage class"""
+    def setUp(self):
+        """Start every test from an empty, write-behind storage"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.storage.save()
+        self.storage._FileStorage__write_behind = True
+        self.storage._FileStorage__flush_interval = 60
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.save
+
+    def saved_keys(self):
+        """returns the keys stored in file.json"""
+        with open("file.json", "r") as f:
+            return set(json.load(f))
+
+    def wait_for_key(self, key):
+        """polls file.json until key shows up in it"""
+        deadline = time.time() + 5
+        while key not in self.saved_keys() and time.time() < deadline:
+            time.sleep(0.01)
+        return key in self.saved_keys()
+
+    def test_save_is_deferred(self):
+        """Test that save leaves the write to the flusher, sync does it"""
+        state = State()
+        self.storage.new(state)
+        self.storage.save()
+        self.assertNotIn("State." + state.id, self.saved_keys())
+        self.storage.sync()
+        self.assertIn("State." + state.id, self.saved_keys())
+
+    def test_flush_after_n_changes(self):
+        """Test that the flusher wakes up once enough objects changed"""
+        self.storage._FileStorage__flush_every = 2
+        state = State()
+        self.storage.new(state)
+        self.storage.new(City())
+        self.storage.save()
+        self.assertTrue(self.wait_for_key("State." + state.id))
+
+    def test_flush_on_timer(self):
+        """Test that the flusher saves pending changes on each tick"""
+        self.storage._FileStorage__flush_interval = 0.01
+        state = State()
+        self.storage.new(state)
+        self.storage.save()
+        self.assertTrue(self.wait_for_key("State." + state.id))
+
+
+@unittest.skipIf(models.storage_t == "db", "not testing file storage")
+class TestFileStorageLazy(unittest.TestCase):
+    """Test the lazy reload mode of the FileStorage class"""
+    def setUp(self):
+        """Save two States and a City, then reload them lazily"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.states = [State(name="California"), State(name="Nevada")]
+        self.city = City(name="Fremont", state_id=self.states[0].id)
+        for obj in self.states + [self.city]:
+            self.storage.new(obj)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage._FileStorage__lazy = True
+        self.storage.reload()
+
+    def tearDown(self):
+        """Restore the objects and drop the raw records"""
+        FileStorage._FileStorage__raw = {}
+        FileStorage._FileStorage__objects = self.save
+        FileStorage().save()
+
+    def test_reload_builds_nothing(self):
+        """Test that a lazy reload builds no object but counts them all"""
+        self.assertEqual(len(FileStorage._FileStorage__objects), 0)
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.count(), 3)
+
+    def test_get_builds_one(self):
+        """Test that get builds only the object asked for"""
+        state = self.storage.get(State, self.states[0].id)
+        self.assertEqual(state.to_dict(), self.states[0].to_dict())
+        self.assertIs(self.storage.get(State, self.states[0].id), state)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+        self.assertEqual(self.storage.count(State), 2)
+
+    def test_filter_builds_matches(self):
+        """Test that filter builds only the objects it returns"""
+        found = self.storage.filter(City, state_id=self.states[0].id)
+        self.assertEqual([c.to_dict() for c in found.values()],
+                         [self.city.to_dict()])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+
+    def test_page_builds_page(self):
+        """Test that page builds only the objects it returns"""
+        states = sorted(self.states, key=lambda s: (s.created_at, s.id))
+        page = self.storage.page(State, limit=1)
+        self.assertEqual([s.to_dict() for s in page], [states[0].to_dict()])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+
+    def test_all_builds_class(self):
+        """Test that all(cls) builds the objects of cls only"""
+        states = self.storage.all(State)
+        self.assertEqual(sorted(s.name for s in states.values()),
+                         ["California", "Nevada"])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+        self.assertEqual(len(self.storage.all()), 3)
+
+    def test_save_keeps_unbuilt_objects(self):
+        """Test that save writes the objects that were never built"""
+        self.storage.delete(self.storage.get(State, self.states[1].id))
+        self.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved, {
+            "State." + self.states[0].id: self.states[0].to_dict(),
+            "City." + self.city.id: self.city.to_dict()})
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestFileStorageCompact(unittest.TestCase):
+    """Test the compact in-memory representation of the FileStorage class"""
+    def setUp(self):
+        """Save a State with two Cities, then reload them in compact mode"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.state = State(name="California")
+        self.cities = [City(name="Fremont", state_id=self.state.id),
+                       City(name="Fremont", state_id=self.state.id)]
+        for obj in [self.state] + self.cities:
+            self.storage.new(obj)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage._FileStorage__compact_strings = True
+        self.storage.reload()
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.save
+        FileStorage().save()
+
+    def test_objects_unchanged(self):
+        """Test that the reloaded objects are the saved ones"""
+        for obj in [self.state] + self.cities:
+            loaded = self.storage.get(obj.__class__, obj.id)
+            self.assertEqual(loaded.to_dict(), obj.to_dict())
+            self.assertEqual(str(loaded), str(obj))
+        state = self.storage.get(State, self.state.id)
+        self.assertEqual(sorted(city.id for city in state.cities),
+                         sorted(city.id for city in self.cities))
+
+    def test_values_shared(self):
+        """Test that equal strings are a single object"""
+        cities = [self.storage.get(City, city.id) for city in self.cities]
+        self.assertIs(cities[0].name, cities[1].name)
+        self.assertIs(cities[0].state_id, cities[1].state_id)
+        self.assertIs(cities[0].created_at, cities[0].updated_at)
+
+    def test_foreign_keys_shared(self):
+        """Test that equal foreign keys are shared without compact mode"""
+        self.storage._FileStorage__compact_strings = False
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        cities = [self.storage.get(City, city.id) for city in self.cities]
+        self.assertIs(cities[0].state_id, cities[1].state_id)
+        self.assertIsNot(cities[0].name, cities[1].name)
@@ -0,0 +1,279 @@
+#!/usr/bin/python3
+"""
+Contains the TestMmapStorageDocs and TestMmapStorage classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.amenity import Amenity
+from models.engine import mmap_storage
+from models.city import City
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+MmapStorage = mmap_storage.MmapStorage
+
+
+class TestMmapStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of MmapStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ms_f = inspect.getmembers(MmapStorage, inspect.isfunction)
+
+    def test_pep8_conformance_mmap_storage(self):
+        """Test that models/engine/mmap_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/mmap_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_mmap_storage(self):
+        """Test tests/test_models/test_mmap_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_mmap_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_mmap_storage_module_docstring(self):
+        """Test for the mmap_storage.py module docstring"""
+        self.assertIsNot(mmap_storage.__doc__, None,
+                         "mmap_storage.py needs a docstring")
+
+    def test_mmap_storage_class_docstring(self):
+        """Test for the MmapStorage class docstring"""
+        self.assertIsNot(MmapStorage.__doc__, None,
+                         "MmapStorage class needs a docstring")
+
+    def test_ms_func_docstrings(self):
+        """Test for the presence of docstrings in MmapStorage methods"""
+        for func in self.ms_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestMmapStorage(unittest.TestCase):
+    """Test the MmapStorage class"""
+    def setUp(self):
+        """Give every test an empty storage in its own directory"""
+        self.directory = tempfile.mkdtemp()
+        self.storage = self.open_storage()
+
+    def tearDown(self):
+        """Drop the storage directory"""
+        shutil.rmtree(self.directory)
+
+    def open_storage(self):
+        """returns a reloaded storage on the test directory"""
+        storage = MmapStorage()
+        storage._MmapStorage__index_path = os.path.join(self.directory,
+                                                        "file.idx")
+        storage.reload()
+        return storage
+
+    def test_new_save_reload(self):
+        """Test that saved objects come back from another storage"""
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        self.assertEqual(self.storage.count(), 2)
+        self.storage.save()
+        other = self.open_storage()
+        self.assertEqual(other.count(), 2)
+        self.assertEqual(other.count(State), 1)
+        self.assertEqual(other.get(State, state.id).to_dict(),
+                         state.to_dict())
+        self.assertEqual(set(other.all(City)), {"City." + city.id})
+        self.assertEqual(len(other.all()), 2)
+
+    def test_filter(self):
+        """Test that filter returns the objects matching all criteria"""
+        cities = [City(name="Fremont", state_id="1"),
+                  City(name="Reno", state_id="2")]
+        for city in cities:
+            self.storage.new(city)
+        self.storage.save()
+        other = self.open_storage()
+        found = other.filter(City, state_id="1")
+        self.assertEqual(list(found), ["City." + cities[0].id])
+        found = other.filter("City", state_id=["1", "2"], name="Reno")
+        self.assertEqual(list(found), ["City." + cities[1].id])
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_link(self):
+        """Test that link and unlink change the ids and updated_at"""
+        place = Place(name="Loft")
+        wifi = Amenity(name="Wifi")
+        self.storage.new(place)
+        before = place.updated_at
+        self.assertTrue(self.storage.link(place, "amenities", wifi))
+        self.assertFalse(self.storage.link(place, "amenities", wifi))
+        self.assertEqual(place.amenity_ids, [wifi.id])
+        self.assertGreater(place.updated_at, before)
+        before = place.updated_at
+        self.assertTrue(self.storage.unlink(place, "amenities", wifi))
+        self.assertEqual(place.amenity_ids, [])
+        self.assertGreater(place.updated_at, before)
+
+    def test_get_returns_same_instance(self):
+        """Test that get builds an object once while it is in use"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        other = self.open_storage()
+        first = other.get(State, state.id)
+        self.assertIs(other.get(State, state.id), first)
+        self.assertIsNone(other.get(State, "nope"))
+
+    def test_update_and_delete(self):
+        """Test that updates and deletions reach the files"""
+        states = [State(name="California"), State(name="Nevada")]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        states[0].name = "Oregon"
+        self.storage.new(states[0])
+        self.storage.delete(states[1])
+        self.storage.save()
+        other = self.open_storage()
+        self.assertEqual(other.get(State, states[0].id).name, "Oregon")
+        self.assertIsNone(other.get(State, states[1].id))
+        self.assertEqual(other.count(), 1)
+
+    def test_compaction(self):
+        """Test that rewriting an object many times compacts the file"""
+        state = State(name="x" * 1000)
+        for _ in range(3000):
+            self.storage.new(state)
+            self.storage.save()
+        files = [name for name in os.listdir(self.directory)
+                 if name.endswith(".dat")]
+        self.assertEqual(len(files), 1)
+        size = os.path.getsize(os.path.join(self.directory, files[0]))
+        self.assertLess(size, 3 << 20)
+        other = self.open_storage()
+        self.assertEqual(other.get(State, state.id).name, "x" * 1000)
+
+    def test_page(self):
+        """Test that page() walks the (created_at, id) order and only reads
+        the records of the page"""
+        states = [State(name=str(i), created_at=datetime(2020, 1, 1, 0, i))
+                  for i in range(10)]
+        for state in states[:6]:
+            self.storage.new(state)
+        self.storage.save()
+        for state in states[6:]:
+            self.storage.new(state)
+        storage = self.open_storage()
+        self.assertEqual([s.name for s in storage.page(State, limit=9)],
+                         ["0", "1", "2", "3", "4", "5"])
+        page = self.storage.page(State, limit=4)
+        self.assertEqual([s.name for s in page], ["0", "1", "2", "3"])
+        after = (page[-1].created_at, page[-1].id)
+        self.assertEqual([s.name for s in self.storage.page(State, 4, after)],
+                         ["4", "5", "6", "7"])
+        self.assertEqual([s.name for s in self.storage.page(
+            State, after=after, name=["2", "5", "9"])], ["5", "9"])
+        self.storage.delete(states[5])
+        self.storage.save()
+        storage = self.open_storage()
+        read = []
+        original = storage._MmapStorage__read
+
+        def count(location):
+            read.append(location)
+            return original(location)
+        storage._MmapStorage__read = count
+        page = storage.page(State, 2, after)
+        self.assertEqual([s.name for s in page], ["4", "6"])
+        self.assertEqual(len(read), 2)
+
+    def test_index_log(self):
+        """Test that saves append to the index log instead of rewriting the
+        index, and that reload() reads the log"""
+        index = os.path.join(self.directory, "file.idx")
+        log = os.path.join(self.directory, "file.0.log")
+        ca = State(name="California")
+        self.storage.new(ca)
+        self.storage.save()
+        stat = os.stat(index)
+        self.assertFalse(os.path.exists(log))
+        nv = State(name="Nevada")
+        self.storage.new(nv)
+        self.storage.save()
+        self.storage.delete(ca)
+        self.storage.save()
+        self.assertEqual(os.stat(index), stat)
+        self.assertGreater(os.path.getsize(log), 0)
+        other = self.open_storage()
+        self.assertIsNone(other.get(State, ca.id))
+        self.assertEqual(other.get(State, nv.id).name, "Nevada")
+
+    def test_index_log_cut_short(self):
+        """Test that an entry cut short by a crash is ignored, then
+        overwritten"""
+        log = os.path.join(self.directory, "file.0.log")
+        ca = State(name="California")
+        self.storage.new(ca)
+        self.storage.save()
+        nv = State(name="Nevada")
+        self.storage.new(nv)
+        self.storage.save()
+        with open(log, "ab") as f:
+            f.write(b"\x40\x00\x00\x00{")
+        other = self.open_storage()
+        self.assertEqual(other.count(State), 2)
+        ut = State(name="Utah")
+        other.new(ut)
+        other.save()
+        self.assertEqual(self.open_storage().count(State), 3)
+
+    def test_save_keeps_other_process_changes(self):
+        """Test that a save reads the entries another storage appended to
+        the log first, and keeps them"""
+        ca = State(name="California")
+        self.storage.new(ca)
+        self.storage.save()
+        other = self.open_storage()
+        nv = State(name="Nevada")
+        other.new(nv)
+        other.save()
+        other.delete(other.get(State, ca.id))
+        other.save()
+        ut = State(name="Utah")
+        self.storage.new(ut)
+        self.storage.save()
+        self.assertEqual(self.storage.get(State, nv.id).name, "Nevada")
+        self.assertIsNone(self.storage.get(State, ca.id))
+        names = sorted(state.name for state in
+                       self.open_storage().all(State).values())
+        self.assertEqual(names, ["Nevada", "Utah"])
+
+    def test_compaction_drops_log(self):
+        """Test that a compaction writes the whole index and drops the
+        log"""
+        state = State(name="x" * 1000)
+        for _ in range(1500):
+            self.storage.new(state)
+            self.storage.save()
+        self.assertFalse(os.path.exists(os.path.join(self.directory,
+                                                     "file.0.log")))
+        other = self.open_storage()
+        self.assertEqual(other.get(State, state.id).name, "x" * 1000)
+
+    def test_close_reloads_changes(self):
+        """Test that close picks up a save from another storage"""
+        other = self.open_storage()
+        state = State(name="California")
+        other.new(state)
+        other.save()
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.storage.close()
+        self.assertIsNotNone(self.storage.get(State, state.id))
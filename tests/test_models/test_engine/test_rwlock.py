@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Contains the TestReadWriteLockDocs and TestReadWriteLock classes
+"""
+
+import inspect
+from models.engine import rwlock
+import pep8
+import threading
+import time
+import unittest
+ReadWriteLock = rwlock.ReadWriteLock
+
+
+class TestReadWriteLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ReadWriteLock class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.rw_f = inspect.getmembers(ReadWriteLock, inspect.isfunction)
+
+    def test_pep8_conformance_rwlock(self):
+        """Test that models/engine/rwlock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/rwlock.py',
+                                    'tests/test_models/test_engine/\
+test_rwlock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_rwlock_module_docstring(self):
+        """Test for the rwlock.py module docstring"""
+        self.assertIsNot(rwlock.__doc__, None,
+                         "rwlock.py needs a docstring")
+
+    def test_rwlock_func_docstrings(self):
+        """Test for the presence of docstrings in ReadWriteLock methods"""
+        for func in self.rw_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock class"""
+    def test_readers_share(self):
+        """Test that two threads can hold the lock for reading at once"""
+        lock = ReadWriteLock()
+        both_in = threading.Barrier(2, timeout=5)
+
+        def read():
+            """waits inside the read lock for the other reader"""
+            with lock.reading():
+                both_in.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(both_in.broken)
+
+    def test_writer_excludes_readers(self):
+        """Test that a reader waits for the writer to release the lock"""
+        lock = ReadWriteLock()
+        events = []
+        lock.acquire_write()
+
+        def read():
+            """records when it got the read lock"""
+            with lock.reading():
+                events.append("read")
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        time.sleep(0.05)
+        events.append("write done")
+        lock.release_write()
+        thread.join()
+        self.assertEqual(events, ["write done", "read"])
@@ -171,6 +171,15 @@ class TestPlace(unittest.TestCase):
         self.assertEqual(type(place.amenity_ids), list)
         self.assertEqual(len(place.amenity_ids), 0)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenity_ids_not_shared(self):
+        """Test that appending to amenity_ids changes one place only"""
+        place = Place()
+        place.amenity_ids.append("1")
+        self.assertEqual(place.amenity_ids, ["1"])
+        self.assertEqual(Place().amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""
         p = Place()
@@ -198,3 +207,38 @@ class TestPlace(unittest.TestCase):
         place = Place()
         string = "[Place] ({}) {}".format(place.id, place.__dict__)
         self.assertEqual(string, str(place))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_reviews(self):
+        """test that reviews follows the place_id of the stored reviews"""
+        from models.review import Review
+        place = Place()
+        review = Review(place_id="another place")
+        models.storage.new(review)
+        self.assertEqual(place.reviews, [])
+        review.place_id = place.id
+        self.assertEqual(place.reviews, [review])
+        models.storage.delete(review)
+        self.assertEqual(place.reviews, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenities(self):
+        """test that amenities returns the stored amenities of amenity_ids"""
+        from models.amenity import Amenity
+        amenity = Amenity()
+        models.storage.new(amenity)
+        place = Place(amenity_ids=[amenity.id, "no such amenity"])
+        self.assertEqual(place.amenities, [amenity])
+        models.storage.delete(amenity)
+        self.assertEqual(place.amenities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenities_setter(self):
+        """test that setting amenities links an Amenity, only once"""
+        from models.amenity import Amenity
+        amenity = Amenity()
+        place = Place()
+        place.amenities = amenity
+        place.amenities = amenity
+        place.amenities = "not an amenity"
+        self.assertEqual(place.amenity_ids, [amenity.id])
@@ -103,3 +103,18 @@ class TestState(unittest.TestCase):
         state = State()
         string = "[State] ({}) {}".format(state.id, state.__dict__)
         self.assertEqual(string, str(state))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_cities(self):
+        """test that cities follows the state_id of the stored cities"""
+        from models.city import City
+        state = State()
+        cities = [City(state_id=state.id), City(state_id=state.id)]
+        for city in cities:
+            models.storage.new(city)
+        self.assertEqual(state.cities, cities)
+        cities[0].state_id = "another state"
+        self.assertEqual(state.cities, cities[1:])
+        models.storage.delete(cities[1])
+        self.assertEqual(state.cities, [])
+        models.storage.delete(cities[0])
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the TestTransferDocs and TestTransfer classes
+"""
+
+import io
+import json
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.engine.mmap_storage import MmapStorage
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import shutil
+import tempfile
+import transfer
+import unittest
+from unittest.mock import patch
+
+
+class TestTransferDocs(unittest.TestCase):
+    """Tests to check the style of transfer.py"""
+    def test_pep8_conformance_transfer(self):
+        """Test that transfer.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['transfer.py', 'tests/test_transfer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_transfer_module_docstring(self):
+        """Test for the transfer.py module docstring"""
+        self.assertTrue(len(transfer.__doc__) >= 1,
+                        "transfer.py needs a docstring")
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestTransfer(unittest.TestCase):
+    """Test copying the objects between engines and NDJSON files"""
+    def setUp(self):
+        """Store a state, a city, an amenity and a place"""
+        models.storage.close()
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.state = State(name="California")
+        self.city = City(name="Fremont", state_id=self.state.id)
+        self.wifi = Amenity(name="Wifi")
+        self.place = Place(name="Loft", city_id=self.city.id,
+                           user_id="1", amenity_ids=[self.wifi.id])
+        for obj in (self.place, self.wifi, self.city, self.state):
+            models.storage.new(obj)
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "objects.ndjson")
+
+    def tearDown(self):
+        """Restore the objects and file.json"""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+        FileStorage._FileStorage__objects = self.save
+        models.storage.save()
+
+    def test_export(self):
+        """Test that the objects are written parents first, in chunks"""
+        progress = []
+        with patch.object(FileStorage, "page",
+                          wraps=models.storage.page) as mock_page:
+            counts = transfer.transfer("file", self.path, chunk=1,
+                                       progress=lambda *args:
+                                       progress.append(args))
+        self.assertEqual(counts, {"State": 1, "City": 1, "Amenity": 1,
+                                  "Place": 1})
+        for call in mock_page.call_args_list:
+            self.assertEqual(call[1]["limit"], 1)
+        self.assertEqual([total for total, elapsed in progress],
+                         [1, 2, 3, 4])
+        with open(self.path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record["__class__"] for record in records],
+                         ["State", "City", "Amenity", "Place"])
+        self.assertEqual(records[3], self.place.to_dict())
+
+    def test_round_trip(self):
+        """Test that an export imported into another engine is the same"""
+        transfer.transfer("file", self.path)
+        os.chdir(self.tmp)
+        counts = transfer.transfer(self.path, "mmap", chunk=3)
+        self.assertEqual(sum(counts.values()), 4)
+        storage = MmapStorage()
+        storage.reload()
+        place = storage.get(Place, self.place.id)
+        self.assertEqual(place.to_dict(), self.place.to_dict())
+        self.assertEqual(storage.count(), 4)
+
+    def test_main(self):
+        """Test the command line, its report and its errors"""
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            transfer.main(["file", self.path])
+        self.assertIn("4 objects in", stderr.getvalue())
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            with self.assertRaises(SystemExit) as cm:
+                transfer.main(["-q", self.path + ".nope", "file"])
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("No such file", stderr.getvalue())
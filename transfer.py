@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""
+Copies every object from one storage engine to another, or to and from
+NDJSON files (one to_dict() per line, the format of the API streams)
+
+usage: ./transfer.py [-c CHUNK] [-q] SOURCE DESTINATION
+
+SOURCE and DESTINATION are "file" (FileStorage), "mmap" (MmapStorage),
+"db" (DBStorage, only when HBNB_TYPE_STORAGE=db), or the path of an NDJSON
+file, "-" for the standard input or output. The objects are read CHUNK at
+a time (1000 by default), parents first, and written as they come: one
+executemany per class and chunk into a database, committed once at the
+end, and a single save into the file engines. Progress and throughput go
+to the standard error unless -q is given.
+
+e.g. HBNB_TYPE_STORAGE=db HBNB_MYSQL_USER=... ./transfer.py file db
+"""
+
+import argparse
+import json
+import models
+from models.amenity import Amenity
+from models.base_model import BaseModel
+from models.city import City
+from models.engine.file_storage import link_attributes
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import sys
+import time
+
+classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
+           "Place": Place, "Review": Review, "State": State, "User": User}
+# class names in the order they are copied, so that the objects an object
+# refers to are written before it
+order = ["State", "City", "User", "Amenity", "Place", "Review", "BaseModel"]
+engines = ("file", "mmap", "db")
+
+
+def open_storage(engine):
+    """returns the storage engine named engine, reloaded"""
+    if engine == (models.storage_t or "file"):
+        return models.storage
+    if engine == "file":
+        from models.engine.file_storage import FileStorage
+        storage = FileStorage()
+    elif engine == "mmap":
+        from models.engine.mmap_storage import MmapStorage
+        storage = MmapStorage()
+    else:
+        raise ValueError("db needs HBNB_TYPE_STORAGE=db")
+    storage.reload()
+    return storage
+
+
+def read_storage(storage, chunk, names=order):
+    """yields lists of at most chunk records of the objects of storage, a
+    class at a time in the order of names; the ids linked to each object
+    through a many-to-many relationship are in its record (amenity_ids)"""
+    for name in names:
+        links = link_attributes.get(name, {})
+        after = None
+        while True:
+            objs = storage.page(name, limit=chunk, after=after,
+                                preload=list(links))
+            if not objs:
+                break
+            records = []
+            for obj in objs:
+                record = obj.to_dict()
+                for link_name, (attr, target) in links.items():
+                    # a loaded relationship is in the dict of the object
+                    record.pop(link_name, None)
+                    if attr not in record:
+                        record[attr] = [linked.id for linked in
+                                        getattr(obj, link_name)]
+                records.append(record)
+            yield records
+            after = (objs[-1].created_at, objs[-1].id)
+
+
+def read_ndjson(f, chunk):
+    """yields lists of at most chunk records read from the lines of f"""
+    records = []
+    for line in f:
+        if line.strip():
+            records.append(json.loads(line))
+            if len(records) == chunk:
+                yield records
+                records = []
+    if records:
+        yield records
+
+
+def write_storage(storage, chunks, names=order):
+    """stores the objects of the records of chunks whose class is in
+    names, a chunk at a time, and saves once; yields each chunk"""
+    for records in chunks:
+        objs = []
+        for record in records:
+            name = record.get("__class__")
+            if name in names:
+                objs.append(classes[name](**record))
+        storage.new_all(objs)
+        yield records
+    storage.save()
+
+
+def write_ndjson(f, chunks):
+    """writes the records of chunks to f, one per line; yields each
+    chunk"""
+    for records in chunks:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+        yield records
+    f.flush()
+
+
+def transfer(source, destination, chunk=1000, progress=None):
+    """copies the objects of source to destination (see the usage), a
+    chunk at a time, calling progress(<number of objects>, <seconds>)
+    after each chunk; returns {<class name>: number of objects}"""
+    # BaseModel objects have no table
+    names = [name for name in order
+             if name != "BaseModel" or "db" not in (source, destination)]
+    opened = []
+    if source in engines:
+        chunks = read_storage(open_storage(source), chunk, names)
+    else:
+        f = sys.stdin if source == "-" else open(source, "r")
+        opened.append(f)
+        chunks = read_ndjson(f, chunk)
+    if destination in engines:
+        chunks = write_storage(open_storage(destination), chunks, names)
+    else:
+        f = sys.stdout if destination == "-" else open(destination, "w")
+        opened.append(f)
+        chunks = write_ndjson(f, chunks)
+    counts = {}
+    total = 0
+    start = time.perf_counter()
+    try:
+        for records in chunks:
+            for record in records:
+                name = record.get("__class__")
+                if name in names:
+                    counts[name] = counts.get(name, 0) + 1
+                    total += 1
+            if progress is not None:
+                progress(total, time.perf_counter() - start)
+    finally:
+        for f in opened:
+            if f not in (sys.stdin, sys.stdout):
+                f.close()
+    return counts
+
+
+def report(total, elapsed):
+    """writes the progress and throughput so far to the standard error"""
+    sys.stderr.write("\r{:d} objects, {:.1f} s, {:.0f} objects/s".format(
+        total, elapsed, total / elapsed if elapsed else 0))
+    sys.stderr.flush()
+
+
+def main(argv=None):
+    """parses the command line and runs the transfer"""
+    parser = argparse.ArgumentParser(
+        description="copy the objects between storage engines and NDJSON")
+    parser.add_argument("source", help='"file", "mmap", "db", a path or -')
+    parser.add_argument("destination",
+                        help='"file", "mmap", "db", a path or -')
+    parser.add_argument("-c", "--chunk", type=int, default=1000,
+                        help="objects read and written at a time")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="do not report progress")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    try:
+        counts = transfer(args.source, args.destination, args.chunk,
+                          None if args.quiet else report)
+    except (OSError, ValueError) as e:
+        parser.exit(1, "{}: {}\n".format(parser.prog, e))
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        sys.stderr.write("\n{} - {:d} objects in {:.2f} s ({:.0f}/s)\n".format(
+            ", ".join("{} {:d}".format(name, count)
+                      for name, count in counts.items()),
+            total, elapsed, total / elapsed if elapsed else 0))
+
+
+if __name__ == "__main__":
+    main()